@@ -0,0 +1,74 @@
+"""Updates up to 2,000 enemies spread across a large level with a player walking through it, with every enemy
+updated each step against the activity scheduler's distance tiers.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.ai_scheduler
+"""
+import math
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.map_loading import write_large_map
+from scripts.ai_scheduler import ActivityScheduler
+from scripts.entities import Enemy
+from scripts.headless import HeadlessGame
+
+
+LEVEL_WIDTH = 1600
+STEPS = 300
+COUNTS = [100, 500, 1000, 2000]
+
+
+def spawn_enemies(game, count):
+	random.seed(0)
+	ground_y = min(tile_loc[1] for tile_loc in game.tilemap.solid_rects if tile_loc[1] > 50)
+	enemies = []
+	for i in range(count):
+		x = random.randint(2, LEVEL_WIDTH - 3)
+		enemies.append(Enemy(game, (x * 16 + 4, (ground_y - 1) * 16), (8, 15)))
+	return enemies
+
+
+def run(game, scheduler, count):
+	game.ai_scheduler = scheduler
+	enemies = spawn_enemies(game, count)
+	player = game.player
+	ground_y = enemies[0].pos[1]
+	updates = 0
+	tier_counts = [0, 0, 0]
+
+	start = time.perf_counter()
+	for step in range(STEPS):
+		# The player runs right across the level.
+		player.pos = [step * 4 * 16 % (LEVEL_WIDTH * 16), ground_y]
+		game.update_enemies(enemies, [player])
+		updates += len(enemies) if scheduler.active_distance == math.inf else scheduler.tier_counts[0] + scheduler.tier_counts[1] / scheduler.reduced_interval
+		tier_counts = [total + tier for total, tier in zip(tier_counts, scheduler.tier_counts)]
+		game.projectiles.clear()
+		game.sparks.clear()
+		game.particles.clear()
+	elapsed = time.perf_counter() - start
+
+	return elapsed, updates / STEPS, [total / STEPS for total in tier_counts]
+
+
+def main():
+	temp_dir = tempfile.mkdtemp()
+	json_path = os.path.join(temp_dir, "large.json")
+	write_large_map(json_path, width=LEVEL_WIDTH)
+
+	game = HeadlessGame()
+	game.tilemap.load(json_path)
+
+	print(f"Level {LEVEL_WIDTH} tiles wide, {STEPS} steps:")
+	for count in COUNTS:
+		everyone_time, everyone_updates, _ = run(game, ActivityScheduler(active_distance=math.inf), count)
+		tiered_time, tiered_updates, tiers = run(game, ActivityScheduler(), count)
+		print(f"{count:>5} enemies: every enemy {STEPS / everyone_time:>7,.0f} steps/s, " +
+			f"tiered {STEPS / tiered_time:>7,.0f} steps/s ({everyone_time / tiered_time:.1f}x), " +
+			f"{tiered_updates:.0f} updates per step, tiers {tiers[0]:.0f} active / {tiers[1]:.0f} reduced / {tiers[2]:.0f} asleep")
+
+
+if __name__ == "__main__":
+	main()
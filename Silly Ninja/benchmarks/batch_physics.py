@@ -0,0 +1,58 @@
+"""Moves 1,000 enemies across a map with the per-entity PhysicsEntity.update and with the vectorized BatchPhysics stage.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.batch_physics [map_id]
+"""
+import sys
+import time
+
+from benchmarks.entity_physics import BenchmarkGame, spawn_entities
+from scripts.batch_physics import BatchPhysics
+from scripts.tilemap import Tilemap
+
+
+ENTITY_COUNTS = [10, 100, 300, 1000]
+FRAMES = 300
+
+
+def walk_movements(entities):
+	# Walk back and forth, turning around when bumping into walls.
+	movements = []
+	for entity in entities:
+		if entity.collisions["left"] or entity.collisions["right"]:
+			entity.walk_direction *= -1
+		movements.append((entity.walk_direction * 0.5, 0))
+	return movements
+
+
+def run(map_id, entity_count, batched):
+	game = BenchmarkGame()
+	tilemap = Tilemap(game)
+	tilemap.load(f"assets/maps/{map_id}.json")
+	entities = spawn_entities(game, tilemap, entity_count)
+	batch_physics = BatchPhysics(tilemap)
+
+	start = time.perf_counter()
+	for frame in range(FRAMES):
+		movements = walk_movements(entities)
+		if batched:
+			batch_physics.update(entities, movements)
+		else:
+			for entity, movement in zip(entities, movements):
+				entity.update(tilemap, movement=movement)
+	elapsed = time.perf_counter() - start
+
+	return elapsed, [(tuple(entity.pos), tuple(entity.velocity), tuple(entity.collisions.values()), entity.facing_left) for entity in entities]
+
+
+def main():
+	map_id = sys.argv[1] if len(sys.argv) > 1 else 2
+	print(f"Map {map_id}, {FRAMES} frames:")
+	for entity_count in ENTITY_COUNTS:
+		update_time, update_states = run(map_id, entity_count, False)
+		batch_time, batch_states = run(map_id, entity_count, True)
+		assert update_states == batch_states, "Batched physics ended up in a different state."
+		print(f"{entity_count:>5} enemies: update() {update_time * 1000:8.1f} ms, batched {batch_time * 1000:8.1f} ms ({update_time / batch_time:.1f}x)")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,113 @@
+"""Compares the all-pairs projectile and dash hit tests against the uniform grid broadphase, which the game only
+uses from BROADPHASE_ENEMY_COUNT enemies and BROADPHASE_PROJECTILE_COUNT projectiles on.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.broadphase
+"""
+import random
+import time
+
+from scripts.animation import Animation
+from scripts.broadphase import SpatialGrid
+from scripts.entities import PhysicsEntity
+from scripts.game import BROADPHASE_ENEMY_COUNT, BROADPHASE_PROJECTILE_COUNT
+from scripts.visual_effects import Projectile
+
+
+FRAMES = 100
+WORLD_SIZE = (2000, 600)
+
+
+class BenchmarkGame:
+	def __init__(self):
+		self.assets = {"player/idle": Animation([None], flipped_images=[None]), "enemy/idle": Animation([None], flipped_images=[None])}
+		self.tilemap = None
+
+
+class Target(PhysicsEntity):
+	def __init__(self, game, entity_type, pos, dashing=0):
+		super().__init__(game, entity_type, pos, (8, 15))
+		self.dashing = dashing
+
+
+def spawn(game, enemy_count, projectile_count):
+	random.seed(0)
+	random_pos = lambda: (random.random() * WORLD_SIZE[0], random.random() * WORLD_SIZE[1])
+	players = [Target(game, "player", random_pos(), dashing=random.choice([0, 55])) for i in range(4)]
+	enemies = [Target(game, "enemy", random_pos()) for i in range(enemy_count)]
+
+	# Aim half of the projectiles at the players, so there's something to hit.
+	projectiles = []
+	for i in range(projectile_count):
+		pos = random_pos() if i % 2 else players[i % 4].rect().center
+		projectile = Projectile.__new__(Projectile)
+		projectile.pos = list(pos)
+		projectiles.append(projectile)
+	# And put some enemies right next to the dashing players.
+	for i, player in enumerate(players):
+		enemies[i].pos = [player.pos[0] + 2, player.pos[1]]
+	return players, enemies, projectiles
+
+
+def all_pairs(players, enemies, projectiles):
+	hits = []
+	for projectile in projectiles:
+		for player in players:
+			if abs(player.dashing) < 50 and player.rect().collidepoint(projectile.pos):
+				hits.append((projectile, player))
+				break
+	for enemy in enemies:
+		for player in players:
+			if abs(player.dashing) >= 50 and enemy.rect().colliderect(player.rect()):
+				hits.append((enemy, player))
+	return hits
+
+
+def broadphase(player_grid, enemy_grid, players, enemies, projectiles):
+	hits = []
+	player_grid.clear()
+	for player in players:
+		player_grid.insert(player, player.rect())
+	for projectile in projectiles:
+		for player in player_grid.query_point(projectile.pos):
+			if abs(player.dashing) < 50 and player.rect().collidepoint(projectile.pos):
+				hits.append((projectile, player))
+				break
+
+	dashing_players = [player for player in players if abs(player.dashing) >= 50]
+	if dashing_players:
+		enemy_grid.clear()
+		for enemy in enemies:
+			enemy_grid.insert(enemy, enemy.rect())
+		for player in dashing_players:
+			for enemy in enemy_grid.query_rect(player.rect()):
+				if enemy.rect().colliderect(player.rect()):
+					hits.append((enemy, player))
+	return hits
+
+
+def main():
+	game = BenchmarkGame()
+	player_grid = SpatialGrid()
+	enemy_grid = SpatialGrid()
+	print(f"4 players, {FRAMES} frames:")
+	print(f"The game switches to the grid at {BROADPHASE_ENEMY_COUNT} enemies and {BROADPHASE_PROJECTILE_COUNT} projectiles.")
+	for enemy_count, projectile_count in [(10, 10), (30, 30), (50, 50), (100, 100), (500, 500), (1000, 1000)]:
+		players, enemies, projectiles = spawn(game, enemy_count, projectile_count)
+
+		start = time.perf_counter()
+		for frame in range(FRAMES):
+			expected = all_pairs(players, enemies, projectiles)
+		all_pairs_time = time.perf_counter() - start
+
+		start = time.perf_counter()
+		for frame in range(FRAMES):
+			hits = broadphase(player_grid, enemy_grid, players, enemies, projectiles)
+		broadphase_time = time.perf_counter() - start
+
+		assert set(expected) == set(hits), "The broadphase missed or added hits."
+		print(f"{enemy_count:>5} enemies, {projectile_count:>5} projectiles ({len(hits)} hits): "
+			f"all pairs {all_pairs_time * 1000:7.1f} ms, broadphase {broadphase_time * 1000:6.1f} ms ({all_pairs_time / broadphase_time:.1f}x)")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,82 @@
+"""Moves 500 physics entities across a map, with the old per-call Rect allocation and the cached collision rects.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.entity_physics [map_id]
+"""
+import random
+import sys
+import time
+
+import pygame
+
+from scripts.animation import Animation
+from scripts.entities import PhysicsEntity
+from scripts.tilemap import Tilemap, PHYSICS_TILES
+
+
+ENTITY_COUNT = 500
+FRAMES = 300
+
+
+# Tilemap with the neighbor rect query as it was before the collision rects were cached.
+class LegacyTilemap(Tilemap):
+	def physics_neighbor_rects(self, pos):
+		rects = []
+		for tile in self.neighbor_tiles(pos):
+			if tile.type in PHYSICS_TILES:
+				rect = pygame.Rect(tile.pos[0] * self.tile_size, tile.pos[1] * self.tile_size,
+									self.tile_size, self.tile_size)
+				rects.append(rect)
+
+		return rects
+
+
+class BenchmarkGame:
+	def __init__(self):
+		self.assets = {"enemy/run": Animation([None], flipped_images=[None])}
+
+
+def spawn_entities(game, tilemap, count=ENTITY_COUNT):
+	random.seed(0)
+	spawn_locs = [tile_loc for tile_loc in tilemap.solid_rects if (tile_loc[0], tile_loc[1] - 1) not in tilemap.map]
+	entities = []
+	for i in range(count):
+		tile_loc = random.choice(spawn_locs)
+		entity = PhysicsEntity(game, "enemy", (tile_loc[0] * tilemap.tile_size + 4, (tile_loc[1] - 1) * tilemap.tile_size), (8, 15))
+		entity.set_action("run")
+		entity.walk_direction = random.choice([-1, 1])
+		entities.append(entity)
+	return entities
+
+
+def run(tilemap_class, map_id):
+	game = BenchmarkGame()
+	tilemap = tilemap_class(game)
+	tilemap.load(f"assets/maps/{map_id}.json")
+	entities = spawn_entities(game, tilemap)
+
+	start = time.perf_counter()
+	for frame in range(FRAMES):
+		for entity in entities:
+			# Walk back and forth, turning around when bumping into walls.
+			if entity.collisions["left"] or entity.collisions["right"]:
+				entity.walk_direction *= -1
+			entity.update(tilemap, movement=(entity.walk_direction * 0.5, 0))
+	elapsed = time.perf_counter() - start
+
+	return elapsed, [tuple(entity.pos) for entity in entities]
+
+
+def main():
+	map_id = sys.argv[1] if len(sys.argv) > 1 else 2
+	legacy_time, legacy_positions = run(LegacyTilemap, map_id)
+	cached_time, cached_positions = run(Tilemap, map_id)
+	assert legacy_positions == cached_positions
+
+	updates = ENTITY_COUNT * FRAMES
+	print(f"Map {map_id}: {ENTITY_COUNT} entities for {FRAMES} frames.")
+	print(f"Allocated rects: {legacy_time * 1000:8.1f}ms ({updates / legacy_time:>10,.0f} updates/s)")
+	print(f"Cached rects:    {cached_time * 1000:8.1f}ms ({updates / cached_time:>10,.0f} updates/s)")
+
+
+if __name__ == "__main__":
+	main()
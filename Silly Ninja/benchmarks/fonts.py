@@ -0,0 +1,79 @@
+"""Builds the UI of every menu, the main menu, host, join, lobby and map editor ones, along with the players' name
+tags, in a fresh process each time. Looks up a system font for every piece of text as before against the font
+registry loading the bundled fonts once each, with the time spent on fonts and the whole startup.
+
+The games behind the menus are left out, they'd load the same assets either way.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.fonts
+"""
+import json
+import subprocess
+import sys
+import time
+
+
+# Font lookups as they were, a new system font for every piece of text.
+class SysFontPerText:
+	def __init__(self):
+		self.fonts = []
+		self.requests = 0
+		self.load_time = 0
+
+
+	def get(self, name, size, bold=False):
+		import pygame
+
+		self.requests += 1
+		start = time.perf_counter()
+		font = pygame.font.SysFont(name, size, bold)
+		self.load_time += time.perf_counter() - start
+		self.fonts.append(font)
+		return font
+
+
+# Stands in for the menus' games.
+class MenuGame:
+	def __init__(self, *args, **kwargs):
+		from scripts.game import PLAYERS
+		self.entities = PLAYERS
+
+
+	def run(self):
+		pass
+
+
+def build_menus(mode):
+	start = time.perf_counter()
+	import scripts.ui.ui_elements as ui_elements
+	if mode == "sysfont":
+		ui_elements.fonts = SysFontPerText()
+
+	import scripts.ui.sub_menus as sub_menus
+	import silly_ninja
+	import map_editor
+	sub_menus.GameForHost = sub_menus.GameForClient = silly_ninja.GameSolo = map_editor.MapEditor = MenuGame
+
+	silly_ninja.MainMenu()
+	map_editor.EditorMenu()
+	sub_menus.Lobby(MenuGame(), is_host=True)
+	sub_menus.Lobby(MenuGame(), is_host=False)
+	elapsed = time.perf_counter() - start
+
+	fonts = ui_elements.fonts
+	print(json.dumps({"startup": elapsed, "font_time": fonts.load_time, "requests": fonts.requests, "fonts": len(fonts.fonts)}))
+
+
+def main():
+	print("UI of every menu built in a fresh process:")
+	for name, mode in [("SysFont per text", "sysfont"), ("Font registry", "registry")]:
+		output = subprocess.run([sys.executable, "-m", "benchmarks.fonts", mode], capture_output=True, text=True, check=True).stdout
+		result = json.loads(output.strip().splitlines()[-1])
+		print(f"{name:<18}{result['fonts']:>4} fonts for {result['requests']} texts, {result['font_time'] * 1000:7.1f} ms on fonts, " +
+			f"{result['startup'] * 1000:7.1f} ms startup")
+
+
+if __name__ == "__main__":
+	if len(sys.argv) > 1:
+		build_menus(sys.argv[1])
+	else:
+		main()
@@ -0,0 +1,82 @@
+"""Times the level load hitch on the game thread: loading a level on the spot, swapping in a prefetched one
+and restoring a cached one on respawn.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.level_transition
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import pygame
+
+from benchmarks.map_loading import write_large_map
+from scripts.levels import LevelCache, LevelPrefetcher, PreparedLevel
+from scripts.map_format import level_count
+from scripts.tilemap import Tilemap
+from scripts.utils import load_images
+
+
+FRAME_WORK = 0.004  # Seconds of work per simulated frame while the worker is busy.
+
+
+class BenchmarkGame:
+	def __init__(self):
+		self.assets = {tile_type: load_images(f"tiles/{tile_type}") for tile_type in ["decor", "grass", "large_decor", "stone", "spawners"]}
+		self.tilemap = Tilemap(self, 16)
+
+
+# The tilemap part of GameBase.load_level, as it runs on the transition or respawn frame.
+def restore_frame(game, level):
+	start = time.perf_counter()
+	level.restore(game.tilemap)
+	return (time.perf_counter() - start) * 1000
+
+
+# Keep running short frames while the worker prepares a level, to see how much it slows the game thread down.
+def frames_while_prefetching(prefetcher, level_id):
+	prefetcher.request(level_id)
+	frame_times = []
+	while prefetcher.thread.is_alive():
+		start = time.perf_counter()
+		while time.perf_counter() < start + FRAME_WORK:
+			pass
+		frame_times.append((time.perf_counter() - start) * 1000)
+	return frame_times
+
+
+def main():
+	pygame.display.set_mode((1, 1))
+	game = BenchmarkGame()
+
+	# The game's own levels, plus a large generated one after them.
+	folder = tempfile.mkdtemp()
+	for name in os.listdir("assets/maps"):
+		if name.endswith(".json"):
+			shutil.copy(os.path.join("assets/maps", name), folder)
+	large_id = level_count(folder)
+	write_large_map(os.path.join(folder, f"{large_id}.json"))
+
+	prefetcher = LevelPrefetcher(game, folder)
+	cache = LevelCache()
+	print(f"{'Level':<8}{'On the spot':>14}{'Prefetched':>13}{'Cached':>11}{'Worker time':>14}{'Worst frame':>14}")
+	for level_id in range(large_id + 1):
+		start = time.perf_counter()
+		level = PreparedLevel(game, level_id, folder)
+		on_the_spot = (time.perf_counter() - start) * 1000 + restore_frame(game, level)
+
+		frame_times = frames_while_prefetching(prefetcher, level_id)
+		level = prefetcher.take(level_id)
+		prefetched = restore_frame(game, level)
+		cache.put(level)
+
+		# Dying a few times on the level, each respawn restores it from the cache.
+		cached = min(restore_frame(game, cache.get(level_id)) for i in range(5))
+		print(f"{level_id:<8}{on_the_spot:>11.2f} ms{prefetched:>10.2f} ms{cached:>8.2f} ms{level.prepare_time * 1000:>11.1f} ms"
+			f"{max(frame_times, default=0):>11.1f} ms")
+
+	print(f"Level cache: {cache.hits} hits, {cache.misses} misses.")
+	print(f"Simulated frames do {FRAME_WORK * 1000:.0f} ms of work each, the worst one shows the slowdown from sharing the GIL with the worker.")
+
+if __name__ == "__main__":
+	main()
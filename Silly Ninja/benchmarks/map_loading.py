@@ -0,0 +1,66 @@
+"""Compares Tilemap.load times of the JSON maps against their packed binary copies.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.map_loading
+"""
+import json
+import os
+import random
+import tempfile
+import time
+
+from scripts.map_format import convert
+from scripts.tilemap import Tilemap
+
+
+REPEATS = 20
+
+
+# A large community-sized level: a wide strip of ground, some floating platforms and decor.
+def write_large_map(path, width=400, height=120):
+	random.seed(0)
+	grid = {}
+	for x in range(width):
+		for y in range(height - 20, height):
+			grid[f"{x};{y}"] = {"type": "stone" if y > height - 15 else "grass", "variant": 1, "pos": [x, y]}
+		if random.random() < 0.3:
+			y = random.randint(20, height - 25)
+			grid[f"{x};{y}"] = {"type": "grass", "variant": 1, "pos": [x, y]}
+
+	offgrid = [{"type": "large_decor", "variant": random.randint(0, 2),
+				"pos": [random.random() * width * 16, (height - 22) * 16]} for i in range(width)]
+
+	f = open(path, 'w')
+	json.dump({"tilemap": grid, "tile_size": 16, "offgrid_tiles": offgrid}, f, indent=4)
+	f.close()
+
+
+def time_load(path):
+	tilemap = Tilemap(None)
+	start = time.perf_counter()
+	for i in range(REPEATS):
+		tilemap.load(path)
+	return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+	temp_dir = tempfile.mkdtemp()
+	paths = []
+	for name in sorted(os.listdir("assets/maps")):
+		if name.endswith(".json"):
+			paths.append(os.path.join(temp_dir, name))
+			f = open(paths[-1], 'w')
+			f.write(open(os.path.join("assets/maps", name)).read())
+			f.close()
+
+	paths.append(os.path.join(temp_dir, "large.json"))
+	write_large_map(paths[-1])
+
+	print(f"{'Map':<12}{'JSON size':>12}{'Packed size':>14}{'JSON load':>12}{'Packed load':>14}")
+	for json_path in paths:
+		binary_path = convert(json_path)
+		print(f"{os.path.basename(json_path):<12}{os.path.getsize(json_path):>12,}{os.path.getsize(binary_path):>14,}"
+			f"{time_load(json_path):>10.2f}ms{time_load(binary_path):>12.2f}ms")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,160 @@
+"""tracemalloc report of the slotted game objects against the dict-backed ones they replaced:
+bytes per object, tile memory per level, and bytes kept per hit and dash effect burst against the effect pools.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.memory
+"""
+import math
+import os
+import random
+import tracemalloc
+
+import scripts.tilemap
+from scripts.animation import Animation
+from scripts.clouds import Cloud
+from scripts.tilemap import Tilemap, Tile
+from scripts.particles import ParticleSystem, SparkSystem
+from scripts.visual_effects import Projectile
+
+
+OBJECT_COUNT = 10000
+HIT_SPARKS = 30
+HIT_PARTICLES = 30
+DASH_PARTICLES = 20
+
+
+# The objects as they were before, plain classes with an attribute dict each.
+class LegacyTile:
+	def __init__(self, t_type, variant, pos):
+		# Tiles used to keep the position list and type name parsed from the map file, one of each per tile.
+		self.type = t_type.encode().decode()
+		self.variant = variant
+		self.pos = list(pos)
+
+
+class LegacyAnimation:
+	def __init__(self, images, image_duration=5, loop=True):
+		self.images = images
+		self.image_duration = image_duration
+		self.frame = 0
+		self.loop = loop
+		self.done = False
+
+
+class LegacySpark:
+	def __init__(self, pos, angle, speed):
+		self.pos = list(pos)
+		self.angle = angle
+		self.speed = speed
+
+
+class LegacyParticle:
+	def __init__(self, game, p_type, pos, velocity=[0, 0], start_frame=0):
+		self.game = game
+		self.type = p_type
+		self.pos = list(pos)
+		self.velocity = list(velocity)
+		animation = game.assets["particle/" + self.type]
+		self.animation = LegacyAnimation(animation.images, animation.image_duration, animation.loop)
+		self.animation.frame = start_frame
+
+
+class LegacyProjectile:
+	def __init__(self, game, pos, direction, alive_time=0):
+		self.game = game
+		self.pos = list(pos)
+		self.direction = direction
+		self.alive_time = alive_time
+		self.impact_time = None
+
+
+class LegacyCloud:
+	def __init__(self, pos, image, speed, depth):
+		self.pos = list(pos)
+		self.image = image
+		self.speed = speed
+		self.depth = depth
+
+
+class BenchmarkGame:
+	def __init__(self):
+		self.assets = {"particle/dust": Animation([None] * 4, image_duration=6, loop=False, flipped_images=[None] * 4)}
+		self.tilemap = Tilemap(None)
+
+
+def traced_bytes(create):
+	tracemalloc.start()
+	kept = create()
+	size = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	del kept
+	return size
+
+
+def effect_burst(game, sparks, particles):
+	burst = []
+	for i in range(sparks):
+		burst.append(LegacySpark((100, 100), random.random() * math.pi * 2, random.random() + 2))
+	for i in range(particles):
+		angle = random.random() * math.pi * 2
+		velocity = [math.cos(angle) * 0.5, math.sin(angle) * 0.5]
+		burst.append(LegacyParticle(game, "dust", (100, 100), velocity=velocity, start_frame=random.randint(0, 7)))
+	return burst
+
+
+# The same burst spawned into preallocated pools.
+def pooled_burst(spark_pool, particle_pool, sparks, particles):
+	for i in range(sparks):
+		spark_pool.spawn((100, 100), random.random() * math.pi * 2, random.random() + 2)
+	for i in range(particles):
+		angle = random.random() * math.pi * 2
+		velocity = [math.cos(angle) * 0.5, math.sin(angle) * 0.5]
+		particle_pool.spawn("dust", (100, 100), velocity=velocity, start_frame=random.randint(0, 7))
+
+
+# Load a level with the tilemap creating its tiles from the given class.
+def load_level(path, tile_class):
+	scripts.tilemap.Tile = tile_class
+	tilemap = Tilemap(None)
+	tilemap.load(path)
+	scripts.tilemap.Tile = Tile
+	return tilemap
+
+
+def main():
+	game = BenchmarkGame()
+	images = [None]  # Animations share their image lists with the asset they were copied from.
+	clip = Animation(images, flipped_images=images)
+	pairs = [
+		("Tile", lambda: LegacyTile("grass", 1, (3, 4)), lambda: Tile("grass", 1, (3, 4))),
+		("Animation", lambda: LegacyAnimation(images), lambda: clip.play()),
+		("Projectile", lambda: LegacyProjectile(game, (1.5, 2.5), 1.5), lambda: Projectile(game, (1.5, 2.5), 1.5)),
+		("Cloud", lambda: LegacyCloud((1.5, 2.5), None, 0.1, 0.5), lambda: Cloud((1.5, 2.5), None, 0.1, 0.5)),
+	]
+
+	print(f"{'Object':<12}{'Dict-backed':>14}{'Slotted':>10}   (bytes per object, with its own lists)")
+	for name, legacy, slotted in pairs:
+		legacy_size = traced_bytes(lambda: [legacy() for i in range(OBJECT_COUNT)]) / OBJECT_COUNT
+		slotted_size = traced_bytes(lambda: [slotted() for i in range(OBJECT_COUNT)]) / OBJECT_COUNT
+		print(f"{name:<12}{legacy_size:>14.0f}{slotted_size:>10.0f}")
+
+	print(f"\n{'Level':<8}{'Tiles':>8}{'Dict-backed':>14}{'Slotted':>12}   (bytes held by the loaded tilemap)")
+	for name in sorted(os.listdir("assets/maps")):
+		if name.endswith(".json"):
+			path = os.path.join("assets/maps", name)
+			legacy_size = traced_bytes(lambda: load_level(path, LegacyTile))
+			slotted_size = traced_bytes(lambda: load_level(path, Tile))
+			tilemap = load_level(path, Tile)
+			tile_count = len(tilemap.map) + len(tilemap.offgrid_tiles)
+			print(f"{os.path.splitext(name)[0]:<8}{tile_count:>8}{legacy_size:>14,}{slotted_size:>12,}")
+
+	spark_pool = SparkSystem()
+	particle_pool = ParticleSystem({"dust": game.assets["particle/dust"]})
+	print("\nBytes kept per effect burst, objects against pools:")
+	for name, sparks, particles in [("Hit", HIT_SPARKS, HIT_PARTICLES), ("Dash", 0, DASH_PARTICLES)]:
+		legacy_size = traced_bytes(lambda: effect_burst(game, sparks, particles))
+		pooled_size = traced_bytes(lambda: pooled_burst(spark_pool, particle_pool, sparks, particles))
+		print(f"{name:<8}{legacy_size:>10,} -> {pooled_size:,}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,80 @@
+"""Plays the first levels with a scripted player and renders every step, outlining the sprites from a mask of the
+whole display as before against the outline layer, with its silhouettes cached per chunk and only the areas around
+the moving sprites outlined from their masks. Sparks burst and projectiles fly past the player every second. Both
+have to draw the exact same pixels on every frame.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.outline
+"""
+import hashlib
+import math
+import random
+import time
+
+import pygame
+
+from scripts.headless import HeadlessGame, random_script
+from scripts.visual_effects import Projectile
+
+
+TICKS = 1200
+LEVEL_IDS = (0, 1, 2)
+
+
+# The outline pass as it was, a mask of the whole display built and drawn every frame.
+class LegacyOutlineGame(HeadlessGame):
+	def render_effects(self, render_scroll):
+		self.sparks.render(self.outline_display, offset=render_scroll)
+
+		display_mask = pygame.mask.from_surface(self.outline_display)
+		display_silhouette = display_mask.to_surface(setcolor=(0, 0, 0, 180), unsetcolor=(0, 0, 0, 0))
+		for offset in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+			self.normal_display.blit(display_silhouette, offset)
+
+		self.particles.render(self.outline_display, offset=render_scroll)
+
+
+# Sparks and projectiles around the player, the same ones for both runs.
+def add_effects(game, rng):
+	center = game.player.rect().center
+	for i in range(20):
+		game.sparks.spawn(center, rng.random() * math.pi * 2, rng.random() + 2)
+	game.projectiles.append(Projectile(game, (center[0] - 100, center[1] - rng.randint(0, 40)), 1.5))
+
+
+def run(game_class, level_id, script):
+	game = game_class(level_id)
+	rng = random.Random(level_id)
+	frames = []
+	render_time = 0
+
+	for tick in range(TICKS):
+		if tick % 60 == 0:
+			add_effects(game, rng)
+		game.simulate(1, script)
+
+		start = time.perf_counter()
+		game.render_world(1)
+		render_time += time.perf_counter() - start
+		frames.append(hashlib.sha1(pygame.image.tobytes(game.normal_display, "RGB")).digest())
+
+	return render_time, frames
+
+
+def main():
+	# The images are converted for a display, as they are in the game.
+	pygame.init()
+	pygame.display.set_mode((1, 1))
+
+	print(f"{TICKS} rendered steps per level, identical pixels on every frame:")
+	print(f"{'Level':<8}{'Full mask':>12}{'Outline layer':>16}   (ms per frame)")
+	for level_id in LEVEL_IDS:
+		script = random_script(TICKS, seed=level_id)
+		legacy_time, legacy_frames = run(LegacyOutlineGame, level_id, script)
+		layer_time, layer_frames = run(HeadlessGame, level_id, script)
+		assert legacy_frames == layer_frames
+
+		print(f"{level_id:<8}{legacy_time / TICKS * 1000:>12.3f}{layer_time / TICKS * 1000:>16.3f}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,206 @@
+"""Keeps 10,000 dust particles and 2,000 sparks alive, with bursts spawned every frame, updating and rendering them
+as lists of objects as before against the preallocated NumPy pools. Both keep the same effects alive every frame,
+and draw the exact same sparks. As in the game loop, effects that expire on an update are rendered once more before
+being removed.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.particles
+"""
+import math
+import random
+import time
+
+import pygame
+
+from scripts.headless import HeadlessGame, VIEW_SIZE
+from scripts.particles import ParticleSystem, SparkSystem
+
+
+PARTICLE_COUNT = 10000
+SPARK_COUNT = 2000
+FRAMES = 60
+
+
+# The effects as they were, one object each, removed from their lists with list.remove once rendered.
+class LegacySpark:
+	__slots__ = ("pos", "angle", "speed")
+
+	def __init__(self, pos, angle, speed):
+		self.pos = list(pos)
+		self.angle = angle
+		self.speed = speed
+
+	def update(self):
+		self.pos[0] += math.cos(self.angle) * self.speed
+		self.pos[1] += math.sin(self.angle) * self.speed
+
+		self.speed = max(self.speed - 0.1, 0)
+		return not self.speed
+
+	def render(self, surface, offset=(0, 0)):
+		render_points = [
+			(self.pos[0] + math.cos(self.angle) * self.speed * 3 - offset[0], self.pos[1] + math.sin(self.angle) * self.speed * 3 - offset[1]),
+			(self.pos[0] + math.cos(self.angle + math.pi * 0.5) * self.speed * 0.5 - offset[0], self.pos[1] + math.sin(self.angle + math.pi * 0.5) * self.speed * 0.5 - offset[1]),
+			(self.pos[0] + math.cos(self.angle + math.pi) * self.speed * 3 - offset[0], self.pos[1] + math.sin(self.angle + math.pi) * self.speed * 3 - offset[1]),
+			(self.pos[0] + math.cos(self.angle - math.pi * 0.5) * self.speed * 0.5 - offset[0], self.pos[1] + math.sin(self.angle - math.pi * 0.5) * self.speed * 0.5 - offset[1])
+		]
+		pygame.draw.polygon(surface, (255, 255, 255), render_points)
+
+
+class LegacyParticle:
+	__slots__ = ("game", "type", "pos", "velocity", "animation")
+
+	def __init__(self, game, p_type, pos, velocity=[0, 0], start_frame=0):
+		self.game = game
+		self.type = p_type
+		self.pos = list(pos)
+		self.velocity = list(velocity)
+		self.animation = self.game.assets["particle/" + self.type].play(start_frame)
+
+	def update(self):
+		kill = self.animation.done
+
+		self.pos[0] += self.velocity[0]
+		self.pos[1] += self.velocity[1]
+
+		self.animation.update()
+		return kill
+
+	def render(self, surface, offset=(0, 0)):
+		image = self.animation.current_frame_image()
+		surface.blit(image, (self.pos[0] - offset[0] + image.get_width() // 2,
+							self.pos[1] - offset[1] + image.get_height() // 2))
+
+
+class LegacyEffects:
+	def __init__(self, game):
+		self.game = game
+		self.sparks = []
+		self.particles = []
+		self.dead_sparks = []
+		self.dead_particles = []
+
+	def spawn(self, sparks, particles):
+		for spark in sparks:
+			self.sparks.append(LegacySpark(*spark))
+		for pos, velocity, start_frame in particles:
+			self.particles.append(LegacyParticle(self.game, "dust", pos, velocity=velocity, start_frame=start_frame))
+
+	def update(self):
+		self.dead_sparks = [spark for spark in self.sparks if spark.update()]
+		self.dead_particles = [particle for particle in self.particles if particle.update()]
+
+	def remove_dead(self):
+		for spark in self.dead_sparks:
+			self.sparks.remove(spark)
+		for particle in self.dead_particles:
+			self.particles.remove(particle)
+
+	def render_sparks(self, surface):
+		for spark in self.sparks:
+			spark.render(surface)
+
+	def render_particles(self, surface):
+		for particle in self.particles:
+			particle.render(surface)
+
+	def counts(self):
+		return len(self.sparks), len(self.particles)
+
+
+class PooledEffects:
+	def __init__(self, game):
+		self.sparks = SparkSystem(capacity=SPARK_COUNT * 2)
+		self.particles = ParticleSystem({"dust": game.assets["particle/dust"]}, capacity=PARTICLE_COUNT * 2)
+
+	def spawn(self, sparks, particles):
+		for spark in sparks:
+			self.sparks.spawn(*spark)
+		for pos, velocity, start_frame in particles:
+			self.particles.spawn("dust", pos, velocity=velocity, start_frame=start_frame)
+
+	def update(self):
+		self.sparks.update()
+		self.particles.update()
+
+	# The pools remove them at the start of the next update.
+	def remove_dead(self):
+		pass
+
+	def render_sparks(self, surface):
+		self.sparks.render(surface)
+
+	def render_particles(self, surface):
+		self.particles.render(surface)
+
+	def counts(self):
+		return len(self.sparks), len(self.particles)
+
+
+def random_spark():
+	return ((random.random() * VIEW_SIZE[0], random.random() * VIEW_SIZE[1]), random.random() * math.pi * 2, random.random() * 3 + 2)
+
+
+def random_particle():
+	angle = random.random() * math.pi * 2
+	speed = random.random() * 2.5
+	return ((random.random() * VIEW_SIZE[0], random.random() * VIEW_SIZE[1]), (math.cos(angle) * speed, math.sin(angle) * speed), random.randint(0, 7))
+
+
+# Enough to start at the target counts and keep them there, the same for both runs.
+def spawn_schedule():
+	random.seed(0)
+	schedule = [([random_spark() for i in range(SPARK_COUNT)], [random_particle() for i in range(PARTICLE_COUNT)])]
+	for frame in range(1, FRAMES):
+		schedule.append(([random_spark() for i in range(SPARK_COUNT // 40)], [random_particle() for i in range(PARTICLE_COUNT // 20)]))
+	return schedule
+
+
+def run(effects, schedule):
+	spark_surface = pygame.Surface(VIEW_SIZE, pygame.SRCALPHA)
+	particle_surface = pygame.Surface(VIEW_SIZE, pygame.SRCALPHA)
+	counts = []
+	spawn_time = 0
+	update_time = 0
+	render_time = 0
+
+	for sparks, particles in schedule:
+		start = time.perf_counter()
+		effects.spawn(sparks, particles)
+		spawn_time += time.perf_counter() - start
+
+		start = time.perf_counter()
+		effects.update()
+		update_time += time.perf_counter() - start
+		counts.append(effects.counts())
+
+		spark_surface.fill((0, 0, 0, 0))
+		particle_surface.fill((0, 0, 0, 0))
+		start = time.perf_counter()
+		effects.render_sparks(spark_surface)
+		effects.render_particles(particle_surface)
+		render_time += time.perf_counter() - start
+
+		start = time.perf_counter()
+		effects.remove_dead()
+		update_time += time.perf_counter() - start
+
+	return spawn_time, update_time, render_time, counts, pygame.image.tobytes(spark_surface, "RGBA")
+
+
+def main():
+	game = HeadlessGame()
+	schedule = spawn_schedule()
+	legacy = run(LegacyEffects(game), schedule)
+	pooled = run(PooledEffects(game), schedule)
+	assert legacy[3] == pooled[3] and legacy[4] == pooled[4]
+
+	average_sparks = sum(sparks for sparks, particles in pooled[3]) / FRAMES
+	average_particles = sum(particles for sparks, particles in pooled[3]) / FRAMES
+	print(f"{FRAMES} frames, {average_particles:,.0f} particles and {average_sparks:,.0f} sparks on average, same effects alive every frame:")
+	print(f"{'':<8}{'Spawn':>10}{'Update':>10}{'Render':>10}   (ms per frame)")
+	for name, (spawn_time, update_time, render_time, counts, pixels) in [("Objects", legacy), ("Pools", pooled)]:
+		print(f"{name:<8}{spawn_time / FRAMES * 1000:>10.2f}{update_time / FRAMES * 1000:>10.2f}{render_time / FRAMES * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,135 @@
+"""Presents game frames on a 640x480 window, scaling into a new surface every frame as before against the
+presenter's backends, still and with screenshake. Then presents a menu with a hovered button, updating the whole
+window every frame against only the areas its widgets drew on. Software scaled frames have to match exactly.
+
+SDL's SCALED mode needs a renderer, so it's skipped where there's none, like with the dummy video driver.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.presentation
+"""
+import random
+import time
+
+import pygame
+
+from scripts.headless import HeadlessGame
+from scripts.presentation import Presenter
+from scripts.ui.sub_menus import MenuBase
+from scripts.ui.ui_elements import Button, Text, BorderedText
+
+
+WINDOW_SIZE = (640, 480)
+FRAMES = 300
+SCREENSHAKE = 16
+
+
+def legacy_present(screen, display, offset):
+	screen.blit(pygame.transform.scale(display, screen.get_size()), offset)
+	pygame.display.update()
+
+
+def shake_offsets(screenshake):
+	random.seed(0)
+	return [(random.random() * screenshake - screenshake / 2, random.random() * screenshake - screenshake / 2) for i in range(FRAMES)]
+
+
+def run_game_frames(present, display, offsets):
+	screen = pygame.display.get_surface()
+	screen.fill((0, 0, 0))
+	start = time.perf_counter()
+	for offset in offsets:
+		present(display, offset)
+	return time.perf_counter() - start, pygame.image.tobytes(screen, "RGB")
+
+
+def bench_game_frames():
+	game = HeadlessGame()
+	game.render_world(1)
+	display = game.normal_display
+
+	print(f"{FRAMES} game frames scaled from {display.get_width()}x{display.get_height()} to {WINDOW_SIZE[0]}x{WINDOW_SIZE[1]}:")
+	print(f"{'':<20}{'Still':>10}{'Shaking':>10}   (ms per frame)")
+	legacy_pixels = []
+	for name, backend in [("New surface", None), ("Presenter, scale", "scale"), ("Presenter, scaled", "scaled")]:
+		times = []
+		for screenshake in (0, SCREENSHAKE):
+			pygame.display.set_mode(WINDOW_SIZE)
+			if backend is None:
+				elapsed, pixels = run_game_frames(lambda display, offset: legacy_present(pygame.display.get_surface(), display, offset),
+													display, shake_offsets(screenshake))
+				legacy_pixels.append(pixels)
+			else:
+				presenter = Presenter(pygame.display.get_surface(), backend=backend)
+				presenter.enter_game(display.get_size())
+				if presenter.backend != backend:
+					break
+				elapsed, pixels = run_game_frames(presenter.present, display, shake_offsets(screenshake))
+				presenter.leave_game()
+				if backend == "scale":
+					assert pixels == legacy_pixels[len(times)]
+			times.append(elapsed / FRAMES * 1000)
+
+		if times:
+			print(f"{name:<20}{times[0]:>10.3f}{times[1]:>10.3f}")
+		else:
+			print(f"{name:<20}   unavailable, no renderer")
+
+
+# The main menu's layout, with the mouse moving over the buttons.
+class BenchmarkMenu(MenuBase):
+	def __init__(self):
+		super().__init__()
+		self.title = BorderedText("SILLY NINJA", "retro gaming", (320, 30), size=70, bold=True)
+		self.version_text = Text("----- Released v1.0 -----", "retro computer", (320, 130), size=15)
+		self.buttons = [Button(name, "gamer", (320, y), (150, 60)) for name, y in [("Solo", 180), ("Join", 250), ("Host", 320), ("Quit", 390)]]
+
+
+	def render(self, frame):
+		MenuBase.screen.blit(self.background, (0, 0))
+		self.title.render(MenuBase.screen)
+		self.version_text.render(MenuBase.screen)
+
+		mx, my = 320, 180 + (frame // 30 % 4) * 70
+		for button in self.buttons:
+			button.update(MenuBase.screen, 0, mx, my, False)
+			button.render(MenuBase.screen)
+
+
+def bench_menu_frames():
+	pygame.display.set_mode(WINDOW_SIZE)
+	menu = BenchmarkMenu()
+	update = pygame.display.update
+	window_area = WINDOW_SIZE[0] * WINDOW_SIZE[1]
+
+	print(f"\n{FRAMES} main menu frames, window updates only:")
+	for name in ["Whole window", "Dirty rects"]:
+		MenuBase.presenter.invalidate()
+		sent = []
+		if name == "Whole window":
+			present = lambda: pygame.display.update()
+			sent_area = lambda rects: window_area
+		else:
+			present = menu.present
+			sent_area = lambda rects: window_area if rects is None else sum(rect.w * rect.h for rect in rects)
+
+		# Count the pixels sent, the driver decides what sending them costs.
+		pygame.display.update = lambda rects=None: (sent.append(sent_area(rects)), update(rects) if rects is not None else update())
+		elapsed = 0
+		for frame in range(FRAMES):
+			menu.render(frame)
+			start = time.perf_counter()
+			present()
+			elapsed += time.perf_counter() - start
+		pygame.display.update = update
+
+		print(f"{name:<16}{elapsed / FRAMES * 1000:8.3f} ms, {sum(sent[1:]) / (FRAMES - 1) / window_area * 100:5.1f}% of the window sent per frame")
+
+
+def main():
+	pygame.init()
+	pygame.display.set_mode(WINDOW_SIZE)
+	bench_game_frames()
+	bench_menu_frames()
+
+
+if __name__ == "__main__":
+	main()
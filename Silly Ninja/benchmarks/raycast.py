@@ -0,0 +1,79 @@
+"""Compares polling projectiles against solid tiles every frame with predicting their impact once at spawn.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.raycast
+"""
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.map_loading import write_large_map
+from scripts.tilemap import Tilemap
+from scripts.visual_effects import Projectile, MAX_PROJECTILE_TIME
+
+
+PROJECTILES = 2000
+RAYS = 100000
+
+
+class BenchmarkGame:
+	def __init__(self, tilemap):
+		self.tilemap = tilemap
+
+
+def spawn_positions(tilemap):
+	random.seed(0)
+	tile_locs = list(tilemap.map)
+	positions = []
+	for i in range(PROJECTILES):
+		x, y = random.choice(tile_locs)
+		positions.append(((x * tilemap.tile_size + random.randint(-300, 300), (y - 1) * tilemap.tile_size + 8), random.choice([-1.5, 1.5])))
+	return positions
+
+
+def run_polling(tilemap, positions):
+	impacts = []
+	start = time.perf_counter()
+	for pos, direction in positions:
+		projectile = [pos[0], pos[1]]
+		for alive_time in range(1, MAX_PROJECTILE_TIME + 2):
+			projectile[0] += direction
+			if tilemap.solid_check(projectile):
+				impacts.append(alive_time)
+				break
+		else:
+			impacts.append(None)
+	return (time.perf_counter() - start) * 1000, impacts
+
+
+def run_predicted(game, positions):
+	start = time.perf_counter()
+	impacts = [Projectile(game, pos, direction).impact_time for pos, direction in positions]
+	return (time.perf_counter() - start) * 1000, impacts
+
+
+def main():
+	path = os.path.join(tempfile.mkdtemp(), "large.json")
+	write_large_map(path)
+	tilemap = Tilemap(None)
+	tilemap.load(path)
+	game = BenchmarkGame(tilemap)
+	positions = spawn_positions(tilemap)
+
+	polling_time, polled = run_polling(tilemap, positions)
+	predicted_time, predicted = run_predicted(game, positions)
+	assert polled == predicted, "Predicted impacts differ from polled ones."
+	print(f"{PROJECTILES} projectiles, {sum(impact is not None for impact in polled)} hitting a wall:")
+	print(f"  Polling solid_check every frame: {polling_time:.1f} ms")
+	print(f"  Raycast at spawn:                {predicted_time:.1f} ms ({polling_time / predicted_time:.1f}x)")
+
+	random.seed(1)
+	rays = [((random.random() * 400 * 16, random.random() * 120 * 16), (random.random() - 0.5, random.random() - 0.5)) for i in range(RAYS)]
+	start = time.perf_counter()
+	for origin, direction in rays:
+		tilemap.raycast(origin, direction, 320)
+	print(f"Raycasts up to 320 px: {RAYS / (time.perf_counter() - start):,.0f} per second")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,67 @@
+"""Times rule tiling a large map with the old per-tile loop, the vectorized pass and the incremental mode.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.ruletile
+"""
+import random
+import time
+
+from scripts.tilemap import Tilemap, Tile, RULETILE_MAP, RULETILE_TYPES
+
+
+# The rule tiling loop as it was before the vectorized engine.
+def legacy_ruletile(tilemap):
+	for tile_loc in tilemap.map:
+		tile = tilemap.map[tile_loc]
+		neighbors = set()
+		for shift in [(1, 0), (-1, 0), (0, -1), (0, 1)]:
+			check_loc = (tile_loc[0] + shift[0], tile_loc[1] + shift[1])
+			if check_loc in tilemap.map and tilemap.map[check_loc].type == tile.type:
+				neighbors.add(shift)
+
+		neighbors = tuple(sorted(neighbors))
+		if tile.type in RULETILE_TYPES and neighbors in RULETILE_MAP:
+			tile.variant = RULETILE_MAP[neighbors]
+
+
+def build_map(width, height):
+	random.seed(0)
+	tilemap = Tilemap(None)
+	for x in range(width):
+		for y in range(height):
+			if random.random() < 0.6:
+				tilemap.map[(x, y)] = Tile(random.choice(["grass", "stone", "decor"]), 0, (x, y))
+	tilemap.build_grid_indexes()
+	return tilemap
+
+
+def variants(tilemap):
+	return {tile_loc: tile.variant for tile_loc, tile in tilemap.map.items()}
+
+
+def main():
+	build_map(10, 10).ruletile()  # Warm up NumPy before timing anything.
+
+	for width, height in [(100, 50), (400, 200), (1000, 500)]:
+		legacy = build_map(width, height)
+		start = time.perf_counter()
+		legacy_ruletile(legacy)
+		legacy_time = time.perf_counter() - start
+
+		vectorized = build_map(width, height)
+		start = time.perf_counter()
+		vectorized.ruletile()
+		vectorized_time = time.perf_counter() - start
+		assert variants(legacy) == variants(vectorized)
+
+		# Re-tile around a single edited cell in the middle of the map.
+		vectorized.set_tile((width // 2, height // 2), Tile("stone", 0, (width // 2, height // 2)))
+		start = time.perf_counter()
+		vectorized.ruletile([(width // 2, height // 2)])
+		incremental_time = time.perf_counter() - start
+
+		print(f"{width}x{height} ({len(legacy.map):,} tiles): legacy {legacy_time * 1000:.1f}ms, "
+			f"vectorized {vectorized_time * 1000:.1f}ms, incremental {incremental_time * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+	main()
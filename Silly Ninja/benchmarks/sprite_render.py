@@ -0,0 +1,74 @@
+"""Renders 1,000 enemies with their guns, half of them facing left, flipping the sprites every frame as before
+against the mirrored copies built with the assets. Both have to draw the exact same pixels.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.sprite_render
+"""
+import random
+import time
+
+import pygame
+
+from scripts.entities import Enemy
+from scripts.headless import HeadlessGame, VIEW_SIZE
+
+
+ENEMY_COUNT = 1000
+FRAMES = 100
+
+
+# Enemy rendering as it was, flipping the animation frame and the gun on every render.
+class LegacyEnemy(Enemy):
+	def render(self, surface, offset=(0, 0), alpha=1):
+		render_pos = self.render_pos(alpha)
+		image_to_render = pygame.transform.flip(self.animation.current_frame_image(), self.facing_left, False)
+		surface.blit(image_to_render, (render_pos[0] - offset[0] + self.anim_offset[0],
+										render_pos[1] - offset[1] + self.anim_offset[0]))
+
+		center = (int(render_pos[0]) + self.size[0] // 2, int(render_pos[1]) + self.size[1] // 2)
+		if self.facing_left:
+			gun = pygame.transform.flip(self.game.assets["gun"], True, False)
+			surface.blit(gun, (center[0] - 4 - self.game.assets["gun"].get_width() - offset[0], center[1] - offset[1]))
+		else:
+			surface.blit(self.game.assets["gun"], (center[0] + 4 - offset[0], center[1] - offset[1]))
+
+
+def spawn(game, enemy_class):
+	random.seed(0)
+	enemies = []
+	for i in range(ENEMY_COUNT):
+		enemy = enemy_class(game, (random.random() * (VIEW_SIZE[0] - 16), random.random() * (VIEW_SIZE[1] - 16)), (8, 15))
+		enemy.facing_left = i % 2 == 1
+		enemy.set_action(random.choice(["idle", "run"]))
+		enemy.animation.frame = random.randint(0, 23)
+		enemies.append(enemy)
+	return enemies
+
+
+def run(game, enemy_class):
+	enemies = spawn(game, enemy_class)
+	surface = pygame.Surface(VIEW_SIZE, pygame.SRCALPHA)
+
+	start = time.perf_counter()
+	for frame in range(FRAMES):
+		surface.fill((0, 0, 0, 0))
+		for enemy in enemies:
+			enemy.render(surface)
+	elapsed = time.perf_counter() - start
+
+	return elapsed, pygame.image.tobytes(surface, "RGBA")
+
+
+def main():
+	game = HeadlessGame()
+	legacy_time, legacy_pixels = run(game, LegacyEnemy)
+	cached_time, cached_pixels = run(game, Enemy)
+	assert legacy_pixels == cached_pixels
+
+	renders = ENEMY_COUNT * FRAMES
+	print(f"{ENEMY_COUNT} enemies for {FRAMES} frames, identical pixels.")
+	print(f"Flipped every frame: {legacy_time * 1000:8.1f}ms ({renders / legacy_time:>10,.0f} renders/s)")
+	print(f"Pre-flipped sprites: {cached_time * 1000:8.1f}ms ({renders / cached_time:>10,.0f} renders/s, {legacy_time / cached_time:.1f}x)")
+
+
+if __name__ == "__main__":
+	main()
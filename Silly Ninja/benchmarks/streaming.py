@@ -0,0 +1,102 @@
+"""Walks a camera across a large level split into regions, comparing the streamed tilemap against a full load.
+Entities walk along off screen, counting the regions read from disk by their physics queries rather than in the
+background, first few enough for their regions to fit the memory budget, then more than it can hold.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.streaming
+"""
+import os
+import random
+import tempfile
+import threading
+import time
+
+import pygame
+
+from benchmarks.map_loading import write_large_map
+from scripts.streaming import split_level, MAX_LOADED_REGIONS
+from scripts.tilemap import Tilemap
+
+
+VIEW_SIZE = (320, 240)
+STEPS = 600
+ENTITY_COUNTS = (8, 40)
+
+
+def walk(folder, full, entity_count):
+	streamed = Tilemap(None)
+	start = time.perf_counter()
+	streamed.load(folder)
+	open_time = (time.perf_counter() - start) * 1000
+
+	# Count the regions the entities' queries read on the game thread, the worker thread reads the rest.
+	sync_reads = []
+	counting = False
+	read_region = streamed.streamer.read_region
+	def counted_read_region(region_loc):
+		if counting and threading.current_thread() is threading.main_thread():
+			sync_reads.append(region_loc)
+		return read_region(region_loc)
+	streamed.streamer.read_region = counted_read_region
+
+	# Query positions around the camera, plus some far off-screen ones that force a synchronous load.
+	random.seed(1)
+	entities = [[random.random() * 1600 * 16, random.random() * 120 * 16] for i in range(entity_count)]
+	first_step_reads = 0
+	update_times = []
+	peak_regions = 0
+	peak_tiles = 0
+	for step in range(STEPS):
+		camera_x = step * (1600 * 16 - VIEW_SIZE[0]) / STEPS
+		camera_y = 100 * 16 - VIEW_SIZE[1]
+
+		start = time.perf_counter()
+		streamed.stream(pygame.Rect((camera_x, camera_y), VIEW_SIZE))
+		update_times.append((time.perf_counter() - start) * 1000)
+		peak_regions = max(peak_regions, len(streamed.streamer.loaded))
+		peak_tiles = max(peak_tiles, len(streamed.map) + len(streamed.offgrid_tiles))
+
+		for i in range(10):
+			if i == 0:
+				pos = (random.random() * 1600 * 16, random.random() * 120 * 16)
+			else:
+				pos = (camera_x + random.random() * VIEW_SIZE[0], camera_y + random.random() * VIEW_SIZE[1])
+			assert streamed.solid_check(pos) == full.solid_check(pos)
+			assert streamed.physics_neighbor_rects(pos) == full.physics_neighbor_rects(pos)
+
+		# Entities walk one pixel a step, the way enemies do.
+		counting = True
+		for pos in entities:
+			pos[0] += 1
+			assert streamed.physics_neighbor_rects(pos) == full.physics_neighbor_rects(pos)
+		counting = False
+		if step == 0:
+			first_step_reads = len(sync_reads)
+
+	streamed.clear()
+	update_times.sort()
+	print(f"{entity_count} entities: open {open_time:.2f} ms, peak {peak_regions} regions ({peak_tiles:,} tiles) loaded, " +
+		f"update median {update_times[len(update_times) // 2]:.3f} ms, worst {update_times[-1]:.3f} ms")
+	print(f"{'':<12}{first_step_reads} regions read by their physics on the first step, " +
+		f"{len(sync_reads) - first_step_reads} over the next {STEPS - 1}")
+
+
+def main():
+	temp_dir = tempfile.mkdtemp()
+	json_path = os.path.join(temp_dir, "large.json")
+	write_large_map(json_path, width=1600)
+	folder = split_level(json_path)
+
+	full = Tilemap(None)
+	start = time.perf_counter()
+	full.load(json_path)
+	full_time = (time.perf_counter() - start) * 1000
+
+	print(f"Full load: {full_time:.1f} ms, {len(full.map) + len(full.offgrid_tiles):,} tiles")
+	print(f"Streamed, with a budget of {MAX_LOADED_REGIONS} regions:")
+	for entity_count in ENTITY_COUNTS:
+		walk(folder, full, entity_count)
+	print("Physics queries matched the fully loaded map.")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,76 @@
+"""Renders the main menu, with the mouse moving over its buttons, and four players' name tags every frame, rasterizing
+every piece of text on every frame as before against the text cache. Both have to draw the exact same pixels.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.text_cache
+"""
+import time
+
+import pygame
+
+import scripts.ui.ui_elements as ui_elements
+from scripts.game import PLAYERS
+from scripts.ui.text_cache import TextCache
+from scripts.ui.ui_elements import Button, Text, BorderedText
+
+
+FRAMES = 600
+
+
+# Text rendering as it was, straight from the font every time.
+class NoTextCache:
+	def render(self, font, text, color, antialias):
+		return font.render(text, antialias, color)
+
+
+def create_widgets():
+	title = BorderedText("SILLY NINJA", "retro gaming", (320, 30), size=70, bold=True)
+	version_text = Text("----- Released v1.0 -----", "retro computer", (320, 130), size=15)
+	buttons = [Button(name, "gamer", (320, y), (150, 60)) for name, y in [("Solo", 180), ("Join", 250), ("Host", 320), ("Quit", 390)]]
+	for index, player in enumerate(PLAYERS):
+		player.pos = [60 + index * 150, 460]
+		player.previous_pos = tuple(player.pos)
+		player.name_text.set_text(f"ninja_{index + 1}")
+		player.name_text.update_pos((player.pos[0] + player.text_offset[0], player.pos[1] + player.text_offset[1]))
+	return title, version_text, buttons
+
+
+def run(cache):
+	ui_elements.text_cache = cache
+	title, version_text, buttons = create_widgets()
+	surface = pygame.Surface((640, 480))
+
+	start = time.perf_counter()
+	for frame in range(FRAMES):
+		surface.fill((0, 0, 0))
+		title.render(surface)
+		version_text.render(surface)
+
+		mx, my = 320, 180 + (frame // 30 % 4) * 70
+		for button in buttons:
+			button.update(surface, 0, mx, my, False)
+			button.render(surface)
+
+		for player in PLAYERS:
+			player.render_name_tag(surface)
+	elapsed = time.perf_counter() - start
+
+	return elapsed, pygame.image.tobytes(surface, "RGB")
+
+
+def main():
+	pygame.init()
+	text_cache = ui_elements.text_cache
+	legacy_time, legacy_pixels = run(NoTextCache())
+	cache = TextCache()
+	cached_time, cached_pixels = run(cache)
+	ui_elements.text_cache = text_cache
+	assert legacy_pixels == cached_pixels
+
+	print(f"Main menu and 4 name tags for {FRAMES} frames, identical pixels.")
+	print(f"Rendered every frame: {legacy_time / FRAMES * 1000:.3f} ms per frame")
+	print(f"Text cache:           {cached_time / FRAMES * 1000:.3f} ms per frame ({legacy_time / cached_time:.1f}x), " +
+		f"{cache.hits:,} hits, {cache.misses} misses, {cache.hit_rate() * 100:.2f}% hit rate, {len(cache.surfaces)} surfaces kept")
+
+
+if __name__ == "__main__":
+	main()
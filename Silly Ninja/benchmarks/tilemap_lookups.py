@@ -0,0 +1,64 @@
+"""Measures Tilemap grid lookups per second against the old "x;y" string keyed storage.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.tilemap_lookups [map_id]
+"""
+import random
+import sys
+import time
+
+from scripts.tilemap import Tilemap, PHYSICS_TILES, loc_to_key
+
+
+LOOKUPS = 200000
+
+
+# The lookups as they were done before the grid used tuple keys.
+def legacy_solid_check(string_map, tile_size, pos):
+	tile_loc = "{0};{1}".format(int(pos[0] // tile_size), int(pos[1] // tile_size))
+	return tile_loc in string_map and string_map[tile_loc].type in PHYSICS_TILES
+
+
+def legacy_neighbor_tiles(string_map, tile_size, pos):
+	tile_loc = (int(pos[0] // tile_size), int(pos[1] // tile_size))
+	neighbors = []
+
+	for x in range(-1, 2):
+		for y in range(-1, 2):
+			check_loc = "{0};{1}".format(tile_loc[0] + x, tile_loc[1] + y)
+			if check_loc in string_map:
+				neighbors.append(string_map[check_loc])
+
+	return neighbors
+
+
+def measure(label, func, positions):
+	start = time.perf_counter()
+	for pos in positions:
+		func(pos)
+	elapsed = time.perf_counter() - start
+	print(f"{label:<32} {len(positions) / elapsed:>14,.0f} lookups/s")
+
+
+def main():
+	map_id = sys.argv[1] if len(sys.argv) > 1 else 2
+	tilemap = Tilemap(None, 16)
+	tilemap.load(f"assets/maps/{map_id}.json")
+	string_map = {loc_to_key(tile_loc): tile for tile_loc, tile in tilemap.map.items()}
+
+	# Sample positions around the bounds of the map, so both hits and misses are measured.
+	xs = [loc[0] for loc in tilemap.map]
+	ys = [loc[1] for loc in tilemap.map]
+	size = tilemap.tile_size
+	random.seed(0)
+	positions = [(random.uniform((min(xs) - 2) * size, (max(xs) + 2) * size),
+				random.uniform((min(ys) - 2) * size, (max(ys) + 2) * size)) for i in range(LOOKUPS)]
+
+	print(f"Map {map_id}: {len(tilemap.map)} grid tiles, {LOOKUPS:,} positions.")
+	measure("solid_check (string keys)", lambda pos: legacy_solid_check(string_map, size, pos), positions)
+	measure("solid_check (tuple keys)", tilemap.solid_check, positions)
+	measure("neighbor_tiles (string keys)", lambda pos: legacy_neighbor_tiles(string_map, size, pos), positions)
+	measure("neighbor_tiles (tuple keys)", tilemap.neighbor_tiles, positions)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,81 @@
+"""Renders a level transition, the iris closing in on the player and opening out again, between frames without one.
+Traces the frame times of drawing the iris on a new surface every frame as before against blitting its precomputed
+frames. Both have to draw the exact same pixels on every frame.
+
+Run from the "Silly Ninja" folder: python -m benchmarks.transition
+"""
+import hashlib
+import statistics
+import time
+
+import pygame
+
+from scripts.headless import HeadlessGame
+
+
+REPEATS = 20
+TRACE_BUCKET = 5  # Frames per line of the trace.
+
+# Open, closing in on the player, then opening out on the new level, then open again.
+TRANSITION = [0] * 15 + list(range(1, 31)) + list(range(-30, 0)) + [0] * 15
+
+
+# The iris as it was, a full size surface allocated and drawn every frame.
+class LegacyTransitionGame(HeadlessGame):
+	def handle_level_transition(self):
+		if self.transition:
+			transition_surf = pygame.Surface(self.outline_display.get_size())
+			pygame.draw.circle(transition_surf, (255, 255, 255), (self.outline_display.get_width() // 2,
+								self.outline_display.get_height() // 2), (30 - abs(self.transition)) * 8)
+			transition_surf.set_colorkey((255, 255, 255))
+			self.outline_display.blit(transition_surf, (0, 0))
+
+
+def render(game, times):
+	frames = []
+	for index, transition in enumerate(TRANSITION):
+		game.transition = transition
+		start = time.perf_counter()
+		game.render_world(1)
+		times[index].append(time.perf_counter() - start)
+		frames.append(hashlib.sha1(pygame.image.tobytes(game.normal_display, "RGB")).digest())
+	return frames
+
+
+# The median time of every frame over the repeats.
+def run(game_class):
+	game = game_class()
+	game.iris.prepare(game.outline_display.get_size())
+	render(game, [[] for transition in TRANSITION])
+
+	times = [[] for transition in TRANSITION]
+	for i in range(REPEATS):
+		frames = render(game, times)
+	return [statistics.median(frame_times) for frame_times in times], frames
+
+
+def main():
+	# The images are converted for a display, as they are in the game.
+	pygame.init()
+	pygame.display.set_mode((1, 1))
+
+	legacy_times, legacy_frames = run(LegacyTransitionGame)
+	iris_times, iris_frames = run(HeadlessGame)
+	assert legacy_frames == iris_frames
+
+	print(f"Frame time trace of a level transition, median of {REPEATS} runs, identical pixels on every frame:")
+	print(f"{'Frames':<10}{'Transition':>12}{'New surface':>14}{'Precomputed':>14}   (ms, worst frame)")
+	for start in range(0, len(TRANSITION), TRACE_BUCKET):
+		end = start + TRACE_BUCKET
+		transitions = f"{TRANSITION[start]} to {TRANSITION[end - 1]}"
+		print(f"{f'{start}-{end - 1}':<10}{transitions:>12}{max(legacy_times[start:end]) * 1000:>14.3f}{max(iris_times[start:end]) * 1000:>14.3f}")
+
+	in_transition = [index for index, transition in enumerate(TRANSITION) if transition]
+	open_frames = [index for index, transition in enumerate(TRANSITION) if not transition]
+	for name, times in [("New surface", legacy_times), ("Precomputed", iris_times)]:
+		print(f"{name}: {statistics.mean(times[index] for index in open_frames) * 1000:.3f} ms per frame without a transition, " +
+			f"{statistics.mean(times[index] for index in in_transition) * 1000:.3f} ms during one")
+
+
+if __name__ == "__main__":
+	main()
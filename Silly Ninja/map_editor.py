@@ -2,9 +2,12 @@ import pygame
 import sys
 import os
 import json
+import shutil
 import time
 
 from scripts.tilemap import Tilemap, Tile
+from scripts.map_format import convert, BINARY_EXTENSION, REGIONS_EXTENSION
+from scripts.streaming import split_level, MANIFEST_NAME
 from scripts.utils import load_images, fade_out
 from scripts.ui.sub_menus import MenuBase
 from scripts.ui.ui_elements import Button, BorderedText, Text, InputField
@@ -23,7 +26,7 @@ class EditorMenu(MenuBase):
 		super().__init__()
 		pygame.display.set_caption("Map Editor")
 
-		self.editor = MapEditor(MenuBase.clock, MenuBase.screen, MenuBase.normal_display)
+		self.editor = MapEditor(MenuBase.clock, MenuBase.presenter, MenuBase.normal_display)
 
 		# UI Elements.
 		self.title = BorderedText("MAP EDITOR", "retro gaming", (CENTER, 30), size=70, bold=True)
@@ -70,7 +73,7 @@ class EditorMenu(MenuBase):
 			for event in pygame.event.get():
 				self.handle_events(event)
 
-			pygame.display.update()
+			self.present()
 			MenuBase.clock.tick(60)
 
 
@@ -98,6 +101,13 @@ class EditorMenu(MenuBase):
 			
 			if os.path.exists(MAP_PATH):
 				os.remove(MAP_PATH)
+				# Remove the packed copy too, so the game won't pick it up.
+				binary_path = os.path.splitext(MAP_PATH)[0] + BINARY_EXTENSION
+				if os.path.exists(binary_path):
+					os.remove(binary_path)
+				regions_path = os.path.splitext(MAP_PATH)[0] + REGIONS_EXTENSION
+				if os.path.exists(regions_path):
+					shutil.rmtree(regions_path)
 				self.error_text.set_text(f"DELETED map at \"{MAP_PATH}\".")
 			else:
 				self.error_text.set_text(f"Map with ID {MAP_ID} doesn't exist.")
@@ -114,9 +124,10 @@ class EditorMenu(MenuBase):
 
 
 class MapEditor:
-	def __init__(self, clock, screen, display):
+	# The editor keeps the window's size whatever the presentation backend, as it maps the mouse through RENDER_SCALE.
+	def __init__(self, clock, presenter, display):
 		self.clock = clock
-		self.screen = screen
+		self.presenter = presenter
 		self.display = display
 
 		# Assets database for tile groups. Values are lists.
@@ -143,6 +154,7 @@ class MapEditor:
 		self.control_held = False
 
 		self.on_grid = True
+		self.auto_ruletile = False
 
 
 	def load(self, id, error_text):
@@ -191,7 +203,7 @@ class MapEditor:
 
 			tile_pos = (int((mouse_pos[0] + self.camera_scroll[0]) // self.tilemap.tile_size),
 						int((mouse_pos[1] + self.camera_scroll[1]) // self.tilemap.tile_size))
-			tile_loc = "{0};{1}".format(tile_pos[0], tile_pos[1])
+			tile_loc = tile_pos
 
 			# Blit the preview of the current tile to be placed.
 			if self.on_grid:
@@ -202,18 +214,22 @@ class MapEditor:
 
 			# Handle placing and deleting tiles on grid.
 			if self.left_clicking and self.on_grid:
-				self.tilemap.map[tile_loc] = Tile(self.tile_list[self.tile_group], self.tile_variant, tile_pos)
+				current_tile = self.tilemap.map.get(tile_loc)
+				# Auto rule tiling picks the variant itself, so only the tile group matters then.
+				if not (self.auto_ruletile and current_tile is not None and current_tile.type == self.tile_list[self.tile_group]):
+					self.tilemap.set_tile(tile_loc, Tile(self.tile_list[self.tile_group], self.tile_variant, tile_loc))
+					if self.auto_ruletile:
+						self.tilemap.ruletile([tile_loc])
 			if self.right_clicking:
 				if tile_loc in self.tilemap.map:
-					del self.tilemap.map[tile_loc]
+					self.tilemap.remove_tile(tile_loc)
+					if self.auto_ruletile:
+						self.tilemap.ruletile([tile_loc])
 
 				# Handle deleting offgrid tiles.
-				for tile in self.tilemap.offgrid_tiles.copy():
-					tile_image = self.assets[tile.type][tile.variant]
-					tile_rect = pygame.Rect(tile.pos[0] - self.camera_scroll[0], tile.pos[1] - self.camera_scroll[1],
-											tile_image.get_width(), tile_image.get_height())
-					if tile_rect.collidepoint(mouse_pos):
-						self.tilemap.offgrid_tiles.remove(tile)
+				cursor_rect = pygame.Rect(mouse_pos[0] + self.camera_scroll[0], mouse_pos[1] + self.camera_scroll[1], 1, 1)
+				for tile in self.tilemap.offgrid_in_rect(cursor_rect):
+					self.tilemap.remove_offgrid(tile)
 
 
 			for event in pygame.event.get():
@@ -228,7 +244,7 @@ class MapEditor:
 						if not self.on_grid:
 							offgrid_tile = Tile(self.tile_list[self.tile_group], self.tile_variant,
 												(mouse_pos[0] + self.camera_scroll[0], mouse_pos[1] + self.camera_scroll[1]))
-							self.tilemap.offgrid_tiles.append(offgrid_tile)
+							self.tilemap.add_offgrid(offgrid_tile)
 					if event.button == 3:
 						self.right_clicking = True
 					if self.shift_held:
@@ -267,10 +283,23 @@ class MapEditor:
 						print(MAP_ID)
 						if self.control_held and event.key == pygame.K_s:
 							self.tilemap.save(f"assets/maps/{MAP_ID}.json")
+							# Keep the packed copy in sync, if the map has been converted.
+							if os.path.exists(f"assets/maps/{MAP_ID}{BINARY_EXTENSION}"):
+								convert(f"assets/maps/{MAP_ID}.json")
+							# Same for the region files, split again with the same region size.
+							regions_path = f"assets/maps/{MAP_ID}{REGIONS_EXTENSION}"
+							if os.path.exists(regions_path):
+								f = open(os.path.join(regions_path, MANIFEST_NAME), 'r')
+								region_size = json.load(f)["region_size"]
+								f.close()
+								shutil.rmtree(regions_path)
+								split_level(f"assets/maps/{MAP_ID}.json", region_size)
 					if self.control_held and event.key == pygame.K_r:
 						self.tilemap.ruletile()
 					if event.key == pygame.K_g:
 						self.on_grid = not self.on_grid
+					if event.key == pygame.K_t:
+						self.auto_ruletile = not self.auto_ruletile
 					if event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
 						self.shift_held = True
 					if event.key == pygame.K_LCTRL or event.key == pygame.K_RCTRL:
@@ -290,8 +319,7 @@ class MapEditor:
 					if event.key == pygame.K_LCTRL or event.key == pygame.K_RCTRL:
 						self.control_held = False
 
-			self.screen.blit(pygame.transform.scale(self.display, self.screen.get_size()), (0, 0))
-			pygame.display.update()
+			self.presenter.present(self.display)
 			self.clock.tick(60)
 
 
@@ -0,0 +1,64 @@
+ACTIVE_DISTANCE = 320  # In pixels from the nearest player. Covers the whole view, even with the camera lagging behind.
+REDUCED_DISTANCE = 640  # Enemies closer than this but not active update every REDUCED_INTERVAL steps, the rest sleep.
+REDUCED_INTERVAL = 4
+ACTIVE, REDUCED, SLEEPING = 0, 1, 2
+
+
+# Decides which enemies update each simulation step, by their distance to the nearest player.
+# Active enemies update every step. Reduced ones take turns, one in every reduced_interval of them each step,
+# so they walk and aim that many times slower. Sleeping ones stay exactly as they were and pick up where they left off once a
+# player comes close again. It only depends on positions and the step count, so it plays out the same every run.
+# The host sends each enemy's tier along, so clients only step the enemies it steps every step.
+class ActivityScheduler:
+	def __init__(self, active_distance=ACTIVE_DISTANCE, reduced_distance=REDUCED_DISTANCE, reduced_interval=REDUCED_INTERVAL):
+		self.active_distance = active_distance
+		self.reduced_distance = reduced_distance
+		self.reduced_interval = reduced_interval
+		self.step = 0
+		self.tier_counts = [0, 0, 0]  # Active, reduced and sleeping enemies on the last step.
+		self.tiers = {}  # Of every enemy on the last step, read by the host's send thread.
+
+
+	# The enemies to update this step, in their original order.
+	def schedule(self, enemies, players):
+		self.step += 1
+		if not players:
+			self.tier_counts = [len(enemies), 0, 0]
+			self.tiers = {}
+			return enemies
+
+		active_squared = self.active_distance ** 2
+		reduced_squared = self.reduced_distance ** 2
+		player_centers = [(player.pos[0] + player.size[0] / 2, player.pos[1] + player.size[1] / 2) for player in players]
+		due = []
+		tiers = {}
+		active = 0
+		reduced = 0
+		for index, enemy in enumerate(enemies):
+			pos = enemy.pos
+			center_x = pos[0] + enemy.size[0] / 2
+			center_y = pos[1] + enemy.size[1] / 2
+			distance_squared = reduced_squared + 1
+			for x, y in player_centers:
+				distance_squared = min(distance_squared, (center_x - x) ** 2 + (center_y - y) ** 2)
+
+			if distance_squared <= active_squared:
+				active += 1
+				due.append(enemy)
+			elif distance_squared <= reduced_squared:
+				reduced += 1
+				tiers[enemy] = REDUCED
+				# Reduced enemies are spread over the steps by their place in the list.
+				if (self.step + index) % self.reduced_interval == 0:
+					due.append(enemy)
+			else:
+				tiers[enemy] = SLEEPING
+
+		self.tier_counts = [active, reduced, len(enemies) - active - reduced]
+		self.tiers = tiers
+		return due
+
+
+	# Enemies not scheduled on the last step, like new ones, count as active.
+	def tier(self, enemy):
+		return self.tiers.get(enemy, ACTIVE)
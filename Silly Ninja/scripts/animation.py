@@ -1,27 +1,58 @@
+import pygame
+
+
+# An animation clip, shared by everything that plays it and never changed after it's created.
+# The image and the next frame for every frame are worked out up front, so playing it is just table lookups.
 class Animation:
-	def __init__(self, images, image_duration=5, loop=True):
+	__slots__ = ("images", "flipped_images", "image_duration", "loop", "frame_count", "last_frame",
+				"frame_images", "flipped_frame_images", "next_frames")
+
+	def __init__(self, images, image_duration=5, loop=True, flipped_images=None):
 		self.images = images
+		# Mirrored copies of the images for facing left.
+		self.flipped_images = flipped_images if flipped_images is not None else [pygame.transform.flip(image, True, False) for image in images]
 		# How many frames we want each image to show.
 		self.image_duration = image_duration
-		self.frame = 0
 		self.loop = loop
-		self.done = False
+
+		self.frame_count = image_duration * len(images)
+		self.last_frame = None if loop else self.frame_count - 1  # Non-looping clips are done once they reach it.
+		self.frame_images = tuple(images[frame // image_duration] for frame in range(self.frame_count))
+		self.flipped_frame_images = tuple(self.flipped_images[frame // image_duration] for frame in range(self.frame_count))
+		if loop:
+			self.next_frames = tuple((frame + 1) % self.frame_count for frame in range(self.frame_count))
+		else:
+			self.next_frames = tuple(min(frame + 1, self.frame_count - 1) for frame in range(self.frame_count))
 
 
-	def copy(self):
-		return Animation(self.images, self.image_duration, self.loop)
+	def play(self, start_frame=0):
+		return Playhead(self, start_frame)
 
-	
-	def current_frame_image(self):
-		return self.images[int(self.frame / self.image_duration)]
+
+# Where one entity or particle is in a clip. This is all that's allocated when an action changes or a particle spawns.
+class Playhead:
+	__slots__ = ("clip", "frame", "done")
+
+	def __init__(self, clip, frame=0):
+		self.clip = clip
+		self.frame = frame
+		self.done = False
+
+
+	def current_frame_image(self, flipped=False):
+		return (self.clip.flipped_frame_images if flipped else self.clip.frame_images)[self.frame]
 
 
 	def update(self):
-		max_frame = self.image_duration * len(self.images)
+		self.frame = self.clip.next_frames[self.frame]
+		if self.frame == self.clip.last_frame:
+			self.done = True
 
-		if self.loop:
-			self.frame = (self.frame + 1) % max_frame
-		else:
-			self.frame = min(self.frame + 1, max_frame - 1)
-			if self.frame >= max_frame - 1:
-				self.done = True
\ No newline at end of file
+
+# Moves many playheads one frame forward in a single call, cheaper than updating them one by one.
+def advance(playheads):
+	for playhead in playheads:
+		clip = playhead.clip
+		playhead.frame = frame = clip.next_frames[playhead.frame]
+		if frame == clip.last_frame:
+			playhead.done = True
@@ -0,0 +1,79 @@
+import numpy as np
+
+from itertools import chain
+
+
+# Each same-type neighbor sets one bit of a 4-bit mask, which indexes a 16-entry variant table.
+NEIGHBOR_BITS = {(1, 0): 1, (-1, 0): 2, (0, -1): 4, (0, 1): 8}
+
+
+# Flatten a ruletile map of {sorted neighbor shifts: variant} into a table indexed by neighbor mask.
+# Masks without a rule map to -1, which leaves the tile's variant untouched.
+def build_variant_table(ruletile_map):
+	table = np.full(16, -1, dtype=np.int16)
+	for shifts, variant in ruletile_map.items():
+		table[sum(NEIGHBOR_BITS[shift] for shift in shifts)] = variant
+	return table
+
+
+# Returns {tile_loc: new_variant} for every ruled tile of the map whose variant should change.
+def autotile_all(tile_map, ruletile_types, variant_table):
+	if not tile_map:
+		return {}
+
+	tile_locs = list(tile_map)
+	tiles = list(tile_map.values())
+	locs = np.fromiter(chain.from_iterable(tile_locs), dtype=np.int64, count=len(tile_locs) * 2).reshape(-1, 2)
+
+	# Give each tile type a small integer id, so neighbor types can be compared as arrays.
+	type_names = np.array([tile.type for tile in tiles])
+	types = np.zeros(len(tiles), dtype=np.int32)
+	ruled = np.zeros(len(tiles), dtype=bool)
+	for type_id, t_type in enumerate(np.unique(type_names)):
+		is_type = type_names == t_type
+		types[is_type] = type_id
+		if t_type in ruletile_types:
+			ruled |= is_type
+
+	# Lay the types out on a dense grid, padded by one cell so every neighbor lookup stays in bounds.
+	origin = locs.min(axis=0) - 1
+	cells = locs - origin
+	grid = np.full(cells.max(axis=0) + 2, -1, dtype=np.int32)
+	grid[cells[:, 0], cells[:, 1]] = types
+
+	masks = np.zeros(len(tile_locs), dtype=np.int16)
+	for (x, y), bit in NEIGHBOR_BITS.items():
+		masks |= np.where(grid[cells[:, 0] + x, cells[:, 1] + y] == types, bit, 0).astype(np.int16)
+
+	variants = variant_table[masks]
+	current = np.array([tile.variant for tile in tiles], dtype=np.int16)
+
+	changed = np.flatnonzero(ruled & (variants >= 0) & (variants != current))
+	return {tile_locs[i]: int(variants[i]) for i in changed}
+
+
+# Incremental mode: only the changed cells and their direct neighbors can get a different mask.
+def autotile_around(tile_map, tile_locs, ruletile_types, variant_table):
+	affected = set()
+	for tile_loc in tile_locs:
+		affected.add(tile_loc)
+		for x, y in NEIGHBOR_BITS:
+			affected.add((tile_loc[0] + x, tile_loc[1] + y))
+
+	updates = {}
+	for tile_loc in affected:
+		tile = tile_map.get(tile_loc)
+		if tile is None or tile.type not in ruletile_types:
+			continue
+
+		mask = 0
+		for (x, y), bit in NEIGHBOR_BITS.items():
+			neighbor = tile_map.get((tile_loc[0] + x, tile_loc[1] + y))
+			if neighbor is not None and neighbor.type == tile.type:
+				mask |= bit
+
+		variant = variant_table[mask]
+		if variant >= 0 and variant != tile.variant:
+			updates[tile_loc] = int(variant)
+
+	return updates
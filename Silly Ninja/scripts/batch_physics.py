@@ -0,0 +1,139 @@
+import numpy as np
+
+from itertools import chain
+from scripts.tilemap import NEIGHBOR_OFFSETS
+
+
+NEIGHBOR_X = np.array([x for x, y in NEIGHBOR_OFFSETS], dtype=np.int64)
+NEIGHBOR_Y = np.array([y for x, y in NEIGHBOR_OFFSETS], dtype=np.int64)
+
+
+# Runs the tile physics of PhysicsEntity.update for a batch of entities at once, with the same results.
+# Positions, velocities, sizes and collision flags are laid out as arrays, and the 3x3 neighborhood of every
+# entity is resolved in the same order as the per-entity version.
+class BatchPhysics:
+	def __init__(self, tilemap):
+		self.tilemap = tilemap
+		self.solid_grid = np.zeros((1, 1), dtype=bool)
+		self.grid_origin = (0, 0)
+		self.solid_version = None
+
+
+	# A dense grid of the solid tiles, refreshed whenever the tilemap's solid tiles change.
+	# It's padded with an empty border, so locations outside of it can be clamped onto that border.
+	def refresh_solids(self):
+		if self.solid_version == self.tilemap.solid_version:
+			return
+
+		self.solid_version = self.tilemap.solid_version
+		if not self.tilemap.solid_rects:
+			self.solid_grid = np.zeros((1, 1), dtype=bool)
+			self.grid_origin = (0, 0)
+			return
+
+		locs = np.fromiter(chain.from_iterable(self.tilemap.solid_rects), dtype=np.int64,
+							count=len(self.tilemap.solid_rects) * 2).reshape(-1, 2)
+		origin = locs.min(axis=0) - 1
+		cells = locs - origin
+		self.solid_grid = np.zeros(cells.max(axis=0) + 2, dtype=bool)
+		self.solid_grid[cells[:, 0], cells[:, 1]] = True
+		self.grid_origin = (int(origin[0]), int(origin[1]))
+
+
+	def is_solid(self, tile_x, tile_y):
+		width, height = self.solid_grid.shape
+		return self.solid_grid[np.clip(tile_x - self.grid_origin[0], 0, width - 1),
+								np.clip(tile_y - self.grid_origin[1], 0, height - 1)]
+
+
+	# Streamed levels only hold the regions around the camera, load the ones the batch is about to touch.
+	def require_regions(self, tile_x, tile_y):
+		streamer = self.tilemap.streamer
+		region_size = streamer.region_size
+		regions = set()
+		for x in (-1, 1):
+			for y in (-1, 1):
+				regions.update(zip(((tile_x + x) // region_size).tolist(), ((tile_y + y) // region_size).tolist()))
+		for region_x, region_y in regions:
+			streamer.require(region_x * region_size, region_y * region_size, region_x * region_size, region_y * region_size)
+		self.refresh_solids()
+
+
+	# Resolve one axis of movement, axis 0 for X and 1 for Y. Mirrors the loops in PhysicsEntity.update: the entity rect
+	# is truncated to integers, pushed out of each solid neighbor it overlaps in turn, and the position snaps to it.
+	def move_axis(self, pos, size, frame_movement, axis):
+		tile_size = self.tilemap.tile_size
+		pos[:, axis] += frame_movement[:, axis]
+
+		tile_x = (pos[:, 0] // tile_size).astype(np.int64)
+		tile_y = (pos[:, 1] // tile_size).astype(np.int64)
+		if self.tilemap.streamer is not None:
+			self.require_regions(tile_x, tile_y)
+
+		# Pixel positions of the 9 neighbors of every entity, in the order they're checked.
+		neighbor_x = tile_x[:, None] + NEIGHBOR_X
+		neighbor_y = tile_y[:, None] + NEIGHBOR_Y
+		near = (neighbor_x, neighbor_y)[axis] * tile_size
+		cross_near = (neighbor_y, neighbor_x)[axis] * tile_size
+
+		# Pushing along this axis never changes the overlap on the other one, so that part can be checked up front.
+		rect = np.trunc(pos)
+		cross = rect[:, 1 - axis, None]
+		candidates = (self.is_solid(neighbor_x, neighbor_y) & (cross < cross_near + tile_size)
+					& (cross + size[:, 1 - axis, None] > cross_near))
+
+		hit_positive = np.zeros(len(pos), dtype=bool)
+		hit_negative = np.zeros(len(pos), dtype=bool)
+		rows = np.flatnonzero(candidates.any(axis=1))
+		if not len(rows):
+			return hit_positive, hit_negative
+
+		candidates = candidates[rows]
+		near = near[rows]
+		side = rect[rows, axis]
+		length = size[rows, axis]
+		moving_positive = frame_movement[rows, axis] > 0
+		moving_negative = frame_movement[rows, axis] < 0
+		snapped = np.zeros(len(rows), dtype=bool)
+		positive = np.zeros(len(rows), dtype=bool)
+		negative = np.zeros(len(rows), dtype=bool)
+
+		for i in np.flatnonzero(candidates.any(axis=0)):
+			hit = candidates[:, i] & (side < near[:, i] + tile_size) & (side + length > near[:, i])
+			side = np.where(hit & moving_positive, near[:, i] - length, side)
+			side = np.where(hit & moving_negative, near[:, i] + tile_size, side)
+			snapped |= hit
+			positive |= hit & moving_positive
+			negative |= hit & moving_negative
+
+		pos[rows[snapped], axis] = side[snapped]
+		hit_positive[rows] = positive
+		hit_negative[rows] = negative
+		return hit_positive, hit_negative
+
+
+	def update(self, entities, movements):
+		if not entities:
+			return
+
+		self.refresh_solids()
+		count = len(entities)
+		pos = np.fromiter(chain.from_iterable(entity.pos for entity in entities), dtype=np.float64, count=count * 2).reshape(-1, 2)
+		velocity = np.fromiter(chain.from_iterable(entity.velocity for entity in entities), dtype=np.float64, count=count * 2).reshape(-1, 2)
+		size = np.fromiter(chain.from_iterable(entity.size for entity in entities), dtype=np.float64, count=count * 2).reshape(-1, 2)
+		frame_movement = np.fromiter(chain.from_iterable(movements), dtype=np.float64, count=count * 2).reshape(-1, 2) + velocity
+
+		right, left = self.move_axis(pos, size, frame_movement, 0)
+		down, up = self.move_axis(pos, size, frame_movement, 1)
+
+		# Handle gravity.
+		velocity[:, 1] = np.minimum(5, velocity[:, 1] + 0.1)
+		velocity[:, 1] = np.where(down | up, 0, velocity[:, 1])
+
+		# Write the results back, then finish the update of each entity the same way PhysicsEntity.update does.
+		for entity, movement, entity_pos, entity_velocity, collided_up, collided_down, collided_left, collided_right in zip(
+				entities, movements, pos.tolist(), velocity.tolist(), up.tolist(), down.tolist(), left.tolist(), right.tolist()):
+			entity.pos = entity_pos
+			entity.velocity = entity_velocity
+			entity.collisions = {"up": collided_up, "down": collided_down, "left": collided_left, "right": collided_right}
+			entity.finish_update(movement)
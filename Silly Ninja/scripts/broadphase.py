@@ -0,0 +1,53 @@
+from itertools import chain
+
+
+BROADPHASE_CELL_SIZE = 32  # In pixels, about twice the size of an entity.
+
+
+# A uniform grid of the things that can be hit this frame, rebuilt every frame. Items are registered under every cell
+# their rect overlaps, so hit tests only need to look at the few items sharing cells with the point or rect being tested.
+class SpatialGrid:
+	def __init__(self, cell_size=BROADPHASE_CELL_SIZE):
+		self.cell_size = cell_size
+		self.cells = {}
+
+
+	def clear(self):
+		self.cells.clear()
+
+
+	def cell_range(self, rect):
+		for x in range(rect.left // self.cell_size, (rect.right - 1) // self.cell_size + 1):
+			for y in range(rect.top // self.cell_size, (rect.bottom - 1) // self.cell_size + 1):
+				yield (x, y)
+
+
+	# Rect can be any (x, y, width, height) sequence, entities can skip allocating a Rect.
+	def insert(self, item, rect):
+		left = rect[0] // self.cell_size
+		top = rect[1] // self.cell_size
+		right = (rect[0] + rect[2] - 1) // self.cell_size
+		bottom = (rect[1] + rect[3] - 1) // self.cell_size
+
+		# Most items are smaller than a cell and only overlap one or two.
+		if left == right and top == bottom:
+			cell = self.cells.get((left, top))
+			if cell is None:
+				self.cells[(left, top)] = [item]
+			else:
+				cell.append(item)
+			return
+
+		for x in range(left, right + 1):
+			for y in range(top, bottom + 1):
+				self.cells.setdefault((x, y), []).append(item)
+
+
+	# Items that may contain the point, in the order they were inserted. Points are truncated the same way Rect.collidepoint does.
+	def query_point(self, pos):
+		return self.cells.get((int(pos[0]) // self.cell_size, int(pos[1]) // self.cell_size), ())
+
+
+	# Items that may overlap the rect, each one only once.
+	def query_rect(self, rect):
+		return list(dict.fromkeys(chain.from_iterable(self.cells.get(cell_loc, ()) for cell_loc in self.cell_range(rect))))
@@ -3,7 +3,7 @@ import random
 import time
 import pygame
 
-from scripts.visual_effects import Particle, Projectile, Spark
+from scripts.visual_effects import Projectile
 from scripts.ui.ui_elements import Text
 
 
@@ -18,6 +18,7 @@ class PhysicsEntity:
 		self.game = game
 		self.type = entity_type
 		self.pos = list(pos)
+		self.previous_pos = tuple(pos)
 		self.size = size
 		self.velocity = [0, 0]
 		self.last_movement = (0, 0)
@@ -33,10 +34,27 @@ class PhysicsEntity:
 		return pygame.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
 
 
+	# Called before every simulation step, frames rendered in between blend from this position to the new one.
+	def store_previous_pos(self):
+		self.previous_pos = (self.pos[0], self.pos[1])
+
+
+	# Move straight to a position, without being interpolated across the way there.
+	def teleport(self, pos):
+		self.pos = list(pos)
+		self.store_previous_pos()
+
+
+	# Alpha is how far the rendered frame is into the next simulation step.
+	def render_pos(self, alpha=1):
+		return (self.previous_pos[0] + (self.pos[0] - self.previous_pos[0]) * alpha,
+				self.previous_pos[1] + (self.pos[1] - self.previous_pos[1]) * alpha)
+
+
 	def set_action(self, action):
 		if self.action != action:
 			self.action = action
-			self.animation = self.game.assets[f"{self.type}/{self.action}"].copy()
+			self.animation = self.game.assets[f"{self.type}/{self.action}"].play()
 
 
 	def update(self, tilemap, movement=(0, 0)):
@@ -78,6 +96,11 @@ class PhysicsEntity:
 		if self.collisions["down"] or self.collisions["up"]:
 			self.velocity[1] = 0
 
+		self.finish_update(movement)
+
+
+	# Everything after the tile physics, also called by BatchPhysics for the entities it moves.
+	def finish_update(self, movement):
 		# Update the animation.
 		if movement[0] > 0:
 			self.facing_left = False
@@ -87,10 +110,10 @@ class PhysicsEntity:
 		self.last_movement = movement
 
 
-	def render(self, surface, offset=(0, 0)):
-		image_to_render = pygame.transform.flip(self.animation.current_frame_image(), self.facing_left, False)
-		surface.blit(image_to_render, (self.pos[0] - offset[0] + self.anim_offset[0],
-										self.pos[1] - offset[1] + self.anim_offset[0]))
+	def render(self, surface, offset=(0, 0), alpha=1):
+		render_pos = self.render_pos(alpha)
+		surface.blit(self.animation.current_frame_image(self.facing_left), (render_pos[0] - offset[0] + self.anim_offset[0],
+																			render_pos[1] - offset[1] + self.anim_offset[0]))
 
 
 class Enemy(PhysicsEntity):
@@ -108,19 +131,19 @@ class Enemy(PhysicsEntity):
 
 	def fire_projectile(self, player):
 		dist = (player.pos[0] - self.pos[0], player.pos[1] - self.pos[1])
-		if abs(dist[1]) < 16:
+		if abs(dist[1]) < 16 and self.game.tilemap.line_of_sight(self.rect().center, player.rect().center):
 			if self.facing_left and dist[0] < 0:
 				bullet = Projectile(self.game, (self.rect().centerx - 7, self.rect().centery), -1.5, alive_time=0)
 				self.game.projectiles.append(bullet)
 				self.game.sounds["shoot"].play()
 				for i in range(4):
-					self.game.sparks.append(Spark(bullet.pos, random.random() - 0.5 + math.pi, random.random() + 2))
+					self.game.sparks.spawn(bullet.pos, random.random() - 0.5 + math.pi, random.random() + 2)
 			if not self.facing_left and dist[0] > 0:
 				bullet = Projectile(self.game, (self.rect().centerx + 7, self.rect().centery), 1.5, alive_time=0)
 				self.game.projectiles.append(bullet)
 				self.game.sounds["shoot"].play()
 				for i in range(4):
-					self.game.sparks.append(Spark(bullet.pos, random.random() - 0.5, random.random() + 2))
+					self.game.sparks.spawn(bullet.pos, random.random() - 0.5, random.random() + 2)
 			return True
 
 		return False
@@ -133,18 +156,36 @@ class Enemy(PhysicsEntity):
 				self.game.sounds["hit"].play()
 				for i in range(20, 31):
 					angle = random.random() * math.pi * 2
-					self.game.sparks.append(Spark(self.rect().center, angle, random.random() * 2 + 2))
+					self.game.sparks.spawn(self.rect().center, angle, random.random() * 2 + 2)
 
 					speed = random.random() * 5
 					velocity = [math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5]
-					self.game.particles.append(Particle(self.game, "dust", self.rect().center, velocity=velocity, start_frame=random.randint(0, 7)))
-				self.game.sparks.append(Spark(self.rect().center, 0, random.random() + 5))
-				self.game.sparks.append(Spark(self.rect().center, math.pi, random.random() + 5))
+					self.game.particles.spawn("dust", self.rect().center, velocity=velocity, start_frame=random.randint(0, 7))
+				self.game.sparks.spawn(self.rect().center, 0, random.random() + 5)
+				self.game.sparks.spawn(self.rect().center, math.pi, random.random() + 5)
 
 				self.is_dead = True
 
 
-	def update(self, tilemap, movement=(0, 0), walking=0, facing_left=False):
+	# The game checks the dash hits of all its enemies at once with a broadphase, so it passes check_hits=False.
+	def update(self, tilemap, movement=(0, 0), walking=0, facing_left=False, check_hits=True):
+		movement = self.plan_movement(tilemap, movement=movement, walking=walking, facing_left=facing_left)
+		super().update(tilemap, movement=movement)
+
+		# Dies if takes damage from the players' dashes or was dead on other clients' machines.
+		if check_hits:
+			if self.client_id != "solo":
+				for player in self.game.entities[:4]:
+					if self.check_for_dead(player):
+						break
+			else:
+				self.check_for_dead(self.game.get_main_player())
+
+		return self.is_dead
+
+
+	# The walking AI, runs before the tile physics.
+	def plan_movement(self, tilemap, movement=(0, 0), walking=0, facing_left=False):
 		# Continue previous movement, if doesn't finish yet.
 		if self.walking:
 			# Check for flipping against ground and wall tiles in front of the moving direction.
@@ -176,7 +217,11 @@ class Enemy(PhysicsEntity):
 			self.walking = walking
 			self.facing_left = facing_left
 
-		super().update(tilemap, movement=movement)
+		return movement
+
+
+	def finish_update(self, movement):
+		super().finish_update(movement)
 
 		# Handle the animation transitions.
 		if movement[0] != 0:
@@ -184,28 +229,20 @@ class Enemy(PhysicsEntity):
 		else:
 			self.set_action("idle")
 
-		# Dies if takes damage from the players' dashes or was dead on other clients' machines.
-		if self.client_id != "solo":
-			for player in self.game.entities[:4]:
-				if self.check_for_dead(player):
-					break
-		else:
-			self.check_for_dead(self.game.get_main_player())
-
-		return self.is_dead
 
+	def render(self, surface, offset=(0, 0), alpha=1):
+		super().render(surface, offset=offset, alpha=alpha)
 
-	def render(self, surface, offset=(0, 0)):
-		super().render(surface, offset=offset)
+		# Same as the center of the rect, at the interpolated position.
+		render_pos = self.render_pos(alpha)
+		center = (int(render_pos[0]) + self.size[0] // 2, int(render_pos[1]) + self.size[1] // 2)
 
 		# Blit based on the top right of the gun sprite.
 		if self.facing_left:
-			gun = pygame.transform.flip(self.game.assets["gun"], True, False)
-			surface.blit(gun, (self.rect().centerx - 4 - self.game.assets["gun"].get_width() - offset[0],
-								self.rect().centery - offset[1]))
+			surface.blit(self.game.assets["flipped_gun"], (center[0] - 4 - self.game.assets["gun"].get_width() - offset[0], center[1] - offset[1]))
 		# Blit based on the top left of the gun sprite.
 		else:
-			surface.blit(self.game.assets["gun"], (self.rect().centerx + 4 - offset[0], self.rect().centery - offset[1]))
+			surface.blit(self.game.assets["gun"], (center[0] + 4 - offset[0], center[1] - offset[1]))
 
 
 class Player(PhysicsEntity):
@@ -260,19 +297,25 @@ class Player(PhysicsEntity):
 
 
 	def respawn(self, spawn_pos):
-		self.pos = list(spawn_pos)
+		self.teleport(spawn_pos)
 		self.died = False
 		self.air_time = 0
 
 
-	def render_name_tag(self, surface, offset=(0, 0)):
-		self.name_text.render(surface, offset=offset)
+	# The tag follows the interpolated sprite, it's positioned after the simulated one.
+	def render_name_tag(self, surface, offset=(0, 0), alpha=1):
+		render_pos = self.render_pos(alpha)
+		self.name_text.render(surface, offset=(offset[0] + self.pos[0] - render_pos[0], offset[1] + self.pos[1] - render_pos[1]))
 
 
 	def update(self, tilemap, movement=(0, 0), override_pos=(0, 0)):
 		super().update(tilemap, movement=movement)
 		if tuple(self.pos) != override_pos and override_pos != (0, 0):
-			self.pos = list(override_pos)
+			# Jumps further than a tile are respawns and level loads on the other client.
+			if abs(override_pos[0] - self.pos[0]) > tilemap.tile_size or abs(override_pos[1] - self.pos[1]) > tilemap.tile_size:
+				self.teleport(override_pos)
+			else:
+				self.pos = list(override_pos)
 
 		self.name_text.update_pos((self.pos[0] + self.text_offset[0], self.pos[1] + self.text_offset[1]))
 
@@ -295,7 +338,7 @@ class Player(PhysicsEntity):
 				angle = random.random() * math.pi * 2
 				speed = random.random() * 0.5 + 0.5
 				p_velocity = [math.cos(angle) * speed, math.sin(angle) * speed]
-				self.game.particles.append(Particle(self.game, "dust", self.rect().center, velocity=p_velocity, start_frame=random.randint(0, 7)))
+				self.game.particles.spawn("dust", self.rect().center, velocity=p_velocity, start_frame=random.randint(0, 7))
 		
 		if self.dashing > 0:  # Dash to the right.
 			self.dashing = max(self.dashing - 1, 0)
@@ -312,7 +355,7 @@ class Player(PhysicsEntity):
 
 			# A stream of particles following the dash.
 			p_velocity = [abs(self.dashing) / self.dashing * random.random() * 3, 0]
-			self.game.particles.append(Particle(self.game, "dust", self.rect().center, velocity=p_velocity, start_frame=random.randint(0, 7)))
+			self.game.particles.spawn("dust", self.rect().center, velocity=p_velocity, start_frame=random.randint(0, 7))
 
 		# Gradually reduce horizontal movement to 0.
 		if self.velocity[0] > 0:
@@ -342,9 +385,9 @@ class Player(PhysicsEntity):
 
 
 
-	def render(self, outline_surface, offset=(0, 0)):
+	def render(self, outline_surface, offset=(0, 0), alpha=1):
 		if abs(self.dashing) <= 50:
-			super().render(outline_surface, offset=offset)
+			super().render(outline_surface, offset=offset, alpha=alpha)
 
 
 	def jump(self):
@@ -7,18 +7,37 @@ import time
 import threading
 
 from scripts.tilemap import Tilemap
+from scripts.ai_scheduler import ActivityScheduler
+from scripts.batch_physics import BatchPhysics
+from scripts.broadphase import SpatialGrid
+from scripts.map_format import level_count
+from scripts.levels import PreparedLevel, LevelCache, LevelPrefetcher
 from scripts.entities import Player, Enemy
 from scripts.clouds import Clouds
-from scripts.visual_effects import Particle, Spark
+from scripts.outline import OutlineLayer
+from scripts.presentation import Presenter
+from scripts.particles import ParticleSystem, SparkSystem
+from scripts.visual_effects import IrisTransition, MAX_PROJECTILE_TIME
 from scripts.animation import Animation
-from scripts.utils import load_image, load_images, fade_out
+from scripts.utils import load_image, load_images, fade_out, SilentSound
+from scripts.timestep import FixedTimestep, MAX_RENDER_FPS
 from scripts.socket.client import GameClient, MAX_CLIENT_COUNT
 
 
+PREFETCH_ENEMY_COUNT = 2  # Start preparing the next level once this few enemies are left.
+BATCH_PHYSICS_ENEMY_COUNT = 300  # Move the enemies through the vectorized physics once there are this many of them, where it pays off.
+BROADPHASE_ENEMY_COUNT = 50  # Look up the enemies hit by dashes in a grid once there are this many of them.
+BROADPHASE_PROJECTILE_COUNT = 50  # Look up the players hit by projectiles in a grid once there are this many projectiles.
+DEBUG_LEVEL_LOADS = False  # Print how long every level load, transitions and respawns alike, took on the game thread.
+
+
 class GameBase:
-	def __init__(self, clock, screen, outline_display, normal_display):
+	# Headless games never render or play audio, they only need the displays for their size.
+	# Games share the menus' presenter, so the menus know when they have to redraw the whole window.
+	def __init__(self, clock, screen, outline_display, normal_display, headless=False, presenter=None):
 		self.clock = clock
 		self.screen = screen
+		self.presenter = presenter if presenter is not None or screen is None else Presenter(screen)
 		self.outline_display = outline_display  # Outline display
 		self.normal_display = normal_display  # Normal display
 
@@ -47,13 +66,27 @@ class GameBase:
 			"gun": load_image("gun.png"),
 			"projectile": load_image("projectile.png")
 		}
-
+		self.assets["flipped_gun"] = pygame.transform.flip(self.assets["gun"], True, False)
+
+		# The world is drawn through the outline layer, which knows the outline of every sprite from the start.
+		# The level transition's frames are drawn up front too.
+		self.outline = OutlineLayer(self.outline_display)
+		self.iris = IrisTransition()
+		if not headless:
+			sprites = [self.assets["gun"], self.assets["flipped_gun"], self.assets["projectile"]]
+			for name, clip in self.assets.items():
+				if name.startswith("player/") or name.startswith("enemy/"):
+					sprites += clip.images + clip.flipped_images
+			self.outline.prepare(sprites)
+			self.iris.prepare(self.outline_display.get_size())
+
+		sound_class = SilentSound if headless else pygame.mixer.Sound
 		self.sounds = {
-			"ambience": pygame.mixer.Sound("assets/sfx/ambience.wav"),
-			"dash": pygame.mixer.Sound("assets/sfx/dash.wav"),
-			"hit": pygame.mixer.Sound("assets/sfx/hit.wav"),
-			"jump": pygame.mixer.Sound("assets/sfx/jump.wav"),
-			"shoot": pygame.mixer.Sound("assets/sfx/shoot.wav")
+			"ambience": sound_class("assets/sfx/ambience.wav"),
+			"dash": sound_class("assets/sfx/dash.wav"),
+			"hit": sound_class("assets/sfx/hit.wav"),
+			"jump": sound_class("assets/sfx/jump.wav"),
+			"shoot": sound_class("assets/sfx/shoot.wav")
 		}
 
 		self.sounds["ambience"].set_volume(0.2)
@@ -63,33 +96,120 @@ class GameBase:
 		self.sounds["shoot"].set_volume(0.45)
 
 		self.clouds = Clouds(self.assets["clouds"], count=16)
+		self.particles = ParticleSystem({name.split("/")[1]: clip for name, clip in self.assets.items() if name.startswith("particle/")})
+		self.sparks = SparkSystem()
 
 		self.tilemap = Tilemap(self, 16)
+		self.prefetcher = LevelPrefetcher(self)
+		self.level_cache = LevelCache()
+		self.batch_physics = BatchPhysics(self.tilemap)
+		self.ai_scheduler = ActivityScheduler()
+		self.player_grid = SpatialGrid()
+		self.enemy_grid = SpatialGrid()
+		self.shootable_players = []  # Tested one by one while there are too few projectiles for the grid to pay off.
+		self.timestep = FixedTimestep()
 
 		self.movement = [False, False]
 
 		self.screenshake = 0
 
 		self.level_id = 0
-		self.max_level = len(os.listdir("assets/maps")) - 1
+		self.max_level = level_count() - 1
 		self.running = False
 
 
 	def load_level(self, id):
-		self.tilemap.load(f"assets/maps/{id}.json")
-		self.leaf_spawners = []
-		for tree in self.tilemap.extract([("large_decor", 2)], keep=True):
-			self.leaf_spawners.append(pygame.Rect(tree.pos[0] + 4, tree.pos[1] + 4, 23, 13))
+		# Use the prefetched level, or the one kept in memory since it was last played, before reading it again.
+		level = self.prefetcher.take(id)
+		self.prepare_time = level.prepare_time if level is not None else None
+		if level is None:
+			level = self.level_cache.get(id)
+		if level is None:
+			level = PreparedLevel(self, id)
+
+		self.level_cache.put(level)
+		level.restore(self.tilemap)
+		self.spawners = level.spawners
+		self.leaf_spawners = level.leaf_spawners
 
-		self.particles = []
+		self.particles.clear()
 		self.projectiles = []
-		self.sparks = []
+		self.sparks.clear()
 
 		self.camera_scroll = [0, 0]
+		self.previous_camera_scroll = (0, 0)
 		self.dead = 0
 		self.transition = -30
 
 
+	def report_load_time(self, load_time):
+		if not DEBUG_LEVEL_LOADS:
+			return
+
+		source = f"prepared in {self.prepare_time * 1000:.1f} ms on a worker thread" if self.prepare_time is not None else "not prefetched"
+		print(f"Level {self.level_id} loaded in {load_time * 1000:.1f} ms on the game thread ({source}), " +
+			f"level cache: {self.level_cache.hits} hits, {self.level_cache.misses} misses.")
+
+
+	def prefetch_next_level(self, enemy_count):
+		if enemy_count <= PREFETCH_ENEMY_COUNT and self.level_id < self.max_level:
+			self.prefetcher.request(self.level_id + 1)
+
+
+	def update_enemies(self, enemies, players):
+		# Enemies far from every player update less often, or sleep until one comes closer.
+		awake = self.ai_scheduler.schedule(enemies, players)
+		if len(awake) < BATCH_PHYSICS_ENEMY_COUNT:
+			for enemy in awake:
+				enemy.update(self.tilemap, movement=(0, 0), check_hits=False)
+		else:
+			movements = [enemy.plan_movement(self.tilemap, movement=(0, 0)) for enemy in awake]
+			self.batch_physics.update(awake, movements)
+
+		self.check_dash_hits(enemies, players)
+
+
+	# With enough enemies, only the ones sharing grid cells with a dashing player need the exact hit test.
+	def check_dash_hits(self, enemies, players):
+		dashing_players = [player for player in players if abs(player.dashing) >= 50]
+		if not dashing_players:
+			return
+
+		if len(enemies) < BROADPHASE_ENEMY_COUNT:
+			for enemy in enemies:
+				for player in dashing_players:
+					if enemy.check_for_dead(player):
+						break
+			return
+
+		self.enemy_grid.clear()
+		for enemy in enemies:
+			self.enemy_grid.insert(enemy, enemy.rect())
+		for player in dashing_players:
+			for enemy in self.enemy_grid.query_rect(player.rect()):
+				enemy.check_for_dead(player)
+
+
+	def register_players(self, players):
+		self.player_grid.clear()
+		if len(self.projectiles) < BROADPHASE_PROJECTILE_COUNT:
+			self.shootable_players = players
+			return
+
+		self.shootable_players = None
+		for player in players:
+			self.player_grid.insert(player, player.rect())
+
+
+	# The first registered player the projectile hits, if any.
+	def shot_player(self, projectile):
+		players = self.shootable_players if self.shootable_players is not None else self.player_grid.query_point(projectile.pos)
+		for player in players:
+			if abs(player.dashing) < 50 and player.rect().collidepoint(projectile.pos):
+				return player
+		return None
+
+
 	def start_game(self):
 		self.load_level(self.level_id)
 		self.running = True
@@ -99,55 +219,176 @@ class GameBase:
 		self.sounds["ambience"].play(-1)
 
 
-	def render_terrain(self, render_scroll):
+	def is_playing(self):
+		return self.running
+
+
+	# The game simulates in fixed steps of STEP_TIME, however long each frame takes to render. Slow frames run
+	# several steps to catch up, fast ones none, and entities are drawn interpolated between their last two steps.
+	def run_loop(self):
+		self.presenter.enter_game(self.normal_display.get_size())
+		self.timestep.reset()
+		self.clock.tick()
+		try:
+			while self.is_playing():
+				steps = self.timestep.advance(self.clock.tick(MAX_RENDER_FPS) / 1000)
+				for i in range(steps):
+					self.step()
+
+				self.handle_events()
+				if not self.is_playing():
+					return
+				self.render_frame(self.timestep.alpha)
+		finally:
+			self.presenter.leave_game()
+
+
+	# Called when the player quits or leaves the session, to let the others know.
+	def leave_session(self):
+		pass
+
+
+	def handle_events(self):
+		for event in pygame.event.get():
+			if event.type == pygame.QUIT:
+				self.leave_session()
+				pygame.quit()
+				sys.exit()
+
+			if event.type == pygame.KEYDOWN:
+				if event.key == pygame.K_ESCAPE:
+					self.leave_session()
+					self.running = False
+					fade_out((self.normal_display.get_width(), self.normal_display.get_height()), self.normal_display)
+					return
+				if event.key == pygame.K_LEFT or event.key == pygame.K_a:
+					self.apply_input("left", True)
+				if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
+					self.apply_input("right", True)
+				if event.key == pygame.K_UP or event.key == pygame.K_SPACE:
+					self.apply_input("jump", True)
+				if event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
+					self.apply_input("dash", True)
+
+			if event.type == pygame.KEYUP:
+				if event.key == pygame.K_LEFT or event.key == pygame.K_a:
+					self.apply_input("left", False)
+				if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
+					self.apply_input("right", False)
+
+
+	# The player's controls, from the keyboard or an input script. Jumps and dashes only happen on press.
+	def apply_input(self, action, pressed):
+		if action == "left":
+			self.movement[0] = pressed
+		elif action == "right":
+			self.movement[1] = pressed
+		elif action == "jump" and pressed:
+			if self.get_main_player().jump():
+				self.sounds["jump"].play()
+		elif action == "dash" and pressed:
+			self.get_main_player().dash()
+
+
+	def update_level_transition(self, enemy_count):
+		self.prefetch_next_level(enemy_count)
+		if not enemy_count and self.level_id < self.max_level:
+			self.transition += 1
+			if self.transition > 30:
+				print("Entering the next level...")
+				self.level_id = min(self.level_id + 1, self.max_level)
+				start = time.perf_counter()
+				self.load_level(self.level_id)
+				self.report_load_time(time.perf_counter() - start)
+		if self.transition < 0:
+			self.transition += 1
+
+
+	def update_camera(self, target):
+		self.previous_camera_scroll = tuple(self.camera_scroll)
+		self.camera_scroll[0] += (target.rect().centerx - self.outline_display.get_width() / 2 - self.camera_scroll[0]) / 30
+		self.camera_scroll[1] += (target.rect().centery - self.outline_display.get_height() / 2 - self.camera_scroll[1]) / 30
+		self.tilemap.stream(pygame.Rect((int(self.camera_scroll[0]), int(self.camera_scroll[1])), self.outline_display.get_size()))
+
+
+	def render_scroll(self, alpha):
+		return (int(self.previous_camera_scroll[0] + (self.camera_scroll[0] - self.previous_camera_scroll[0]) * alpha),
+				int(self.previous_camera_scroll[1] + (self.camera_scroll[1] - self.previous_camera_scroll[1]) * alpha))
+
+
+	def update_scenery(self):
 		# Spawn leaf particles.
 		for rect in self.leaf_spawners:
 			if random.random() * 49999 < rect.width * rect.height:
 				pos = (rect.x + random.random() * rect.width, rect.y + random.random() * rect.height)
 				velocity = [random.random() * 0.1 - 0.2, random.random() * 0.2 + 0.1]
 				start_frame = random.randint(0, 17)
-				self.particles.append(Particle(self, "leaf", pos, velocity, start_frame))
+				self.particles.spawn("leaf", pos, velocity, start_frame)
 
-		# Render clouds.
 		self.clouds.update()
+
+
+	def render_terrain(self, render_scroll):
+		# Render clouds.
 		self.clouds.render(self.normal_display, offset=render_scroll)
 
-		# Render the tilemap.
-		self.tilemap.render(self.outline_display, offset=render_scroll)
+		# Render the tilemap, its chunks keep their outlines from frame to frame.
+		self.tilemap.render(self.outline.static, offset=render_scroll)
+
+
+	def update_effects(self):
+		self.sparks.update()
+		self.particles.update()
 
 
 	def render_effects(self, render_scroll):
 		# Render sparks.
-		for spark in self.sparks.copy():
-			died = spark.update()
-			spark.render(self.outline_display, offset=render_scroll)
-			if died:
-				self.sparks.remove(spark)
+		spark_area = self.sparks.render(self.outline_display, offset=render_scroll)
+		if spark_area is not None:
+			self.outline.add_area(spark_area)
 
 		# Render the outline for sprites.
-		display_mask = pygame.mask.from_surface(self.outline_display)
-		display_silhouette = display_mask.to_surface(setcolor=(0, 0, 0, 180), unsetcolor=(0, 0, 0, 0))
-		for offset in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-			self.normal_display.blit(display_silhouette, offset)
+		self.outline.render_outline(self.normal_display)
 
-		# Render particles and remove expired ones.
-		for particle in self.particles.copy():
-			died = particle.update()
-			particle.render(self.outline_display, offset=render_scroll)
-			if particle.type == "leaf":
-				particle.pos[0] += math.sin(particle.animation.frame * 0.035) * (random.random() * 0.3 + 0.2)
-			if died:
-				self.particles.remove(particle)
+		# Render particles.
+		self.particles.render(self.outline_display, offset=render_scroll)
 
 
 	def handle_level_transition(self):
 		# Render the level transition effect.
 		if self.transition:
-			transition_surf = pygame.Surface(self.outline_display.get_size())
-			pygame.draw.circle(transition_surf, (255, 255, 255), (self.outline_display.get_width() // 2,
-								self.outline_display.get_height() // 2), (30 - abs(self.transition)) * 8)
-			transition_surf.set_colorkey((255, 255, 255))
-			self.outline_display.blit(transition_surf, (0, 0))
+			self.iris.render(self.outline_display, self.transition)
+
+
+	# Draw the world and its UI on the normal display.
+	def render_world(self, alpha):
+		render_scroll = self.render_scroll(alpha)
+		self.outline.clear()
+		self.normal_display.blit(self.assets["background"], (0, 0))
+
+		self.render_terrain(render_scroll)
+		self.render_entities(render_scroll, alpha)
+
+		# Render the gun projectiles.
+		for projectile in self.projectiles:
+			projectile.render(self.outline, offset=render_scroll)
+
+		self.render_effects(render_scroll)
+		self.handle_level_transition()
+
+		# Blit the outline display on top of the normal one.
+		self.normal_display.blit(self.outline_display, (0, 0))
+
+		# Render world UI over anything else.
+		self.render_name_tags(render_scroll, alpha)
+
+
+	def render_frame(self, alpha):
+		self.render_world(alpha)
+
+		# Finally, scale and blit all of them on the main screen, along with the screenshake effect.
+		screenshake_offset = (random.random() * self.screenshake - self.screenshake / 2, random.random() * self.screenshake - self.screenshake / 2)
+		self.presenter.present(self.normal_display, screenshake_offset)
 
 
 # The list of player serves as a template for each client.
@@ -188,6 +429,7 @@ class MultiplayerGameBase(GameBase):
 		self.sparks.clear()
 
 		self.camera_scroll = [0, 0]
+		self.previous_camera_scroll = (0, 0)
 		self.dead = 0
 		self.transition = -30
 
@@ -225,12 +467,12 @@ class MultiplayerGameBase(GameBase):
 	def load_level(self, id):
 		super().load_level(id)
 		enemy_count = 1
-		for spawner in self.tilemap.extract([("spawners", 0), ("spawners", 1)]):
+		for spawner in self.spawners:
 			if spawner.variant == 0:
 				# Set the spawn position for all 4 players at once.
 				self.spawn_pos = tuple(spawner.pos)
 				for i in range(MAX_CLIENT_COUNT):
-					self.entities[i].pos = list(self.spawn_pos)
+					self.entities[i].teleport(self.spawn_pos)
 					self.entities[i].air_time = 0
 			else:
 				self.entities.append(Enemy(self, spawner.pos, (8, 15), id=f"enemy_{enemy_count}", client_id=self.client.client_id))
@@ -246,9 +488,98 @@ class MultiplayerGameBase(GameBase):
 		self.entities.clear()
 
 
+	def is_playing(self):
+		return self.running and self.connected
+
+
 	def run(self):
 		super().run()
 		self.client.game_started = True
+		self.run_loop()
+
+
+	# Only the host runs the enemies, the other clients follow it over the network.
+	def update_hosted_enemies(self):
+		pass
+
+
+	def step(self):
+		for entity in self.entities:
+			entity.store_previous_pos()
+
+		self.screenshake = max(self.screenshake - 1, 0)
+
+		# Handle level transitions.
+		self.update_level_transition(len(self.entities[4:]))
+
+		# Update the respawn timer.
+		if self.dead:
+			self.dead += 1
+			if self.dead >= 10:
+				self.transition = min(self.transition + 1, 30)
+			if self.dead > 60:
+				self.respawn()
+
+		self.update_camera(self.get_main_player())
+		self.update_scenery()
+		self.update_hosted_enemies()
+
+		# Update the main player, the others are updated over the network.
+		if not self.dead:
+			self.get_main_player().update(self.tilemap, movement=(self.movement[1] - self.movement[0], 0))
+
+		# Update the gun projectiles.
+		self.register_players(self.entities[:4])
+		for projectile in self.projectiles.copy():
+			# [[x, y], direction, alive_time]
+			projectile.update()
+			if projectile.hit_wall():
+				self.projectiles.remove(projectile)
+				for i in range(4):
+					self.sparks.spawn(projectile.pos, random.random() - 0.5 + (math.pi if projectile.direction > 0 else 0), random.random() + 2)
+			elif projectile.alive_time > MAX_PROJECTILE_TIME:
+				self.projectiles.remove(projectile)
+			
+			# Check if any player gets shot.
+			else:
+				player = self.shot_player(projectile)
+				if player is not None:
+					self.projectiles.remove(projectile)
+					self.sounds["hit"].play()
+					if player.id == "main_player":
+						self.get_main_player().died = True
+						self.dead += 1
+						self.screenshake = max(self.screenshake, 16)
+					
+					# Generate sparks and dust.
+					for i in range(30):
+						angle = random.random() * math.pi * 2
+						self.sparks.spawn(player.rect().center, angle, random.random() + 2)
+
+						speed = random.random() * 5
+						velocity = [math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5]
+						self.particles.spawn("dust", player.rect().center, velocity=velocity, start_frame=random.randint(0, 7))
+
+		self.update_effects()
+
+
+	def render_entities(self, render_scroll, alpha):
+		for enemy in self.entities[4:]:
+			enemy.render(self.outline, offset=render_scroll, alpha=alpha)
+
+		if not self.dead:
+			self.get_main_player().render(self.outline, offset=render_scroll, alpha=alpha)
+
+		for player in self.entities[:4]:
+			if player.initialized and player.id != "main_player" and not player.died:
+				player.render(self.outline, offset=render_scroll, alpha=alpha)
+
+
+	# Render the players' name tags.
+	def render_name_tags(self, render_scroll, alpha):
+		for player in self.entities[:4]:
+			if player.initialized and not player.died:
+				player.render_name_tag(self.normal_display, offset=render_scroll, alpha=alpha)
 
 
 class GameForHost(MultiplayerGameBase):
@@ -290,135 +621,12 @@ class GameForHost(MultiplayerGameBase):
 		set_buttons_interactable(True)
 
 
-	def run(self):
-		super().run()
+	def leave_session(self):
+		self.server.shutdown()
 
-		while self.running and self.connected:
-			self.outline_display.fill((0, 0, 0, 0))
-			self.normal_display.blit(self.assets["background"], (0, 0))
 
-			self.screenshake = max(self.screenshake - 1, 0)
-
-			# Handle level transitions.
-			if not len(self.entities[4:]) and self.level_id < self.max_level:
-				self.transition += 1
-				if self.transition > 30:
-					print("Entering the next level...")
-					self.level_id = min(self.level_id + 1, self.max_level)
-					self.load_level(self.level_id)
-			if self.transition < 0:
-				self.transition += 1
-
-			# Update the respawn timer.
-			if self.dead:
-				self.dead += 1
-				if self.dead >= 10:
-					self.transition = min(self.transition + 1, 30)
-				if self.dead > 60:
-					self.respawn()
-
-			# Update the camera scroll.
-			self.camera_scroll[0] += (self.get_main_player().rect().centerx - self.outline_display.get_width() / 2 - self.camera_scroll[0]) / 30
-			self.camera_scroll[1] += (self.get_main_player().rect().centery - self.outline_display.get_height() / 2 - self.camera_scroll[1]) / 30
-			render_scroll = (int(self.camera_scroll[0]), int(self.camera_scroll[1]))
-
-			self.render_terrain(render_scroll)
-
-			# Update and render the enemies on the main loop, only for the host.
-			for enemy in self.entities[4:]:
-				enemy.update(self.tilemap, movement=(0, 0))
-				enemy.render(self.outline_display, offset=render_scroll)
-
-			# Update and render the main player and other initialized players.
-			if not self.dead:
-				self.get_main_player().update(self.tilemap, movement=(self.movement[1] - self.movement[0], 0))
-				self.get_main_player().render(self.outline_display, offset=render_scroll)
-			
-			for player in self.entities[:4]:
-				if player.initialized and player.id != "main_player" and not player.died:
-					player.render(self.outline_display, offset=render_scroll)
-
-			# Render the gun projectiles.
-			for projectile in self.projectiles.copy():
-				# [[x, y], direction, alive_time]
-				projectile.update()
-				projectile.render(self.outline_display, offset=render_scroll)
-				if self.tilemap.solid_check(projectile.pos):
-					self.projectiles.remove(projectile)
-					for i in range(4):
-						self.sparks.append(Spark(projectile.pos, random.random() - 0.5 + (math.pi if projectile.direction > 0 else 0), random.random() + 2))
-				elif projectile.alive_time > 360:
-					self.projectiles.remove(projectile)
-				
-				# Check if any player gets shot.
-				else:
-					for player in self.entities[:4]:
-						if abs(player.dashing) < 50 and player.rect().collidepoint(projectile.pos):
-							self.projectiles.remove(projectile)
-							self.sounds["hit"].play()
-							if player.id == "main_player":
-								self.get_main_player().died = True
-								self.dead += 1
-								self.screenshake = max(self.screenshake, 16)
-							
-							# Generate sparks and dust.
-							for i in range(30):
-								angle = random.random() * math.pi * 2
-								self.sparks.append(Spark(player.rect().center, angle, random.random() + 2))
-
-								speed = random.random() * 5
-								velocity = [math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5]
-								self.particles.append(Particle(self, "dust", player.rect().center,
-																velocity=velocity, start_frame=random.randint(0, 7)))
-							break
-
-			self.render_effects(render_scroll)
-
-			# Events handling.
-			for event in pygame.event.get():
-				if event.type == pygame.QUIT:
-					self.server.shutdown()
-					pygame.quit()
-					sys.exit()
-				
-				if event.type == pygame.KEYDOWN:
-					if event.key == pygame.K_ESCAPE:
-						self.server.shutdown()
-						self.running = False
-						fade_out((self.normal_display.get_width(), self.normal_display.get_height()), self.normal_display)
-						return
-					if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-						self.movement[0] = True
-					if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-						self.movement[1] = True
-					if event.key == pygame.K_UP or event.key == pygame.K_SPACE:
-						if self.get_main_player().jump():
-							self.sounds["jump"].play()
-					if event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
-						self.get_main_player().dash()
-				
-				if event.type == pygame.KEYUP:
-					if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-						self.movement[0] = False
-					if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-						self.movement[1] = False
-
-			self.handle_level_transition()
-
-			# Blit the outline display on top of the normal one.
-			self.normal_display.blit(self.outline_display, (0, 0))
-
-			# Render the players' name tags over anything else.
-			for player in self.entities[:4]:
-				if player.initialized and not player.died:
-					player.render_name_tag(self.normal_display, offset=render_scroll)
-
-			# Finally, scale and blit all of them on the main screen, along with the screenshake effect.
-			screenshake_offset = (random.random() * self.screenshake - self.screenshake / 2, random.random() * self.screenshake - self.screenshake / 2)
-			self.screen.blit(pygame.transform.scale(self.normal_display, self.screen.get_size()), screenshake_offset)
-			
-			pygame.display.update()
-			self.clock.tick(60)
+	def update_hosted_enemies(self):
+		self.update_enemies(self.entities[4:], [player for player in self.entities[:4] if player.initialized])
 
 
 class GameForClient(MultiplayerGameBase):
@@ -444,139 +652,13 @@ class GameForClient(MultiplayerGameBase):
 		set_buttons_interactable(True)
 
 
-	def run(self):
-		super().run()
-
-		while self.running and self.connected:
-			self.outline_display.fill((0, 0, 0, 0))
-			self.normal_display.blit(self.assets["background"], (0, 0))
-
-			self.screenshake = max(self.screenshake - 1, 0)
-
-			# Handle level transitions.
-			if not len(self.entities[4:]) and self.level_id < self.max_level:
-				self.transition += 1
-				if self.transition > 30:
-					print("Entering the next level...")
-					self.level_id = min(self.level_id + 1, self.max_level)
-					self.load_level(self.level_id)
-			if self.transition < 0:
-				self.transition += 1
-
-			# Update the respawn timer.
-			if self.dead:
-				self.dead += 1
-				if self.dead >= 10:
-					self.transition = min(self.transition + 1, 30)
-				if self.dead > 60:
-					self.respawn()
-
-			# Update the camera scroll.
-			self.camera_scroll[0] += (self.get_main_player().rect().centerx - self.outline_display.get_width() / 2 - self.camera_scroll[0]) / 30
-			self.camera_scroll[1] += (self.get_main_player().rect().centery - self.outline_display.get_height() / 2 - self.camera_scroll[1]) / 30
-			render_scroll = (int(self.camera_scroll[0]), int(self.camera_scroll[1]))
-
-			self.render_terrain(render_scroll)
-
-			# Render the enemies.
-			for enemy in self.entities[4:]:
-				enemy.render(self.outline_display, offset=render_scroll)
-
-			# Update and render the main player and other initialized players.
-			if not self.dead:
-				self.get_main_player().update(self.tilemap, movement=(self.movement[1] - self.movement[0], 0))
-				self.get_main_player().render(self.outline_display, offset=render_scroll)
-			
-			for player in self.entities[:4]:
-				if player.initialized and player.id != "main_player" and not player.died:
-					player.render(self.outline_display, offset=render_scroll)
-
-			# Render the gun projectiles.
-			for projectile in self.projectiles.copy():
-				# [[x, y], direction, alive_time]
-				projectile.update()
-				projectile.render(self.outline_display, offset=render_scroll)
-				if self.tilemap.solid_check(projectile.pos):
-					self.projectiles.remove(projectile)
-					for i in range(4):
-						self.sparks.append(Spark(projectile.pos, random.random() - 0.5 + (math.pi if projectile.direction > 0 else 0), random.random() + 2))
-				elif projectile.alive_time > 360:
-					self.projectiles.remove(projectile)
-				
-				# Check if any player gets shot.
-				else:
-					for player in self.entities[:4]:
-						if abs(player.dashing) < 50 and player.rect().collidepoint(projectile.pos):
-							self.projectiles.remove(projectile)
-							self.sounds["hit"].play()
-							if player.id == "main_player":
-								self.get_main_player().died = True
-								self.dead += 1
-								self.screenshake = max(self.screenshake, 16)
-							
-							# Generate sparks and dust.
-							for i in range(30):
-								angle = random.random() * math.pi * 2
-								self.sparks.append(Spark(player.rect().center, angle, random.random() + 2))
-
-								speed = random.random() * 5
-								velocity = [math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5]
-								self.particles.append(Particle(self, "dust", player.rect().center,
-																velocity=velocity, start_frame=random.randint(0, 7)))
-							break
-
-			self.render_effects(render_scroll)
-
-			# Events handling.
-			for event in pygame.event.get():
-				if event.type == pygame.QUIT:
-					self.disconnect_from_server()
-					pygame.quit()
-					sys.exit()
-				
-				if event.type == pygame.KEYDOWN:
-					if event.key == pygame.K_ESCAPE:
-						self.disconnect_from_server()
-						self.running = False
-						fade_out((self.normal_display.get_width(), self.normal_display.get_height()), self.normal_display)
-						return
-					if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-						self.movement[0] = True
-					if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-						self.movement[1] = True
-					if event.key == pygame.K_UP or event.key == pygame.K_SPACE:
-						if self.get_main_player().jump():
-							self.sounds["jump"].play()
-					if event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
-						self.get_main_player().dash()
-				
-				if event.type == pygame.KEYUP:
-					if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-						self.movement[0] = False
-					if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-						self.movement[1] = False
-
-			self.handle_level_transition()
-
-			# Blit the outline display on top of the normal one.
-			self.normal_display.blit(self.outline_display, (0, 0))
-
-			# Render the players' name tags over anything else.
-			for player in self.entities[:4]:
-				if player.initialized and not player.died:
-					player.render_name_tag(self.normal_display, offset=render_scroll)
-
-			# Finally, scale and blit all of them on the main screen, along with the screenshake effect.
-			screenshake_offset = (random.random() * self.screenshake - self.screenshake / 2, random.random() * self.screenshake - self.screenshake / 2)
-			self.screen.blit(pygame.transform.scale(self.normal_display, self.screen.get_size()), screenshake_offset)
-			
-			pygame.display.update()
-			self.clock.tick(60)
+	def leave_session(self):
+		self.disconnect_from_server()
 
 
 class GameSolo(GameBase):
-	def __init__(self, clock, screen, outline_display, normal_display):
-		super().__init__(clock, screen, outline_display, normal_display)
+	def __init__(self, clock, screen, outline_display, normal_display, headless=False, presenter=None):
+		super().__init__(clock, screen, outline_display, normal_display, headless=headless, presenter=presenter)
 		self.player = Player("", self, (50, 50), (8, 15))
 		self.start_game()
 
@@ -588,7 +670,7 @@ class GameSolo(GameBase):
 	def load_level(self, id):
 		super().load_level(id)
 		self.enemies = []
-		for spawner in self.tilemap.extract([("spawners", 0), ("spawners", 1)]):
+		for spawner in self.spawners:
 			if spawner.variant == 0:
 				self.player.respawn(spawner.pos)
 			else:
@@ -596,116 +678,80 @@ class GameSolo(GameBase):
 
 	def run(self):
 		super().run()
-
 		self.start_game()
-		while self.running:
-			self.outline_display.fill((0, 0, 0, 0))
-			self.normal_display.blit(self.assets["background"], (0, 0))
-
-			self.screenshake = max(self.screenshake - 1, 0)
-
-			# Handle level transitions.
-			if not len(self.enemies) and self.level_id < self.max_level:
-				self.transition += 1
-				if self.transition > 30:
-					print("Entering the next level...")
-					self.level_id = min(self.level_id + 1, self.max_level)
-					self.load_level(self.level_id)
-			if self.transition < 0:
-				self.transition += 1
-
-			# Update the respawn timer.
-			if self.dead:
+		self.run_loop()
+
+
+	def step(self):
+		for entity in [self.player] + self.enemies:
+			entity.store_previous_pos()
+
+		self.screenshake = max(self.screenshake - 1, 0)
+
+		# Handle level transitions.
+		self.update_level_transition(len(self.enemies))
+
+		# Update the respawn timer.
+		if self.dead:
+			self.dead += 1
+			if self.dead >= 10:
+				self.transition = min(self.transition + 1, 30)
+			if self.dead > 60:
+				start = time.perf_counter()
+				self.load_level(self.level_id)
+				self.report_load_time(time.perf_counter() - start)
+
+		self.update_camera(self.player)
+		self.update_scenery()
+
+		# Update the enemies.
+		self.update_enemies(self.enemies, [self.player])
+		for enemy in self.enemies.copy():
+			if enemy.is_dead:
+				self.enemies.remove(enemy)
+
+		# Update the player.
+		if not self.dead:
+			self.player.update(self.tilemap, movement=(self.movement[1] - self.movement[0], 0))
+
+		# Update the gun projectiles.
+		self.register_players([self.player])
+		for projectile in self.projectiles.copy():
+			# [[x, y], direction, alive_time]
+			projectile.update()
+			if projectile.hit_wall():
+				self.projectiles.remove(projectile)
+				for i in range(4):
+					self.sparks.spawn(projectile.pos, random.random() - 0.5 + (math.pi if projectile.direction > 0 else 0), random.random() + 2)
+			elif projectile.alive_time > MAX_PROJECTILE_TIME:
+				self.projectiles.remove(projectile)
+			
+			# If the player gets shot.
+			elif self.shot_player(projectile) is not None:
+				self.projectiles.remove(projectile)
+				self.sounds["hit"].play()
+				self.player.died = True
 				self.dead += 1
-				if self.dead >= 10:
-					self.transition = min(self.transition + 1, 30)
-				if self.dead > 60:
-					self.load_level(self.level_id)
-
-			# Update the camera scroll.
-			self.camera_scroll[0] += (self.player.rect().centerx - self.outline_display.get_width() / 2 - self.camera_scroll[0]) / 30
-			self.camera_scroll[1] += (self.player.rect().centery - self.outline_display.get_height() / 2 - self.camera_scroll[1]) / 30
-			render_scroll = (int(self.camera_scroll[0]), int(self.camera_scroll[1]))
-
-			self.render_terrain(render_scroll)
-
-			# Render the enemies.
-			for enemy in self.enemies.copy():
-				died = enemy.update(self.tilemap, movement=(0, 0))
-				enemy.render(self.outline_display, offset=render_scroll)
-				if died:
-					self.enemies.remove(enemy)
-
-			# Render the player.
-			if not self.dead:
-				self.player.update(self.tilemap, movement=(self.movement[1] - self.movement[0], 0))
-				self.player.render(self.outline_display, offset=render_scroll)
-
-			# Render the gun projectiles.
-			for projectile in self.projectiles.copy():
-				# [[x, y], direction, alive_time]
-				projectile.update()
-				projectile.render(self.outline_display, offset=render_scroll)
-				if self.tilemap.solid_check(projectile.pos):
-					self.projectiles.remove(projectile)
-					for i in range(4):
-						self.sparks.append(Spark(projectile.pos, random.random() - 0.5 + (math.pi if projectile.direction > 0 else 0), random.random() + 2))
-				elif projectile.alive_time > 360:
-					self.projectiles.remove(projectile)
-				
-				# If the player gets shot.
-				elif abs(self.player.dashing) < 50 and self.player.rect().collidepoint(projectile.pos):
-					self.projectiles.remove(projectile)
-					self.sounds["hit"].play()
-					self.player.died = True
-					self.dead += 1
-					self.screenshake = max(self.screenshake, 16)
-					for i in range(30):
-						angle = random.random() * math.pi * 2
-						self.sparks.append(Spark(self.player.rect().center, angle, random.random() + 2))
+				self.screenshake = max(self.screenshake, 16)
+				for i in range(30):
+					angle = random.random() * math.pi * 2
+					self.sparks.spawn(self.player.rect().center, angle, random.random() + 2)
 
-						speed = random.random() * 5
-						velocity = [math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5]
-						self.particles.append(Particle(self, "dust", self.player.rect().center, velocity=velocity, start_frame=random.randint(0, 7)))
-
-			self.render_effects(render_scroll)
-
-			# Events handling.
-			for event in pygame.event.get():
-				if event.type == pygame.QUIT:
-					pygame.quit()
-					sys.exit()
-				if event.type == pygame.KEYDOWN:
-					if event.key == pygame.K_ESCAPE:
-						self.running = False
-						fade_out((self.normal_display.get_width(), self.normal_display.get_height()), self.normal_display)
-					if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-						self.movement[0] = True
-					if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-						self.movement[1] = True
-					if event.key == pygame.K_UP or event.key == pygame.K_SPACE:
-						if self.player.jump():
-							self.sounds["jump"].play()
-					if event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
-						self.player.dash()
-				if event.type == pygame.KEYUP:
-					if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-						self.movement[0] = False
-					if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-						self.movement[1] = False
-
-			self.handle_level_transition()
-
-			# Blit the outline display on top of the normal one.
-			self.normal_display.blit(self.outline_display, (0, 0))
-
-			# Render world UI over anything else.
-			if not self.dead:
-				self.player.name_text.render(self.normal_display, offset=render_scroll)
-
-			# Finally, scale and blit all of them on the main screen, along with the screenshake effect.
-			screenshake_offset = (random.random() * self.screenshake - self.screenshake / 2, random.random() * self.screenshake - self.screenshake / 2)
-			self.screen.blit(pygame.transform.scale(self.normal_display, self.screen.get_size()), screenshake_offset)
-			
-			pygame.display.update()
-			self.clock.tick(60)
\ No newline at end of file
+					speed = random.random() * 5
+					velocity = [math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5]
+					self.particles.spawn("dust", self.player.rect().center, velocity=velocity, start_frame=random.randint(0, 7))
+
+		self.update_effects()
+
+
+	def render_entities(self, render_scroll, alpha):
+		for enemy in self.enemies:
+			enemy.render(self.outline, offset=render_scroll, alpha=alpha)
+
+		if not self.dead:
+			self.player.render(self.outline, offset=render_scroll, alpha=alpha)
+
+
+	def render_name_tags(self, render_scroll, alpha):
+		if not self.dead:
+			self.player.render_name_tag(self.normal_display, offset=render_scroll, alpha=alpha)
@@ -0,0 +1,104 @@
+import random
+import sys
+import time
+
+import pygame
+
+from scripts.game import GameSolo
+
+
+VIEW_SIZE = (320, 240)  # Same as the game's displays, the camera follows the player within it.
+DEFAULT_TICKS = 3600
+INPUT_ACTIONS = {"left", "right", "jump", "dash"}
+
+
+# A solo game without a display or audio, stepped as fast as the CPU allows.
+# The player is driven by an input script of (tick, action, pressed) events instead of the keyboard.
+class HeadlessGame(GameSolo):
+	def __init__(self, level_id=0, seed=0):
+		random.seed(seed)
+		self.level_loads = []
+		super().__init__(None, None, pygame.Surface(VIEW_SIZE, pygame.SRCALPHA), pygame.Surface(VIEW_SIZE), headless=True)
+		self.ticks = 0
+
+		if level_id:
+			self.level_id = level_id
+			self.start_game()
+
+
+	def report_load_time(self, load_time):
+		self.level_loads.append((self.level_id, load_time))
+
+
+	# Returns how long the steps took, in seconds.
+	def simulate(self, ticks, script=()):
+		events = sorted(event for event in script if self.ticks <= event[0] < self.ticks + ticks)
+		event_index = 0
+
+		start = time.perf_counter()
+		for i in range(ticks):
+			while event_index < len(events) and events[event_index][0] <= self.ticks:
+				tick, action, pressed = events[event_index]
+				self.apply_input(action, pressed)
+				event_index += 1
+
+			self.step()
+			self.ticks += 1
+
+		return time.perf_counter() - start
+
+
+# Input script files have one event per line: "<tick> <action> [release]", with the actions in INPUT_ACTIONS.
+def load_script(path):
+	script = []
+	f = open(path, 'r')
+	for line_number, line in enumerate(f, start=1):
+		words = line.split("#")[0].split()
+		if not words:
+			continue
+		# A tick and an action, with an optional release. Ticks are counted from 0.
+		if (not 2 <= len(words) <= 3 or not words[0].isdigit() or words[1] not in INPUT_ACTIONS
+				or words[2:] not in ([], ["release"])):
+			f.close()
+			raise ValueError(f"Invalid input event on line {line_number} of \"{path}\": {line.strip()}")
+		script.append((int(words[0]), words[1], words[2:] != ["release"]))
+	f.close()
+
+	return script
+
+
+# Walks, jumps and dashes at random, the same way for a given seed. Enough to keep the game busy for benchmarks.
+def random_script(ticks, seed=0):
+	rng = random.Random(seed)
+	script = []
+	walking = None
+
+	for tick in range(0, ticks, 30):
+		direction = rng.choice(["left", "right", None])
+		if direction != walking:
+			if walking is not None:
+				script.append((tick, walking, False))
+			if direction is not None:
+				script.append((tick, direction, True))
+			walking = direction
+
+		if rng.random() < 0.3:
+			script.append((tick + rng.randint(0, 29), "jump", True))
+		if rng.random() < 0.1:
+			script.append((tick + rng.randint(0, 29), "dash", True))
+
+	return script
+
+
+# Run a level without a display: python -m scripts.headless [level id] [ticks] [input script path]
+if __name__ == "__main__":
+	level_id = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+	ticks = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_TICKS
+	script = load_script(sys.argv[3]) if len(sys.argv) > 3 else random_script(ticks)
+
+	game = HeadlessGame(level_id)
+	elapsed = game.simulate(ticks, script)
+	print(f"Simulated {ticks:,} ticks in {elapsed:.2f}s: {ticks / elapsed:,.0f} ticks/s " +
+		f"({ticks / elapsed / 60:.1f}x real time).")
+	print(f"Ended on level {game.level_id} with {len(game.enemies)} enemies left, " +
+		f"{len(game.level_loads)} level loads (respawns and transitions).")
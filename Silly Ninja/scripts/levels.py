@@ -0,0 +1,104 @@
+import pygame
+import threading
+import time
+
+from collections import OrderedDict
+from scripts.map_format import level_path
+from scripts.tilemap import Tilemap
+
+
+SPAWNER_PAIRS = [("spawners", 0), ("spawners", 1)]
+LEVEL_CACHE_SIZE = 4
+
+
+# A level that's been read, had its spawners extracted and its chunks baked, ready to be swapped into the game's tilemap.
+class PreparedLevel:
+	def __init__(self, game, level_id, folder="assets/maps"):
+		start = time.perf_counter()
+		self.level_id = level_id
+		self.tilemap = Tilemap(game, game.tilemap.tile_size)
+		self.tilemap.load(level_path(level_id, folder))
+		self.spawners = self.tilemap.extract(SPAWNER_PAIRS)
+		self.leaf_spawners = [pygame.Rect(tree.pos[0] + 4, tree.pos[1] + 4, 23, 13)
+							for tree in self.tilemap.extract([("large_decor", 2)], keep=True)]
+		self.tilemap.bake()
+		self.prepare_time = time.perf_counter() - start
+
+
+	# Streamed levels keep changing as they're played, so they can only be restored once.
+	def can_restore_again(self):
+		return self.tilemap.streamer is None
+
+
+	# Put the level as it was prepared into the game's tilemap, the prepared copy itself stays untouched.
+	def restore(self, tilemap):
+		tilemap.adopt(self.tilemap.snapshot() if self.can_restore_again() else self.tilemap)
+
+
+# Keeps the most recently played levels in memory, so respawning doesn't read and parse the level again.
+class LevelCache:
+	def __init__(self, size=LEVEL_CACHE_SIZE):
+		self.size = size
+		self.levels = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+
+	def get(self, level_id):
+		level = self.levels.get(level_id)
+		if level is None:
+			self.misses += 1
+			return None
+
+		self.hits += 1
+		self.levels.move_to_end(level_id)
+		return level
+
+
+	def put(self, level):
+		if not level.can_restore_again():
+			return
+
+		self.levels[level.level_id] = level
+		self.levels.move_to_end(level.level_id)
+		while len(self.levels) > self.size:
+			self.levels.popitem(last=False)
+
+
+# Prepares the next level on a worker thread while the current one is still being played.
+class LevelPrefetcher:
+	def __init__(self, game, folder="assets/maps"):
+		self.game = game
+		self.folder = folder
+		self.level_id = None
+		self.level = None
+		self.thread = None
+
+
+	def request(self, level_id):
+		if self.level_id == level_id:
+			return
+
+		self.level_id = level_id
+		self.level = None
+		self.thread = threading.Thread(target=self.prepare, args=(level_id,), name=f"LevelPrefetcher-{level_id}", daemon=True)
+		self.thread.start()
+
+
+	def prepare(self, level_id):
+		level = PreparedLevel(self.game, level_id, self.folder)
+		if self.level_id == level_id:
+			self.level = level
+
+
+	# Returns the prepared level, waiting for the worker if it's still busy, or None if it wasn't requested.
+	def take(self, level_id):
+		if self.level_id != level_id:
+			return None
+
+		self.thread.join()
+		level = self.level
+		self.level_id = None
+		self.level = None
+		self.thread = None
+		return level
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+
+# Packed level layout, all little-endian:
+#   Header:  magic, version, tile size, palette count, grid tile count, offgrid tile count,
+#            SHA-1 of the JSON source the map was converted from, zeros if there's none.
+#   Palette: one fixed-size (type, variant) entry per distinct tile kind.
+#   Grid:    (x, y, palette index) per grid tile.
+#   Offgrid: (x, y, palette index) per offgrid tile, positions in pixels.
+MAGIC = b"SNMP"
+VERSION = 2
+BINARY_EXTENSION = ".map"
+JSON_EXTENSION = ".json"
+REGIONS_EXTENSION = ".regions"  # A folder of region files, streamed in around the camera.
+
+HEADER = struct.Struct("<4sHHIII20s")
+PALETTE_ENTRY = struct.Struct("<24sH")
+GRID_ENTRY = struct.Struct("<iiH")
+OFFGRID_ENTRY = struct.Struct("<ddH")
+
+
+# JSON path -> (size, modification time, digest) of the sources hashed so far.
+source_digests = {}
+
+
+class MapFormatError(Exception):
+	pass
+
+
+# Identifies the JSON source a packed or streamed copy was made from. A source is only hashed again once its size or
+# modification time changed since it was last hashed.
+def source_digest(json_path):
+	stat = os.stat(json_path)
+	cached = source_digests.get(json_path)
+	if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+		return cached[2]
+
+	f = open(json_path, 'rb')
+	digest = hashlib.sha1(f.read()).digest()
+	f.close()
+	source_digests[json_path] = (stat.st_size, stat.st_mtime_ns, digest)
+	return digest
+
+
+# Both tile iterables yield ((x, y), type, variant), grid tiles in grid units and offgrid tiles in pixels.
+def write_binary(path, tile_size, grid_tiles, offgrid_tiles, source=b""):
+	palette = {}
+	grid = bytearray()
+	offgrid = bytearray()
+
+	for tile_loc, t_type, variant in grid_tiles:
+		index = palette.setdefault((t_type, variant), len(palette))
+		grid += GRID_ENTRY.pack(tile_loc[0], tile_loc[1], index)
+
+	for pos, t_type, variant in offgrid_tiles:
+		index = palette.setdefault((t_type, variant), len(palette))
+		offgrid += OFFGRID_ENTRY.pack(pos[0], pos[1], index)
+
+	f = open(path, 'wb')
+	f.write(HEADER.pack(MAGIC, VERSION, tile_size, len(palette),
+						len(grid) // GRID_ENTRY.size, len(offgrid) // OFFGRID_ENTRY.size, source))
+	for t_type, variant in palette:
+		name = t_type.encode("utf-8")
+		if len(name) > PALETTE_ENTRY.size - 2:
+			f.close()
+			raise MapFormatError(f"Tile type name \"{t_type}\" is too long for the binary map format.")
+		f.write(PALETTE_ENTRY.pack(name, variant))
+	f.write(grid)
+	f.write(offgrid)
+	f.close()
+
+
+# A memory-mapped packed level. Only the header and palette are decoded up front,
+# tiles are decoded straight from the mapping while they're iterated.
+class BinaryMap:
+	def __init__(self, path):
+		self.file = open(path, 'rb')
+		self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+		self.view = memoryview(self.buffer)
+
+		magic, version, self.tile_size, palette_count, self.grid_count, self.offgrid_count, self.source = HEADER.unpack_from(self.view)
+		if magic != MAGIC or version != VERSION:
+			self.close()
+			raise MapFormatError(f"\"{path}\" is not a version {VERSION} binary map.")
+
+		self.palette = []
+		offset = HEADER.size
+		for name, variant in PALETTE_ENTRY.iter_unpack(self.view[offset:offset + palette_count * PALETTE_ENTRY.size]):
+			self.palette.append((sys.intern(name.rstrip(b"\0").decode("utf-8")), variant))
+
+		self.grid_offset = offset + palette_count * PALETTE_ENTRY.size
+		self.offgrid_offset = self.grid_offset + self.grid_count * GRID_ENTRY.size
+
+
+	def __enter__(self):
+		return self
+
+
+	def __exit__(self, *args):
+		self.close()
+
+
+	def grid_tiles(self):
+		grid = self.view[self.grid_offset:self.offgrid_offset]
+		for x, y, index in GRID_ENTRY.iter_unpack(grid):
+			yield (x, y), self.palette[index][0], self.palette[index][1]
+		grid.release()
+
+
+	def offgrid_tiles(self):
+		offgrid = self.view[self.offgrid_offset:self.offgrid_offset + self.offgrid_count * OFFGRID_ENTRY.size]
+		for x, y, index in OFFGRID_ENTRY.iter_unpack(offgrid):
+			yield (x, y), self.palette[index][0], self.palette[index][1]
+		offgrid.release()
+
+
+	def close(self):
+		self.view.release()
+		self.buffer.close()
+		self.file.close()
+
+
+# The source digest recorded in a packed map, None if it's not a map of this version.
+def binary_source(binary_path):
+	f = open(binary_path, 'rb')
+	header = f.read(HEADER.size)
+	f.close()
+	if len(header) < HEADER.size:
+		return None
+
+	magic, version, *counts, source = HEADER.unpack(header)
+	return source if magic == MAGIC and version == VERSION else None
+
+
+def regions_source(regions_path):
+	f = open(os.path.join(regions_path, "level.json"), 'r')
+	source = json.load(f).get("source")
+	f.close()
+	return bytes.fromhex(source) if source is not None else None
+
+
+# Use the streamed or packed copy of a level when it was made from its current JSON source. Comparing modification
+# times can't tell, a checkout or a copy can leave an outdated copy newer than its source.
+def level_path(level_id, folder="assets/maps"):
+	json_path = os.path.join(folder, f"{level_id}{JSON_EXTENSION}")
+	regions_path = os.path.join(folder, f"{level_id}{REGIONS_EXTENSION}")
+	binary_path = os.path.join(folder, f"{level_id}{BINARY_EXTENSION}")
+
+	copies = []
+	if os.path.exists(os.path.join(regions_path, "level.json")):
+		copies.append((regions_path, regions_source))
+	if os.path.exists(binary_path):
+		copies.append((binary_path, binary_source))
+	if not copies:
+		return json_path
+	if not os.path.exists(json_path):
+		return copies[0][0]
+
+	digest = source_digest(json_path)
+	for path, read_source in copies:
+		if read_source(path) == digest:
+			return path
+	return json_path
+
+
+def level_count(folder="assets/maps"):
+	return len({os.path.splitext(name)[0] for name in os.listdir(folder)
+				if os.path.splitext(name)[1] in (JSON_EXTENSION, BINARY_EXTENSION, REGIONS_EXTENSION)})
+
+
+def convert(json_path):
+	f = open(json_path, 'r')
+	map_data = json.load(f)
+	f.close()
+
+	binary_path = os.path.splitext(json_path)[0] + BINARY_EXTENSION
+	write_binary(binary_path, map_data["tile_size"],
+				((tile["pos"], tile["type"], tile["variant"]) for tile in map_data["tilemap"].values()),
+				((tile["pos"], tile["type"], tile["variant"]) for tile in map_data["offgrid_tiles"]),
+				source=source_digest(json_path))
+	return binary_path
+
+
+# Convert JSON maps to the packed format: python -m scripts.map_format [json paths...]
+if __name__ == "__main__":
+	paths = sys.argv[1:] or sorted(os.path.join("assets/maps", name) for name in os.listdir("assets/maps")
+									if name.endswith(JSON_EXTENSION))
+	for path in paths:
+		binary_path = convert(path)
+		print(f"Map CONVERTED: {path} ({os.path.getsize(path):,} bytes) -> {binary_path} ({os.path.getsize(binary_path):,} bytes)")
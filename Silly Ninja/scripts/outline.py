@@ -0,0 +1,174 @@
+import weakref
+
+import pygame
+
+
+OUTLINE_COLOR = (0, 0, 0, 180)
+OUTLINE_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+# Merge the rects that overlap, so no pixel is covered twice.
+def disjoint_areas(rects):
+	areas = []
+	for rect in rects:
+		area = rect.copy()
+		index = area.collidelist(areas)
+		while index != -1:
+			area.union_ip(areas.pop(index))
+			index = area.collidelist(areas)
+		areas.append(area)
+	return areas
+
+
+# Stands in for the outline display while the world is drawn on it. Everything blitted through it gets its outline
+# from cached masks of the images, rather than a mask of the whole display built again every frame. Images are
+# expected not to change once they've been blitted, like the sprites and the baked tilemap chunks.
+# The tilemap is drawn through the static layer, whose chunks draw their outlines from silhouettes cached per chunk.
+# Only the areas around the moving sprites get a silhouette built every frame, from the masks of everything there.
+class OutlineLayer:
+	def __init__(self, surface):
+		self.surface = surface
+		self.mask = pygame.mask.Mask(surface.get_size())  # Of the moving sprites only.
+		self.image_masks = weakref.WeakKeyDictionary()  # Dropped along with their images, like rebaked chunks.
+		self.image_silhouettes = weakref.WeakKeyDictionary()
+		self.static = StaticOutlineLayer(self)
+		self.static_blits = []  # (image, position) of the chunks drawn since the last clear.
+		self.moving_areas = []  # Areas the moving sprites were drawn on since the last clear.
+
+
+	def get_size(self):
+		return self.surface.get_size()
+
+
+	def get_width(self):
+		return self.surface.get_width()
+
+
+	def get_height(self):
+		return self.surface.get_height()
+
+
+	# Build the masks of images known up front, so they aren't built mid play.
+	def prepare(self, images):
+		for image in images:
+			self.image_mask(image)
+
+
+	def image_mask(self, image):
+		mask = self.image_masks.get(image)
+		if mask is None:
+			mask = self.image_masks[image] = pygame.mask.from_surface(image)
+		return mask
+
+
+	# The silhouette of an image, along with the areas of it that aren't empty. Blitting only those skips the
+	# transparent parts of a chunk, which wouldn't change a pixel.
+	def image_silhouette(self, image):
+		silhouette = self.image_silhouettes.get(image)
+		if silhouette is None:
+			mask = self.image_mask(image)
+			silhouette = self.image_silhouettes[image] = (mask.to_surface(setcolor=OUTLINE_COLOR, unsetcolor=(0, 0, 0, 0)),
+														disjoint_areas(mask.get_bounding_rects()))
+		return silhouette
+
+
+	def clear(self):
+		self.surface.fill((0, 0, 0, 0))
+		self.mask.clear()
+		self.static_blits = []
+		self.moving_areas = []
+
+
+	def blit(self, image, dest):
+		self.surface.blit(image, dest)
+
+		# Blits truncate their position towards zero.
+		pos = (int(dest[0]), int(dest[1]))
+		self.mask.draw(self.image_mask(image), pos)
+		self.add_moving_area(pygame.Rect(pos, image.get_size()))
+
+
+	def blit_static(self, image, dest):
+		self.surface.blit(image, dest)
+		self.static_blits.append((image, (int(dest[0]), int(dest[1]))))
+
+
+	# Add whatever was drawn straight on the surface in this area, like the sparks' polygons.
+	def add_area(self, rect):
+		rect = rect.clip(self.surface.get_rect())
+		if rect:
+			self.mask.draw(pygame.mask.from_surface(self.surface.subsurface(rect)), rect.topleft)
+			self.add_moving_area(rect)
+
+
+	def add_moving_area(self, rect):
+		rect = rect.clip(self.surface.get_rect())
+		if rect:
+			self.moving_areas.append(rect)
+
+
+	# The pixels whose outline the moving sprites take part in, as areas that don't overlap.
+	def moving_outline_areas(self):
+		surface_rect = self.surface.get_rect()
+		return disjoint_areas(rect.inflate(2, 2).clip(surface_rect) for rect in self.moving_areas)
+
+
+	# Draw the outline of everything drawn so far onto the surface below, with the same pixels as blitting a silhouette
+	# of the whole display at every offset. The chunks' silhouettes cover everything but the areas around the moving
+	# sprites, which are put back as they were and outlined from a mask of everything drawn in and around them.
+	def render_outline(self, surface):
+		areas = self.moving_outline_areas()
+		backups = [(area, surface.subsurface(area).copy()) for area in areas]
+
+		surface_rect = self.surface.get_rect()
+		static_silhouettes = []
+		for image, pos in self.static_blits:
+			visible_area = surface_rect.move(-pos[0], -pos[1])
+			silhouette, filled_areas = self.image_silhouette(image)
+			for filled_area in filled_areas:
+				area = filled_area.clip(visible_area)
+				if area:
+					static_silhouettes.append((silhouette, (pos[0] + area.x, pos[1] + area.y), area))
+		for offset in OUTLINE_OFFSETS:
+			for silhouette, area_pos, area in static_silhouettes:
+				surface.blit(silhouette, (area_pos[0] + offset[0], area_pos[1] + offset[1]), area)
+
+		clip = surface.get_clip()
+		for area, backup in backups:
+			surface.blit(backup, area)
+
+			# The outline of a pixel comes from its neighbors, one pixel further out.
+			source = area.inflate(2, 2).clip(surface_rect)
+			mask = pygame.mask.Mask(source.size)
+			for image, pos in self.static_blits:
+				if source.colliderect(pygame.Rect(pos, image.get_size())):
+					mask.draw(self.image_mask(image), (pos[0] - source.x, pos[1] - source.y))
+			mask.draw(self.mask, (-source.x, -source.y))
+
+			silhouette = mask.to_surface(setcolor=OUTLINE_COLOR, unsetcolor=(0, 0, 0, 0))
+			surface.set_clip(area)
+			for offset in OUTLINE_OFFSETS:
+				surface.blit(silhouette, (source.x + offset[0], source.y + offset[1]))
+			surface.set_clip(clip)
+
+
+# Stands in for the outline layer while the tilemap is drawn on it, marking what's drawn as static.
+class StaticOutlineLayer:
+	def __init__(self, layer):
+		self.layer = layer
+
+
+	def get_size(self):
+		return self.layer.get_size()
+
+
+	def get_width(self):
+		return self.layer.get_width()
+
+
+	def get_height(self):
+		return self.layer.get_height()
+
+
+	def blit(self, image, dest):
+		self.layer.blit_static(image, dest)
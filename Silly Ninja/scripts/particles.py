@@ -0,0 +1,181 @@
+import math
+import random
+
+import numpy as np
+import pygame
+
+
+MAX_PARTICLES = 2048  # Particles spawned while the pool is full are dropped.
+MAX_SPARKS = 1024
+SWAY_TYPES = {"leaf"}  # Particle types drifting side to side as they fall.
+
+# A spark is a diamond, long along its direction and narrow across it.
+SPARK_CORNER_ANGLES = (0, math.pi * 0.5, math.pi, -math.pi * 0.5)
+SPARK_CORNER_LENGTHS = np.array([3, 0.5, 3, 0.5])[:, None]
+
+
+# Fixed size arrays of effects, the live ones packed at the front. An effect is removed by moving one from the back
+# of the live ones into its slot, so nothing is allocated or shifted while the game runs.
+# Effects that expire on an update are still rendered that frame, and removed at the start of the next update.
+class EffectPool:
+	def __init__(self, capacity):
+		self.capacity = capacity
+		self.count = 0
+		self.arrays = []
+		self.expired = None  # Mask of the effects that expired on the last update.
+
+
+	def __len__(self):
+		return self.count
+
+
+	def clear(self):
+		self.count = 0
+		self.expired = None
+
+
+	# The slot for a new effect, or None when the pool is full.
+	def allocate(self):
+		if self.count == self.capacity:
+			return None
+		self.count += 1
+		return self.count - 1
+
+
+	# Remove the live effects marked in the mask, filling their slots with the surviving ones from the back.
+	def remove(self, dead):
+		dead_count = int(np.count_nonzero(dead))
+		if not dead_count:
+			return
+
+		new_count = self.count - dead_count
+		holes = np.flatnonzero(dead[:new_count])
+		movers = np.flatnonzero(~dead[new_count:]) + new_count
+		for array in self.arrays:
+			array[holes] = array[movers]
+		self.count = new_count
+
+
+	# Remove the effects that expired on the last update. Those spawned since then are kept.
+	def remove_expired(self):
+		if self.expired is None:
+			return
+		dead = np.zeros(self.count, dtype=bool)
+		dead[:len(self.expired)] = self.expired
+		self.expired = None
+		self.remove(dead)
+
+
+class ParticleSystem(EffectPool):
+	# Clips are the particle animations by type, like "dust" for "particle/dust".
+	def __init__(self, clips, capacity=MAX_PARTICLES):
+		super().__init__(capacity)
+		self.types = {p_type: index for index, p_type in enumerate(clips)}
+		self.pos = np.zeros((capacity, 2))
+		self.velocity = np.zeros((capacity, 2))
+		self.type = np.zeros(capacity, dtype=np.int64)
+		self.frame = np.zeros(capacity, dtype=np.int64)
+		self.arrays = [self.pos, self.velocity, self.type, self.frame]
+
+		# The clips as (type, frame) tables, padded to the longest one.
+		frame_count = max(clip.frame_count for clip in clips.values())
+		self.next_frames = np.zeros((len(clips), frame_count), dtype=np.int64)
+		self.last_frames = np.full(len(clips), -1, dtype=np.int64)
+		self.frame_images = np.empty((len(clips), frame_count), dtype=object)
+		self.sway = np.array([p_type in SWAY_TYPES for p_type in clips])
+		for index, clip in enumerate(clips.values()):
+			self.next_frames[index, :clip.frame_count] = clip.next_frames
+			self.last_frames[index] = -1 if clip.last_frame is None else clip.last_frame
+			self.frame_images[index, :clip.frame_count] = clip.frame_images
+
+		# Particles are drawn offset by half their image size, worked out lazily since headless games never render.
+		self.image_offsets = None
+
+		# Seeded from the random module, so seeded games play out the same.
+		self.rng = np.random.default_rng(random.getrandbits(64))
+
+
+	def spawn(self, p_type, pos, velocity=(0, 0), start_frame=0):
+		index = self.allocate()
+		if index is None:
+			return
+		self.pos[index] = pos
+		self.velocity[index] = velocity
+		self.type[index] = self.types[p_type]
+		self.frame[index] = start_frame
+
+
+	def update(self):
+		self.remove_expired()
+		count = self.count
+		if not count:
+			return
+
+		# Particles already on their last frame move once more, and are removed after being rendered.
+		self.expired = self.frame[:count] == self.last_frames[self.type[:count]]
+		self.pos[:count] += self.velocity[:count]
+		types = self.type[:count]
+		frames = self.next_frames[types, self.frame[:count]]
+		self.frame[:count] = frames
+
+		swaying = np.flatnonzero(self.sway[types])
+		if len(swaying):
+			self.pos[swaying, 0] += np.sin(frames[swaying] * 0.035) * (self.rng.random(len(swaying)) * 0.3 + 0.2)
+
+
+	def render(self, surface, offset=(0, 0)):
+		count = self.count
+		if not count:
+			return
+
+		if self.image_offsets is None:
+			self.image_offsets = np.zeros(self.frame_images.shape + (2,))
+			for loc, image in np.ndenumerate(self.frame_images):
+				if image is not None:
+					self.image_offsets[loc] = (image.get_width() // 2, image.get_height() // 2)
+
+		# Render at the center of the image.
+		types = self.type[:count]
+		frames = self.frame[:count]
+		blit_pos = self.pos[:count] - offset + self.image_offsets[types, frames]
+		surface.blits(zip(self.frame_images[types, frames].tolist(), blit_pos.tolist()), doreturn=False)
+
+
+class SparkSystem(EffectPool):
+	def __init__(self, capacity=MAX_SPARKS):
+		super().__init__(capacity)
+		self.pos = np.zeros((capacity, 2))
+		self.direction = np.zeros((capacity, 2))
+		self.corners = np.zeros((capacity, 4, 2))  # Directions from the center to each corner.
+		self.speed = np.zeros(capacity)
+		self.arrays = [self.pos, self.direction, self.corners, self.speed]
+
+
+	def spawn(self, pos, angle, speed):
+		index = self.allocate()
+		if index is None:
+			return
+		self.pos[index] = pos
+		self.direction[index] = (math.cos(angle), math.sin(angle))
+		self.corners[index] = [(math.cos(angle + corner_angle), math.sin(angle + corner_angle)) for corner_angle in SPARK_CORNER_ANGLES]
+		self.speed[index] = speed
+
+
+	# Sparks move in a straight line, slowing down until they stop, and disappear after being rendered stopped.
+	def update(self):
+		self.remove_expired()
+		count = self.count
+		self.pos[:count] += self.direction[:count] * self.speed[:count, None]
+		np.maximum(self.speed[:count] - 0.1, 0, out=self.speed[:count])
+		self.expired = self.speed[:count] == 0
+
+
+	# Returns the area drawn on, or None if nothing was.
+	def render(self, surface, offset=(0, 0)):
+		count = self.count
+		if not count:
+			return None
+
+		points = self.pos[:count, None] + self.corners[:count] * self.speed[:count, None, None] * SPARK_CORNER_LENGTHS - offset
+		rects = [pygame.draw.polygon(surface, (255, 255, 255), render_points) for render_points in points.tolist()]
+		return rects[0].unionall(rects)
@@ -0,0 +1,95 @@
+import pygame
+
+
+PRESENT_BACKENDS = ("scale", "scaled")
+# "scale" upscales game frames in software into a frame allocated once, "scaled" opens the window in SDL's SCALED
+# mode while a game runs and leaves the upscale to the renderer, falling back to "scale" where there is none.
+PRESENT_BACKEND = "scale"
+
+
+# Puts the game frames and the menus on the window.
+# Game frames are drawn at the displays' size and upscaled to the window's. Menus are drawn at the window's size
+# and redrawn every frame, but only the areas their widgets drew on are sent to the window.
+class Presenter:
+	def __init__(self, screen, backend=PRESENT_BACKEND):
+		if backend not in PRESENT_BACKENDS:
+			raise ValueError(f"Unknown presentation backend \"{backend}\", expected one of {PRESENT_BACKENDS}.")
+
+		self.screen = screen
+		self.backend = backend
+		self.window_size = screen.get_size()
+		self.scaled = False  # Whether the window is in SCALED mode right now.
+
+		self.frame = None  # Upscaled frames, allocated on first use.
+		self.direct = True  # Frames can be scaled straight onto the window, unless its pixel format differs.
+
+		self.menu = None  # The menu on the window, and the areas it drew on last frame.
+		self.menu_rects = []
+		self.full_update = True
+
+
+	# Called when a game starts running, with the size its frames are drawn at.
+	def enter_game(self, size):
+		if self.backend != "scaled" or self.scaled:
+			return
+
+		try:
+			pygame.display.set_mode(size, pygame.SCALED)
+			self.scaled = True
+		except pygame.error as e:
+			print(f"[PRESENTATION]: SCALED mode unavailable ({e}), scaling frames in software instead.")
+			self.backend = "scale"
+			pygame.display.set_mode(self.window_size)
+
+
+	def leave_game(self):
+		if self.scaled:
+			pygame.display.set_mode(self.window_size)
+			self.scaled = False
+		self.menu = None
+
+
+	# The offset moves the frame on the window, in window pixels.
+	def present(self, display, offset=(0, 0)):
+		self.menu = None
+		if self.scaled:
+			# The window's surface is the size of the display here.
+			scale = self.window_size[0] / display.get_width()
+			pygame.display.get_surface().blit(display, (offset[0] / scale, offset[1] / scale))
+		else:
+			self.scale_frame(display, offset)
+
+		pygame.display.update()
+
+
+	def scale_frame(self, display, offset):
+		# Blits truncate their position, a frame that isn't offset can go straight on the window.
+		if self.direct and int(offset[0]) == 0 and int(offset[1]) == 0:
+			try:
+				pygame.transform.scale(display, self.window_size, self.screen)
+				return
+			except ValueError:
+				self.direct = False
+
+		if self.frame is None:
+			self.frame = pygame.Surface(self.window_size, 0, display)
+		pygame.transform.scale(display, self.window_size, self.frame)
+		self.screen.blit(self.frame, offset)
+
+
+	# Send what a menu drew this frame, along with what it drew last frame in case that moved or shrank.
+	# Anything else having been on the window, or the whole screen having been drawn on, takes a full update.
+	def update_menu(self, menu, rects):
+		if menu is not self.menu or self.full_update:
+			pygame.display.update()
+		else:
+			pygame.display.update(self.menu_rects + rects)
+
+		self.menu = menu
+		self.menu_rects = rects
+		self.full_update = False
+
+
+	# The whole window was drawn on this frame, like by a fade.
+	def invalidate(self):
+		self.full_update = True
@@ -5,9 +5,12 @@ import time
 import os
 import pygame
 
+from scripts.ai_scheduler import ACTIVE
+
 
 FORMAT = "utf-8"
 DISCONNECT_MESSAGE = "!leave"
+MESSAGE_END = b"|"  # Ends every message of the game, the server and clients split the stream on it.
 MAX_CLIENT_COUNT = 4
 os.system("")  # Enable ANSI escape characters in terminal.
 
@@ -16,6 +19,19 @@ class ClientDisconnectException(Exception):
 	pass
 
 
+# Splits what's received from a socket back into messages. TCP doesn't keep the boundaries between sends,
+# a receive can stop in the middle of a message or hold several, so the unfinished one is kept for the next receive.
+class MessageBuffer:
+	def __init__(self):
+		self.pending = b""
+
+
+	def feed(self, data):
+		messages = (self.pending + data).split(MESSAGE_END)
+		self.pending = messages.pop()
+		return [message.decode(FORMAT) for message in messages]
+
+
 class ChatClient:
 	def __init__(self, ip="", port=5050, nickname="Default_Client"):
 		self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -122,6 +138,11 @@ class GameClient(ChatClient):
 		self.client_id = client_id  # Host, Client1, Client2,...
 		self.client_index = -1
 		self.game_started = False
+		self.messages = MessageBuffer()
+
+
+	def send_manually(self, message):
+		self.client_socket.sendall(f"{message}|".encode(FORMAT))
 
 
 	def disconnect(self):
@@ -131,7 +152,7 @@ class GameClient(ChatClient):
 				self.running = False
 				self.game_started = False
 				time.sleep(0.1)
-				self.client_socket.send(DISCONNECT_MESSAGE.encode(FORMAT))
+				self.client_socket.sendall(f"{DISCONNECT_MESSAGE}|".encode(FORMAT))
 				self.client_socket.close()
 			except (ConnectionError, ConnectionAbortedError, ConnectionRefusedError, ConnectionResetError):
 				print("[CLOSED]: Server has shutdown.")
@@ -153,61 +174,78 @@ class GameClient(ChatClient):
 						entity.jump()
 				
 				elif entity.type == "enemy" and sender_id == "host":
-					# [enemy_ID, walking, facing_left]
+					# [enemy_ID, walking, facing_left, pos[0], pos[1], tier]
+					# The host steps reduced enemies every few steps and sleeping ones not at all, they're away from
+					# every player, so they only follow its positions.
+					host_pos = [float(infos[3]), float(infos[4])]
+					if int(infos[5]) != ACTIVE:
+						entity.walking = int(infos[1])
+						entity.facing_left = infos[2] == "True"
+						entity.pos = host_pos
+						return
+
 					dead = entity.update(self.tilemap, walking=int(infos[1]), facing_left=infos[2] == "True")
+					entity.pos = host_pos
 					if dead:
 						self.entities.remove(entity)
 				return
 
 
+	def handle_message(self, message):
+		#print(f"RECEIVED: {message}")
+		if message == DISCONNECT_MESSAGE:
+			raise ClientDisconnectException()
+		elif message == "[NICKNAME]":
+			self.client_socket.send(self.nickname.encode(FORMAT))
+		elif message == "[CLIENT ID]":
+			self.client_socket.send(self.client_id.encode(FORMAT))
+		elif message == "[START GAME]":
+			self.game.start_game()
+		elif "PLAYER READY" in message:
+			self.game.ready_for_launch()
+		
+		elif "NEW PLAYERS JOINED" in message:
+			# [str(index), str(client_id), str(nicknames), str(client_ids)]
+			player_infos = message.split(":")[1].split(";")
+			index = int(player_infos[0])
+
+			if self.client_index == -1:
+				self.client_index = index
+				self.client_id = player_infos[1]
+
+			# [int(index), str(client_id), list(nicknames), list(client_ids)]
+			self.game.on_connection_made(index, player_infos[2].split(","), player_infos[3].split(","))
+			
+		elif "PLAYER LEFT" in message:
+			player_index = int(message.split(":")[1])
+			self.entities[player_index].unregister_client(player_index)
+
+		elif "RE_INITIALIZE" in message:
+			# [str(index), str(client_id), str(nicknames), str(client_ids)]
+			infos = message.split(":")[1].split(";")
+			index = int(infos[0])
+			self.client_index = index
+			self.client_id = infos[1]
+			self.game.on_connection_made(index, infos[2].split(","), infos[3].split(","), re_initialized=True)
+		
+		elif self.game_started:
+			message_segments = message.split(";")
+			sender_id = message_segments[0]
+			for segment in message_segments[1:]:
+				infos = segment.split(",")
+				self.update_entity(sender_id, infos)
+
+
 	def receive(self):
 		while self.running:
 			try:
-				message = self.client_socket.recv(1024).decode(FORMAT)
-				#print(f"RECEIVED: {message}")
-				message = message.split("|")[0]
-
-				if message == DISCONNECT_MESSAGE:
+				data = self.client_socket.recv(1024)
+				if not data:
 					raise ClientDisconnectException()
-				elif message == "[NICKNAME]":
-					self.client_socket.send(self.nickname.encode(FORMAT))
-				elif message == "[CLIENT ID]":
-					self.client_socket.send(self.client_id.encode(FORMAT))
-				elif message == "[START GAME]":
-					self.game.start_game()
-				elif "PLAYER READY" in message:
-					self.game.ready_for_launch()
-				
-				elif "NEW PLAYERS JOINED" in message:
-					# [str(index), str(client_id), str(nicknames), str(client_ids)]
-					player_infos = message.split(":")[1].split(";")
-					index = int(player_infos[0])
-
-					if self.client_index == -1:
-						self.client_index = index
-						self.client_id = player_infos[1]
 
-					# [int(index), str(client_id), list(nicknames), list(client_ids)]
-					self.game.on_connection_made(index, player_infos[2].split(","), player_infos[3].split(","))
-					
-				elif "PLAYER LEFT" in message:
-					player_index = int(message.split(":")[1])
-					self.entities[player_index].unregister_client(player_index)
-
-				elif "RE_INITIALIZE" in message:
-					# [str(index), str(client_id), str(nicknames), str(client_ids)]
-					infos = message.split(":")[1].split(";")
-					index = int(infos[0])
-					self.client_index = index
-					self.client_id = infos[1]
-					self.game.on_connection_made(index, infos[2].split(","), infos[3].split(","), re_initialized=True)
-				
-				elif self.game_started:
-					message_segments = message.split(";")
-					sender_id = message_segments[0]
-					for segment in message_segments[1:]:
-						infos = segment.split(",")
-						self.update_entity(sender_id, infos)
+				# Messages longer than a receive, like the host's with many enemies, are put back together first.
+				for message in self.messages.feed(data):
+					self.handle_message(message)
 
 				self.clock.tick(self.fps)
 		
@@ -242,15 +280,17 @@ class GameClient(ChatClient):
 
 					if self.client_id == "host":
 						for entity in self.entities[4:]:
-							# [enemy_ID, walking, facing_left]
-							message.append(f"{entity.id},{entity.walking},{entity.facing_left}")
+							# [enemy_ID, walking, facing_left, pos[0], pos[1], tier]
+							message.append(f"{entity.id},{entity.walking},{entity.facing_left}," +
+											f"{entity.pos[0]:.1f},{entity.pos[1]:.1f}," +
+											f"{self.game.ai_scheduler.tier(entity)}")
 							if entity.is_dead:
 								self.entities.remove(entity)
 
 					# Add a delimeter between each message to avoid duplication.
 					message = f"{';'.join(message)}|"
 					#print(f"SENT: {message}")
-					self.client_socket.send(message.encode(FORMAT))
+					self.client_socket.sendall(message.encode(FORMAT))
 
 				self.clock.tick(self.fps)
 
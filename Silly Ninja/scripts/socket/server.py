@@ -3,7 +3,7 @@ import socket
 import time
 
 from datetime import datetime
-from scripts.socket.client import ClientDisconnectException, MAX_CLIENT_COUNT
+from scripts.socket.client import ClientDisconnectException, MessageBuffer, MAX_CLIENT_COUNT
 
 FORMAT = "utf-8"
 DISCONNECT_MESSAGE = "!leave"
@@ -130,7 +130,7 @@ class GameServer(SocketServer):
 		
 		# Close all connections to clients.
 		for client_id in self.clients:
-			self.clients[client_id].send(DISCONNECT_MESSAGE.encode(FORMAT))
+			self.clients[client_id].send(f"{DISCONNECT_MESSAGE}|".encode(FORMAT))
 			self.clients[client_id].close()
 
 		self.clients.clear()
@@ -148,7 +148,7 @@ class GameServer(SocketServer):
 
 		for client_id in self.clients:
 			if client_id != sender_id or sendall:
-				self.clients[client_id].send(message.encode(FORMAT))
+				self.clients[client_id].sendall(message.encode(FORMAT))
 
 
 	def remove_client(self, address, removed_id, removed_index):
@@ -183,16 +183,20 @@ class GameServer(SocketServer):
 
 
 	def handle_client(self, client, address):
+		messages = MessageBuffer()
 		while self.running:
 			try:
-				message = client.recv(1024).decode(FORMAT)
+				data = client.recv(1024)
 				client_index = self.client_sockets.index(client)
 				client_id = self.client_ids[client_index]
-
-				if message == DISCONNECT_MESSAGE:
+				if not data:
 					raise ClientDisconnectException("Client disconnected.")
-				else:
-					self.broadcast(client_id, message)
+
+				# Relay whole messages only, the asterisk of one sent to everyone has to come first.
+				for message in messages.feed(data):
+					if message == DISCONNECT_MESSAGE:
+						raise ClientDisconnectException("Client disconnected.")
+					self.broadcast(client_id, f"{message}|")
 			except Exception:
 				if not self.is_shutdown:
 					self.remove_client(address, client_id, client_index)
@@ -203,12 +207,12 @@ class GameServer(SocketServer):
 		print(f"[NEW CONNECTION INBOUND - {time: %B %d, %Y - %H:%M:%S}]: {address} connected.")
 
 		# Send a keyword that asks the client to send their nickname and id.
-		client.send("[NICKNAME]".encode(FORMAT))
+		client.send("[NICKNAME]|".encode(FORMAT))
 		nickname = client.recv(1024).decode(FORMAT)
 		self.nicknames.append(nickname)
 		print(self.nicknames)
 
-		client.send("[CLIENT ID]".encode(FORMAT))
+		client.send("[CLIENT ID]|".encode(FORMAT))
 		client_id = client.recv(1024).decode(FORMAT)
 
 		if client_id == "client_unverified":
@@ -249,9 +253,9 @@ class GameServer(SocketServer):
 					self.accept_client(client, address, now)
 				else:
 					client.send(("[JOIN FAILED]: Connected successfully but the maximum number of clients has been reached. " +
-								"Hence CAN NOT join the game.").encode(FORMAT))
+								"Hence CAN NOT join the game.|").encode(FORMAT))
 					time.sleep(1)
-					client.send(DISCONNECT_MESSAGE.encode(FORMAT))
+					client.send(f"{DISCONNECT_MESSAGE}|".encode(FORMAT))
 					client.close()
 			except Exception:
 				print("[SHUTDOWN]: Server shutdown successfully.")
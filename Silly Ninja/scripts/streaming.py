@@ -0,0 +1,257 @@
+import json
+import os
+import queue
+import sys
+import threading
+
+from collections import OrderedDict
+from scripts.map_format import BinaryMap, write_binary, source_digest, BINARY_EXTENSION, REGIONS_EXTENSION
+from scripts.tilemap import Tile
+
+
+MANIFEST_NAME = "level.json"
+DEFAULT_REGION_SIZE = 32  # Width and height of a region, in tiles.
+MAX_LOADED_REGIONS = 24  # Memory budget, least recently used regions beyond this are evicted.
+PINNED_UPDATES = 120  # Regions physics queried within this many updates are only evicted once nothing else is left to.
+PREFETCH_TILES = 8  # Regions this close to a physics query are loaded in the background, before the query reaches them.
+
+# Tiles the game extracts on level load. Copies of them are kept in the manifest,
+# so extracting doesn't have to read every region of the level.
+MARKER_PAIRS = {("spawners", 0), ("spawners", 1), ("large_decor", 2)}
+
+
+def region_file_name(region_loc):
+	return f"{region_loc[0]}_{region_loc[1]}{BINARY_EXTENSION}"
+
+
+# Streams a level split into region files in and out around the camera.
+# Region files are read and decoded on a worker thread, then applied to the tilemap on the thread that
+# renders or queries it. Queries that touch a region which isn't loaded yet load it on the spot.
+# Every change to the tilemap happens under the lock, which rendering holds too, since physics queries also run
+# on the client's socket thread. The game updates the streamer every simulation step, with or without rendering.
+class RegionStreamer:
+	def __init__(self, tilemap, folder, max_regions=MAX_LOADED_REGIONS):
+		self.tilemap = tilemap
+		self.folder = folder
+		self.max_regions = max_regions
+
+		f = open(os.path.join(folder, MANIFEST_NAME), 'r')
+		manifest = json.load(f)
+		f.close()
+
+		self.tile_size = manifest["tile_size"]
+		self.region_size = manifest["region_size"]
+		self.region_pixels = self.region_size * self.tile_size
+		self.available = {tuple(region_loc) for region_loc in manifest["regions"]}
+		self.markers = manifest["markers"]
+
+		self.loaded = OrderedDict()  # Region location -> (grid locations, offgrid tiles), least recently used first.
+		self.pending = set()
+		self.removed = set()  # Extracted tiles, which must stay out when their region loads again.
+		self.pinned = {}  # Region location -> the last update a physics query needed it on.
+		self.updates = 0
+		self.lock = threading.RLock()
+
+		self.requests = queue.Queue()
+		self.results = queue.Queue()
+		self.running = True
+		threading.Thread(target=self.work, name="RegionStreamer", daemon=True).start()
+
+		# Entities start at the spawners, load their regions with the level rather than on the first step.
+		for marker in self.markers:
+			if marker["type"] == "spawners":
+				tile_x = int(marker["pos"][0] // self.tile_size)
+				tile_y = int(marker["pos"][1] // self.tile_size)
+				self.require(tile_x - 1, tile_y - 1, tile_x + 1, tile_y + 1)
+
+
+	def stop(self):
+		self.running = False
+		self.requests.put(None)
+
+
+	def work(self):
+		while self.running:
+			region_loc = self.requests.get()
+			if region_loc is None:
+				break
+			self.results.put((region_loc, self.read_region(region_loc)))
+
+
+	def read_region(self, region_loc):
+		with BinaryMap(os.path.join(self.folder, region_file_name(region_loc))) as region:
+			return list(region.grid_tiles()), list(region.offgrid_tiles())
+
+
+	# Make sure every region overlapping the block of grid locations is loaded, used by physics queries.
+	# The regions are pinned for a while and the ones a few tiles around them loaded in the background, so entities
+	# moving around off screen find their regions already loaded instead of reading them again every step.
+	def require(self, left, top, right, bottom):
+		with self.lock:
+			for region_x in range((left - PREFETCH_TILES) // self.region_size, (right + PREFETCH_TILES) // self.region_size + 1):
+				for region_y in range((top - PREFETCH_TILES) // self.region_size, (bottom + PREFETCH_TILES) // self.region_size + 1):
+					self.prefetch((region_x, region_y))
+
+			for region_x in range(left // self.region_size, right // self.region_size + 1):
+				for region_y in range(top // self.region_size, bottom // self.region_size + 1):
+					region_loc = (region_x, region_y)
+					self.pinned[region_loc] = self.updates
+					if region_loc in self.loaded:
+						self.loaded.move_to_end(region_loc)
+					elif region_loc in self.available:
+						self.apply_results()
+						if region_loc not in self.loaded:
+							self.apply_region(region_loc, self.read_region(region_loc))
+
+
+	def prefetch(self, region_loc):
+		if region_loc not in self.loaded and region_loc not in self.pending and region_loc in self.available:
+			self.pending.add(region_loc)
+			self.requests.put(region_loc)
+
+
+	# Apply the regions the worker thread has read so far.
+	def apply_results(self):
+		while not self.results.empty():
+			region_loc, region_data = self.results.get()
+			self.pending.discard(region_loc)
+			if region_loc not in self.loaded:
+				self.apply_region(region_loc, region_data)
+
+
+	# Called every simulation step with the camera rect in pixels.
+	def update(self, view_rect):
+		with self.lock:
+			self.updates += 1
+			self.apply_results()
+
+			# Regions on screen are needed right away, the ring around them is prefetched in the background.
+			visible = self.regions_in(view_rect.left, view_rect.top, view_rect.right - 1, view_rect.bottom - 1)
+			margin = self.region_pixels
+			wanted = self.regions_in(view_rect.left - margin, view_rect.top - margin,
+									view_rect.right - 1 + margin, view_rect.bottom - 1 + margin)
+
+			for region_loc in wanted:
+				if region_loc in self.loaded:
+					self.loaded.move_to_end(region_loc)
+				elif region_loc in visible:
+					self.apply_region(region_loc, self.read_region(region_loc))
+				else:
+					self.prefetch(region_loc)
+
+			for region_loc, update in list(self.pinned.items()):
+				if self.updates - update > PINNED_UPDATES:
+					del self.pinned[region_loc]
+
+			# The budget holds, only the regions around the camera are never evicted. Least recently used ones go
+			# first, then the ones physics needed least recently.
+			if len(self.loaded) > self.max_regions:
+				evictable = [region_loc for region_loc in self.loaded if region_loc not in wanted]
+				evictable.sort(key=lambda region_loc: self.pinned.get(region_loc, -1))
+				for region_loc in evictable[:len(self.loaded) - self.max_regions]:
+					self.unload_region(region_loc)
+
+
+	def regions_in(self, left, top, right, bottom):
+		return {(region_x, region_y)
+				for region_x in range(int(left // self.region_pixels), int(right // self.region_pixels) + 1)
+				for region_y in range(int(top // self.region_pixels), int(bottom // self.region_pixels) + 1)
+				if (region_x, region_y) in self.available}
+
+
+	def apply_region(self, region_loc, region_data):
+		grid_tiles, offgrid_tiles = region_data
+		grid_locs = []
+		offgrid = []
+
+		for tile_loc, t_type, variant in grid_tiles:
+			if (t_type, variant, tile_loc) not in self.removed:
+				self.tilemap.set_tile(tile_loc, Tile(t_type, variant, tile_loc))
+				grid_locs.append(tile_loc)
+
+		for pos, t_type, variant in offgrid_tiles:
+			if (t_type, variant, pos) not in self.removed:
+				tile = Tile(t_type, variant, pos)
+				self.tilemap.add_offgrid(tile)
+				offgrid.append(tile)
+
+		self.loaded[region_loc] = (grid_locs, offgrid)
+
+
+	def unload_region(self, region_loc):
+		grid_locs, offgrid = self.loaded.pop(region_loc)
+		for tile_loc in grid_locs:
+			self.tilemap.remove_tile(tile_loc)
+		for tile in offgrid:
+			if tile in self.tilemap.offgrid_tiles:
+				self.tilemap.remove_offgrid(tile)
+
+
+	# Extract from the manifest markers instead of the tilemap, which only holds the loaded regions.
+	def extract(self, id_pairs, keep=False):
+		id_pairs = {tuple(id_pair) for id_pair in id_pairs}
+		matches = []
+		with self.lock:
+			for marker in self.markers.copy():
+				if (marker["type"], marker["variant"]) not in id_pairs:
+					continue
+
+				matches.append(Tile(marker["type"], marker["variant"], list(marker["pos"])))
+				if keep:
+					continue
+
+				self.markers.remove(marker)
+				if marker["on_grid"]:
+					tile_loc = (int(marker["pos"][0] // self.tile_size), int(marker["pos"][1] // self.tile_size))
+					self.removed.add((marker["type"], marker["variant"], tile_loc))
+					self.tilemap.remove_tile(tile_loc)
+				else:
+					self.removed.add((marker["type"], marker["variant"], tuple(marker["pos"])))
+					for tile in list(self.tilemap.offgrid_index.get((marker["type"], marker["variant"]), ())):
+						if tuple(tile.pos) == tuple(marker["pos"]):
+							self.tilemap.remove_offgrid(tile)
+
+		return matches
+
+
+# Split a JSON map into a folder of region files: python -m scripts.streaming [json path] [region size]
+def split_level(json_path, region_size=DEFAULT_REGION_SIZE):
+	f = open(json_path, 'r')
+	map_data = json.load(f)
+	f.close()
+
+	tile_size = map_data["tile_size"]
+	regions = {}
+	markers = []
+
+	for tile in map_data["tilemap"].values():
+		tile_loc = tuple(tile["pos"])
+		region_loc = (tile_loc[0] // region_size, tile_loc[1] // region_size)
+		regions.setdefault(region_loc, ([], []))[0].append((tile_loc, tile["type"], tile["variant"]))
+		if (tile["type"], tile["variant"]) in MARKER_PAIRS:
+			markers.append({"type": tile["type"], "variant": tile["variant"], "on_grid": True,
+							"pos": [tile_loc[0] * tile_size, tile_loc[1] * tile_size]})
+
+	for tile in map_data["offgrid_tiles"]:
+		pos = tuple(tile["pos"])
+		region_loc = (int(pos[0] // (region_size * tile_size)), int(pos[1] // (region_size * tile_size)))
+		regions.setdefault(region_loc, ([], []))[1].append((pos, tile["type"], tile["variant"]))
+		if (tile["type"], tile["variant"]) in MARKER_PAIRS:
+			markers.append({"type": tile["type"], "variant": tile["variant"], "on_grid": False, "pos": list(pos)})
+
+	folder = os.path.splitext(json_path)[0] + REGIONS_EXTENSION
+	os.makedirs(folder, exist_ok=True)
+	for region_loc, (grid_tiles, offgrid_tiles) in regions.items():
+		write_binary(os.path.join(folder, region_file_name(region_loc)), tile_size, grid_tiles, offgrid_tiles)
+
+	f = open(os.path.join(folder, MANIFEST_NAME), 'w')
+	json.dump({"tile_size": tile_size, "region_size": region_size, "source": source_digest(json_path).hex(),
+			"regions": [list(region_loc) for region_loc in regions], "markers": markers}, f)
+	f.close()
+
+	return folder
+
+
+if __name__ == "__main__":
+	folder = split_level(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_REGION_SIZE)
+	print(f"Map SPLIT into regions at: {folder}")
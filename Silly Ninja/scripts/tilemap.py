@@ -1,8 +1,17 @@
 import pygame
 import json
+import math
+import sys
 
+from scripts.autotile import autotile_all, autotile_around, build_variant_table
+from scripts.map_format import BinaryMap, BINARY_EXTENSION, REGIONS_EXTENSION, write_binary
 
+
+# Tiles are created by the thousands per level, so they're slotted. Loaded grid tiles share their location tuple
+# with the map key and all tiles of a type share one interned type name, instead of each keeping its own copies.
 class Tile:
+	__slots__ = ("type", "variant", "pos")
+
 	def __init__(self, t_type, variant, pos):
 		self.type = t_type
 		self.variant = variant
@@ -35,20 +44,53 @@ RULETILE_MAP = {
 	tuple(sorted([(1, 0), (0, -1), (0, 1)])): 7,
 	tuple(sorted([(1, 0), (-1, 0), (0, 1), (0, -1)])): 8
 }
+RULETILE_VARIANTS = build_variant_table(RULETILE_MAP)
+
+
+# Neighboring grid offsets in the same column-major order the tiles were always checked in.
+NEIGHBOR_OFFSETS = tuple((x, y) for x in range(-1, 2) for y in range(-1, 2))
+CHUNK_SIZE = 16  # Width and height of a baked chunk, in tiles.
+BUCKET_SIZE = 4  # Width and height of an offgrid index bucket, in tiles.
+
+
+# Grid locations are stored as (x, y) tuples, but map files keep the "x;y" string keys.
+def key_to_loc(tile_key):
+	x, y = tile_key.split(";")
+	return (int(x), int(y))
+
+
+def loc_to_key(tile_loc):
+	return "{0};{1}".format(tile_loc[0], tile_loc[1])
 
 
 class Tilemap:
 	def __init__(self, game, tile_size=16):
 		self.game = game
 		self.tile_size = tile_size
-		self.map = {}  # Tiles which the player can physically collide with.
-		self.offgrid_tiles = []  # Background tiles, decorations.
+		self.map = {}  # Tiles which the player can physically collide with, keyed by (x, y) grid locations.
+		self.offgrid_tiles = {}  # Background tiles, decorations. Values are their placement order.
+		self.offgrid_buckets = {}  # Spatial index of the offgrid tiles, keyed by (x, y) bucket locations.
+		self.offgrid_count = 0
+		self.chunks = {}  # Baked surfaces of the static tile layer, keyed by (x, y) chunk locations.
+		self.solid_rects = {}  # Collision rects of the physics tiles, keyed by (x, y) grid locations.
+		self.neighbor_rects = {}  # Cached tuples of the solid rects around each queried grid location.
+		self.solid_version = 0  # Bumped whenever the solid rects change, so copies of them elsewhere know to refresh.
+		self.grid_index = {}  # Grid locations of each (type, variant) pair, in placement order.
+		self.offgrid_index = {}  # Offgrid tiles of each (type, variant) pair.
+		self.streamer = None  # Streams regions in and out, for levels split into region files.
 
 
 	def save(self, path):
+		if path.endswith(BINARY_EXTENSION):
+			write_binary(path, self.tile_size,
+						((tile_loc, tile.type, tile.variant) for tile_loc, tile in self.map.items()),
+						((tile.pos, tile.type, tile.variant) for tile in self.offgrid_tiles))
+			print("Map SAVED at: " + path)
+			return
+
 		f = open(path, 'w')
 		out = {
-			"tilemap": {tile_loc: self.map[tile_loc].__dict__() for tile_loc in self.map},
+			"tilemap": {loc_to_key(tile_loc): self.map[tile_loc].__dict__() for tile_loc in self.map},
 			"tile_size": self.tile_size,
 			"offgrid_tiles": [tile.__dict__() for tile in self.offgrid_tiles]
 		}
@@ -57,104 +99,430 @@ class Tilemap:
 		print("Map SAVED at: " + path)
 
 
+	def clear(self):
+		if self.streamer is not None:
+			self.streamer.stop()
+			self.streamer = None
+
+		self.solid_version += 1
+		self.map.clear()
+		self.offgrid_tiles.clear()
+		self.offgrid_buckets.clear()
+		self.chunks.clear()
+		self.solid_rects.clear()
+		self.neighbor_rects.clear()
+		self.grid_index.clear()
+		self.offgrid_index.clear()
+
+
+	# Take over everything another tilemap has loaded and baked, to swap in a level prepared on another thread.
+	# The other tilemap must not be used afterwards.
+	def adopt(self, other):
+		if self.streamer is not None:
+			self.streamer.stop()
+
+		self.tile_size = other.tile_size
+		self.map = other.map
+		self.offgrid_tiles = other.offgrid_tiles
+		self.offgrid_buckets = other.offgrid_buckets
+		self.offgrid_count = other.offgrid_count
+		self.chunks = other.chunks
+		self.solid_rects = other.solid_rects
+		self.neighbor_rects = other.neighbor_rects
+		self.solid_version += 1
+		self.grid_index = other.grid_index
+		self.offgrid_index = other.offgrid_index
+		self.streamer = other.streamer
+		if self.streamer is not None:
+			self.streamer.tilemap = self
+
+
+	# A copy of the loaded level with its own containers, so either can gain or lose tiles without affecting the other.
+	# Tiles, collision rects and baked chunks are shared, so neither may be rule tiled. Streamed levels can't be copied.
+	def snapshot(self):
+		copy = Tilemap(self.game, self.tile_size)
+		copy.map = self.map.copy()
+		copy.offgrid_tiles = self.offgrid_tiles.copy()
+		copy.offgrid_buckets = {bucket_loc: bucket.copy() for bucket_loc, bucket in self.offgrid_buckets.items()}
+		copy.offgrid_count = self.offgrid_count
+		copy.chunks = self.chunks.copy()
+		copy.solid_rects = self.solid_rects.copy()
+		copy.neighbor_rects = self.neighbor_rects.copy()
+		copy.grid_index = {id_pair: locs.copy() for id_pair, locs in self.grid_index.items()}
+		copy.offgrid_index = {id_pair: tiles.copy() for id_pair, tiles in self.offgrid_index.items()}
+		return copy
+
+
 	def load(self, path):
+		if path.endswith(BINARY_EXTENSION):
+			self.load_binary(path)
+			return
+		if path.endswith(REGIONS_EXTENSION):
+			self.load_regions(path)
+			return
+
 		f = open(path, 'r')
 		map_data = json.load(f)
 		f.close()
 
-		self.map.clear()
-		self.offgrid_tiles.clear()
-
+		self.clear()
 		self.tile_size = map_data["tile_size"]
 
-		for tile_loc in map_data["tilemap"]:
-			tile_values = map_data["tilemap"][tile_loc]
-			self.map[tile_loc] = Tile(tile_values["type"], tile_values["variant"], tile_values["pos"])
+		for tile_key in map_data["tilemap"]:
+			tile_values = map_data["tilemap"][tile_key]
+			tile_loc = key_to_loc(tile_key)
+			self.map[tile_loc] = Tile(sys.intern(tile_values["type"]), tile_values["variant"], tile_loc)
 
 		for offgrid_tile in map_data["offgrid_tiles"]:
-			self.offgrid_tiles.append(Tile(offgrid_tile["type"], offgrid_tile["variant"], offgrid_tile["pos"]))
+			self.add_offgrid(Tile(sys.intern(offgrid_tile["type"]), offgrid_tile["variant"], tuple(offgrid_tile["pos"])))
+
+		self.build_grid_indexes()
+
+
+	# Every tile is decoded up front, on purpose. Spawners are extracted and chunks baked right after loading, and
+	# collisions and rule tiling need the whole grid, so decoding lazily would only move the same work into play.
+	# The memory mapping still spares the JSON parse and its dict tree. Levels too big for that are split into
+	# regions, which are decoded lazily as they're streamed in.
+	def load_binary(self, path):
+		with BinaryMap(path) as map_data:
+			self.clear()
+			self.tile_size = map_data.tile_size
+
+			for tile_loc, t_type, variant in map_data.grid_tiles():
+				self.map[tile_loc] = Tile(t_type, variant, tile_loc)
+
+			for pos, t_type, variant in map_data.offgrid_tiles():
+				self.add_offgrid(Tile(t_type, variant, pos))
+
+		self.build_grid_indexes()
+
+
+	# Regions are loaded later, as the camera or physics queries get near them.
+	def load_regions(self, path):
+		from scripts.streaming import RegionStreamer
+
+		self.clear()
+		self.streamer = RegionStreamer(self, path)
+		self.tile_size = self.streamer.tile_size
+
+
+	def set_tile(self, tile_loc, tile):
+		current = self.map.get(tile_loc)
+		if current is not None and current.type == tile.type and current.variant == tile.variant:
+			return
+
+		if current is not None:
+			self.unindex_tile(tile_loc, current)
+		self.map[tile_loc] = tile
+		self.grid_index.setdefault((tile.type, tile.variant), {})[tile_loc] = None
+		self.update_solid_rect(tile_loc)
+		self.invalidate_tile(tile, (tile_loc[0] * self.tile_size, tile_loc[1] * self.tile_size))
+
+
+	def remove_tile(self, tile_loc):
+		tile = self.map.pop(tile_loc, None)
+		if tile is not None:
+			self.unindex_tile(tile_loc, tile)
+			self.update_solid_rect(tile_loc)
+			self.invalidate_tile(tile, (tile_loc[0] * self.tile_size, tile_loc[1] * self.tile_size))
+
+
+	# Tiles put straight into the map were never indexed, there's nothing to remove for them.
+	def unindex_tile(self, tile_loc, tile):
+		locs = self.grid_index.get((tile.type, tile.variant))
+		if locs is None or tile_loc not in locs:
+			return
+
+		del locs[tile_loc]
+		if not locs:
+			del self.grid_index[(tile.type, tile.variant)]
+
+
+	def add_offgrid(self, tile):
+		self.offgrid_tiles[tile] = self.offgrid_count
+		self.offgrid_index.setdefault((tile.type, tile.variant), {})[tile] = None
+		self.offgrid_count += 1
+
+		tile_rect = pygame.Rect(tile.pos, self.tile_image_size(tile))
+		for bucket_loc in self.bucket_range(tile_rect):
+			self.offgrid_buckets.setdefault(bucket_loc, {})[tile] = tile_rect
+		self.invalidate_tile(tile, tile.pos)
 
 
+	def remove_offgrid(self, tile):
+		del self.offgrid_tiles[tile]
+		tiles = self.offgrid_index[(tile.type, tile.variant)]
+		del tiles[tile]
+		if not tiles:
+			del self.offgrid_index[(tile.type, tile.variant)]
+
+		tile_rect = pygame.Rect(tile.pos, self.tile_image_size(tile))
+		for bucket_loc in self.bucket_range(tile_rect):
+			bucket = self.offgrid_buckets[bucket_loc]
+			del bucket[tile]
+			if not bucket:
+				del self.offgrid_buckets[bucket_loc]
+		self.invalidate_tile(tile, tile.pos)
+
+
+	def bucket_range(self, rect):
+		bucket_pixels = self.tile_size * BUCKET_SIZE
+		for x in range(rect.left // bucket_pixels, (rect.right - 1) // bucket_pixels + 1):
+			for y in range(rect.top // bucket_pixels, (rect.bottom - 1) // bucket_pixels + 1):
+				yield (x, y)
+
+
+	# Returns the offgrid tiles intersecting a pixel rect, in the order they were placed.
+	def offgrid_in_rect(self, rect):
+		found = {}
+		for bucket_loc in self.bucket_range(rect):
+			bucket = self.offgrid_buckets.get(bucket_loc)
+			if bucket is None:
+				continue
+			for tile, tile_rect in bucket.items():
+				if tile not in found and rect.colliderect(tile_rect):
+					found[tile] = self.offgrid_tiles[tile]
+
+		return sorted(found, key=found.get)
+
+
+	# Returns copies of the tiles of the given (type, variant) pairs, with positions in pixels.
 	def extract(self, id_pairs, keep=False):
-		matches = []
-		for tile in self.offgrid_tiles.copy():
-			if (tile.type, tile.variant) in id_pairs:
-				matches.append(tile.copy())
-				if not keep:
-					self.offgrid_tiles.remove(tile)
+		if self.streamer is not None:
+			return self.streamer.extract(id_pairs, keep=keep)
 
-		for tile_loc in self.map:
-			tile = self.map[tile_loc]
-			if (tile.type, tile.variant) in id_pairs:
-				matches.append(tile.copy())
-				matches[-1].pos = matches[-1].pos.copy()
-				mathces[-1].pos[0] *= self.tile_size
-				mathces[-1].pos[1] *= self.tile_size
+		matches = []
+		offgrid_matches = []
+		for id_pair in id_pairs:
+			offgrid_matches.extend(self.offgrid_index.get(tuple(id_pair), ()))
+
+		for tile in sorted(offgrid_matches, key=self.offgrid_tiles.get):
+			matches.append(tile.copy())
+			if not keep:
+				self.remove_offgrid(tile)
+
+		for id_pair in id_pairs:
+			for tile_loc in list(self.grid_index.get(tuple(id_pair), ())):
+				matches.append(self.map[tile_loc].copy())
+				matches[-1].pos = [tile_loc[0] * self.tile_size, tile_loc[1] * self.tile_size]
 				if not keep:
-					del self.map[tile_loc]
+					self.remove_tile(tile_loc)
 
 		return matches
 
 
 	def solid_check(self, pos):
-		tile_loc = "{0};{1}".format(int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
-		return tile_loc in self.map and self.map[tile_loc].type in PHYSICS_TILES
+		tile_loc = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+		if self.streamer is not None:
+			self.streamer.require(tile_loc[0], tile_loc[1], tile_loc[0], tile_loc[1])
+		return tile_loc in self.solid_rects
+
+
+	# Walks the grid cells along a ray, in the order it crosses them. Returns ((x, y) of the first solid cell, distance in pixels
+	# to where the ray enters it), or None if nothing solid is within max_distance. A ray starting inside a solid cell hits at 0.
+	def raycast(self, origin, direction, max_distance):
+		length = math.hypot(direction[0], direction[1])
+		if length == 0:
+			return None
+		dir_x = direction[0] / length
+		dir_y = direction[1] / length
+
+		tile_x = int(origin[0] // self.tile_size)
+		tile_y = int(origin[1] // self.tile_size)
+		if self.streamer is not None:
+			end_x = int((origin[0] + dir_x * max_distance) // self.tile_size)
+			end_y = int((origin[1] + dir_y * max_distance) // self.tile_size)
+			self.streamer.require(min(tile_x, end_x), min(tile_y, end_y), max(tile_x, end_x), max(tile_y, end_y))
+
+		# Distances along the ray to the next vertical and horizontal cell borders, and between two borders.
+		step_x = 1 if dir_x > 0 else -1
+		step_y = 1 if dir_y > 0 else -1
+		next_x = ((tile_x + (dir_x > 0)) * self.tile_size - origin[0]) / dir_x if dir_x else math.inf
+		next_y = ((tile_y + (dir_y > 0)) * self.tile_size - origin[1]) / dir_y if dir_y else math.inf
+		delta_x = self.tile_size / abs(dir_x) if dir_x else math.inf
+		delta_y = self.tile_size / abs(dir_y) if dir_y else math.inf
+
+		distance = 0
+		while distance <= max_distance:
+			if (tile_x, tile_y) in self.solid_rects:
+				return (tile_x, tile_y), distance
+			if next_x < next_y:
+				distance = next_x
+				next_x += delta_x
+				tile_x += step_x
+			else:
+				distance = next_y
+				next_y += delta_y
+				tile_y += step_y
+
+		return None
+
+
+	def line_of_sight(self, start, end):
+		return self.raycast(start, (end[0] - start[0], end[1] - start[1]), math.dist(start, end)) is None
 
 
 	def neighbor_tiles(self, pos):
 		# Convert back to grid position.
-		tile_loc = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+		tile_x = int(pos[0] // self.tile_size)
+		tile_y = int(pos[1] // self.tile_size)
 		neighbors = []
+		if self.streamer is not None:
+			self.streamer.require(tile_x - 1, tile_y - 1, tile_x + 1, tile_y + 1)
 
-		for x in range(-1, 2):
-			for y in range(-1, 2):
-				check_loc = "{0};{1}".format(tile_loc[0] + x, tile_loc[1] + y)
-				if check_loc in self.map:
-					neighbors.append(self.map[check_loc])
+		for x, y in NEIGHBOR_OFFSETS:
+			tile = self.map.get((tile_x + x, tile_y + y))
+			if tile is not None:
+				neighbors.append(tile)
 
 		return neighbors
 
 
+	# Returns a cached tuple of the solid rects around a position, these rects must not be modified.
 	def physics_neighbor_rects(self, pos):
-		rects = []
-		for tile in self.neighbor_tiles(pos):
-			if tile.type in PHYSICS_TILES:
-				rect = pygame.Rect(tile.pos[0] * self.tile_size, tile.pos[1] * self.tile_size,
-									self.tile_size, self.tile_size)
-				rects.append(rect)
+		tile_loc = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+		if self.streamer is not None:
+			self.streamer.require(tile_loc[0] - 1, tile_loc[1] - 1, tile_loc[0] + 1, tile_loc[1] + 1)
+		rects = self.neighbor_rects.get(tile_loc)
+		if rects is None:
+			rects = tuple(self.solid_rects[(tile_loc[0] + x, tile_loc[1] + y)] for x, y in NEIGHBOR_OFFSETS
+						if (tile_loc[0] + x, tile_loc[1] + y) in self.solid_rects)
+			self.neighbor_rects[tile_loc] = rects
 
 		return rects
 
 
-	# Rule tiles algorithm
-	def ruletile(self):
-		for tile_loc in self.map:
+	# Collision rects store and typed index of the grid.
+	def build_grid_indexes(self):
+		self.solid_version += 1
+		self.solid_rects.clear()
+		self.neighbor_rects.clear()
+		self.grid_index.clear()
+		for tile_loc, tile in self.map.items():
+			self.grid_index.setdefault((tile.type, tile.variant), {})[tile_loc] = None
+			if tile.type in PHYSICS_TILES:
+				self.solid_rects[tile_loc] = pygame.Rect(tile_loc[0] * self.tile_size, tile_loc[1] * self.tile_size,
+														self.tile_size, self.tile_size)
+
+
+	def update_solid_rect(self, tile_loc):
+		tile = self.map.get(tile_loc)
+		if tile is not None and tile.type in PHYSICS_TILES:
+			if tile_loc in self.solid_rects:
+				return
+			self.solid_rects[tile_loc] = pygame.Rect(tile_loc[0] * self.tile_size, tile_loc[1] * self.tile_size,
+													self.tile_size, self.tile_size)
+		elif self.solid_rects.pop(tile_loc, None) is None:
+			return
+
+		self.solid_version += 1
+		# Drop the cached neighborhoods that include this location.
+		for x, y in NEIGHBOR_OFFSETS:
+			self.neighbor_rects.pop((tile_loc[0] + x, tile_loc[1] + y), None)
+
+
+	# Rule tiles algorithm, over the whole map or incrementally around the given grid locations.
+	def ruletile(self, tile_locs=None):
+		if tile_locs is None:
+			updates = autotile_all(self.map, RULETILE_TYPES, RULETILE_VARIANTS)
+		else:
+			updates = autotile_around(self.map, tile_locs, RULETILE_TYPES, RULETILE_VARIANTS)
+
+		for tile_loc, variant in updates.items():
 			tile = self.map[tile_loc]
-			neighbors = set()
-			for shift in [(1, 0), (-1, 0), (0, -1), (0, 1)]:
-				check_loc = "{0};{1}".format(tile.pos[0] + shift[0], tile.pos[1] + shift[1])
-				if check_loc in self.map and self.map[check_loc].type == tile.type:
-					neighbors.add(shift)
+			self.unindex_tile(tile_loc, tile)
+			tile.variant = variant
+			self.grid_index.setdefault((tile.type, tile.variant), {})[tile_loc] = None
 
-			neighbors = tuple(sorted(neighbors))
-			if tile.type in RULETILE_TYPES and neighbors in RULETILE_MAP:
-				tile.variant = RULETILE_MAP[neighbors]
+		# A full pass can touch tiles anywhere, so rebake everything rather than tracking each chunk.
+		if tile_locs is None:
+			self.chunks.clear()
+		else:
+			for tile_loc in updates:
+				self.invalidate_tile(self.map[tile_loc], (tile_loc[0] * self.tile_size, tile_loc[1] * self.tile_size))
 
 
+	# Static layer baking.
+	def tile_image_size(self, tile):
+		images = self.game.assets.get(tile.type) if self.game is not None else None
+		return images[tile.variant].get_size() if images else (self.tile_size, self.tile_size)
 
-	def render(self, surface, offset=(0, 0)):
+
+	def invalidate_tile(self, tile, pixel_pos):
+		width, height = self.tile_image_size(tile)
+		chunk_pixels = self.tile_size * CHUNK_SIZE
+
+		for x in range(int(pixel_pos[0] // chunk_pixels), int((pixel_pos[0] + width) // chunk_pixels) + 1):
+			for y in range(int(pixel_pos[1] // chunk_pixels), int((pixel_pos[1] + height) // chunk_pixels) + 1):
+				self.chunks.pop((x, y), None)
+
+
+	def bake_chunk(self, chunk_loc):
+		chunk_pixels = self.tile_size * CHUNK_SIZE
+		origin = (chunk_loc[0] * chunk_pixels, chunk_loc[1] * chunk_pixels)
+		chunk_rect = pygame.Rect(origin, (chunk_pixels, chunk_pixels))
+		chunk = pygame.Surface(chunk_rect.size, pygame.SRCALPHA)
+		empty = True
+
+		for tile in self.offgrid_in_rect(chunk_rect):
+			chunk.blit(self.game.assets[tile.type][tile.variant], (tile.pos[0] - origin[0], tile.pos[1] - origin[1]))
+			empty = False
+
+		for x in range(chunk_loc[0] * CHUNK_SIZE, (chunk_loc[0] + 1) * CHUNK_SIZE):
+			for y in range(chunk_loc[1] * CHUNK_SIZE, (chunk_loc[1] + 1) * CHUNK_SIZE):
+				tile = self.map.get((x, y))
+				if tile is not None:
+					chunk.blit(self.game.assets[tile.type][tile.variant],
+								(x * self.tile_size - origin[0], y * self.tile_size - origin[1]))
+					empty = False
+
+		# Empty chunks are remembered as None, so they won't be baked or blitted again.
+		return None if empty else chunk
+
+
+	# Bake every chunk that has tiles in it, so no baking happens mid play.
+	def bake(self):
+		chunk_pixels = self.tile_size * CHUNK_SIZE
+		chunk_locs = {(tile_loc[0] // CHUNK_SIZE, tile_loc[1] // CHUNK_SIZE) for tile_loc in self.map}
 		for tile in self.offgrid_tiles:
-			surface.blit(self.game.assets[tile.type][tile.variant], (tile.pos[0] - offset[0], tile.pos[1] - offset[1]))
+			width, height = self.tile_image_size(tile)
+			for x in range(int(tile.pos[0] // chunk_pixels), int((tile.pos[0] + width) // chunk_pixels) + 1):
+				for y in range(int(tile.pos[1] // chunk_pixels), int((tile.pos[1] + height) // chunk_pixels) + 1):
+					chunk_locs.add((x, y))
+
+		for chunk_loc in chunk_locs:
+			if chunk_loc not in self.chunks:
+				self.chunks[chunk_loc] = self.bake_chunk(chunk_loc)
 
-		x_start = offset[0] // self.tile_size
-		x_end = (offset[0] + surface.get_width()) // self.tile_size + 1
-		y_start = offset[1] // self.tile_size
-		y_end = (offset[1] + surface.get_height()) // self.tile_size + 1
+
+
+	def render(self, surface, offset=(0, 0)):
+		if self.streamer is None:
+			self.render_chunks(surface, offset)
+			return
+
+		# Physics queries on the client's socket thread would otherwise load regions in the middle of it.
+		with self.streamer.lock:
+			self.render_chunks(surface, offset)
+
+
+	# Stream regions in and out around the camera rect, in pixels, called every simulation step.
+	def stream(self, view_rect):
+		if self.streamer is not None:
+			self.streamer.update(view_rect)
+
+
+	def render_chunks(self, surface, offset):
+		chunk_pixels = self.tile_size * CHUNK_SIZE
+		x_start = int(offset[0] // chunk_pixels)
+		x_end = int((offset[0] + surface.get_width()) // chunk_pixels) + 1
+		y_start = int(offset[1] // chunk_pixels)
+		y_end = int((offset[1] + surface.get_height()) // chunk_pixels) + 1
 		for x in range(x_start, x_end):
 			for y in range(y_start, y_end):
-				loc = "{0};{1}".format(x, y)
-				if loc in self.map:
-					tile = self.map[loc]
-					# Convert grid position to pixel position.
-					surface.blit(self.game.assets[tile.type][tile.variant],
-								(tile.pos[0] * self.tile_size - offset[0], tile.pos[1] * self.tile_size - offset[1]))
\ No newline at end of file
+				if (x, y) not in self.chunks:
+					self.chunks[(x, y)] = self.bake_chunk((x, y))
+
+				chunk = self.chunks[(x, y)]
+				if chunk is not None:
+					surface.blit(chunk, (x * chunk_pixels - offset[0], y * chunk_pixels - offset[1]))
@@ -0,0 +1,31 @@
+SIMULATION_RATE = 60  # Simulation steps per second, every speed, timer and animation in the game is counted in these steps.
+STEP_TIME = 1 / SIMULATION_RATE
+MAX_STEPS_PER_FRAME = 5  # After a long stall, the rest of the backlog is dropped instead of caught up with.
+MAX_RENDER_FPS = 240  # 0 to render as fast as possible.
+
+
+# Turns the real time each rendered frame took into a number of fixed simulation steps. The time left over is kept for
+# the next frame, and alpha tells how far the current moment is into the next step, for interpolating positions.
+class FixedTimestep:
+	def __init__(self, step_time=STEP_TIME, max_steps=MAX_STEPS_PER_FRAME):
+		self.step_time = step_time
+		self.max_steps = max_steps
+		self.accumulator = 0
+		self.alpha = 0
+
+
+	def reset(self):
+		self.accumulator = 0
+		self.alpha = 0
+
+
+	# Frame time in seconds, returns how many steps to simulate for it.
+	def advance(self, frame_time):
+		self.accumulator += frame_time
+		steps = min(int(self.accumulator / self.step_time), self.max_steps)
+		self.accumulator -= steps * self.step_time
+		if self.accumulator >= self.step_time:
+			self.accumulator %= self.step_time
+
+		self.alpha = self.accumulator / self.step_time
+		return steps
@@ -0,0 +1,67 @@
+import os
+import time
+
+import pygame
+import pygame.freetype
+
+
+FONT_FOLDER = "assets/fonts"
+FONT_EXTENSIONS = (".ttf", ".otf")
+
+
+# Matches font names the way SysFont does, ignoring case, spaces and punctuation.
+def simple_name(name):
+	return "".join(c.lower() for c in name if c.isalnum())
+
+
+# Every font the UI asks for by (name, size, bold), loaded once and shared by all the text using it.
+# Names are looked up among the bundled fonts by their family name, straight from their files, so the system fonts
+# don't have to be searched. Fonts that aren't bundled still go through SysFont.
+class FontRegistry:
+	def __init__(self, folder=FONT_FOLDER):
+		self.folder = folder
+		self.paths = None  # Bundled font paths by simple family name, read on first use.
+		self.fonts = {}
+		self.requests = 0
+		self.load_time = 0  # Seconds spent finding and loading fonts.
+
+
+	def scan(self):
+		self.paths = {}
+		if not os.path.isdir(self.folder):
+			return
+
+		if not pygame.freetype.get_init():
+			pygame.freetype.init()
+		for file_name in sorted(os.listdir(self.folder)):
+			if file_name.lower().endswith(FONT_EXTENSIONS):
+				path = os.path.join(self.folder, file_name)
+				self.paths.setdefault(simple_name(pygame.freetype.Font(path).name), path)
+
+
+	def get(self, name, size, bold=False):
+		self.requests += 1
+		key = (name, size, bold)
+		font = self.fonts.get(key)
+		if font is not None:
+			return font
+
+		start = time.perf_counter()
+		if self.paths is None:
+			self.scan()
+
+		path = self.paths.get(simple_name(name))
+		if path is not None:
+			# Same as SysFont, which fakes bold for fonts without a bold file.
+			font = pygame.font.Font(path, size)
+			font.set_bold(bold)
+		else:
+			font = pygame.font.SysFont(name, size, bold)
+
+		self.fonts[key] = font
+		self.load_time += time.perf_counter() - start
+		return font
+
+
+# Shared by every piece of UI text.
+fonts = FontRegistry()
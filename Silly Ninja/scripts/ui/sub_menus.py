@@ -6,7 +6,8 @@ import threading
 
 from scripts.game import GameForHost, GameForClient
 from scripts.utils import load_image, show_running_threads
-from scripts.ui.ui_elements import Text, Button, InputField, Border
+from scripts.presentation import Presenter
+from scripts.ui.ui_elements import UIBase, Text, Button, InputField, Border
 from scripts.socket.server import GameServer
 from scripts.socket.client import MAX_CLIENT_COUNT
 
@@ -29,6 +30,7 @@ class MenuBase:
 	# Class variables.
 	clock = pygame.time.Clock()
 	screen = pygame.display.set_mode((WIDTH, HEIGHT))
+	presenter = Presenter(screen)
 
 	outline_display = pygame.Surface((WIDTH / 2, HEIGHT / 2), pygame.SRCALPHA)  # Outline display
 	normal_display = pygame.Surface((WIDTH / 2, HEIGHT / 2))  # Normal display
@@ -53,6 +55,21 @@ class MenuBase:
 			MenuBase.fade_in.set_alpha(self.fade_alpha)
 			surface.blit(MenuBase.fade_in, (0, 0))
 			self.fade_alpha -= 15
+			MenuBase.presenter.invalidate()
+
+
+	# The widgets of the menu, in its attributes or lists of them.
+	def widgets(self):
+		for value in vars(self).values():
+			if isinstance(value, UIBase):
+				yield value
+			elif isinstance(value, list):
+				yield from (item for item in value if isinstance(item, UIBase))
+
+
+	# Show the frame on the window, updating only the areas the widgets drew on.
+	def present(self):
+		MenuBase.presenter.update_menu(self, [widget.dirty_rect() for widget in self.widgets()])
 
 
 	def handle_events(self, event):
@@ -91,7 +108,8 @@ class HostMenu(SubMenuBase):
 		self.default_ip = socket.gethostbyname(socket.gethostname())
 		self.default_port = 5050
 
-		self.game = GameForHost(MenuBase.clock, MenuBase.screen, MenuBase.outline_display, MenuBase.normal_display)
+		self.game = GameForHost(MenuBase.clock, MenuBase.screen, MenuBase.outline_display, MenuBase.normal_display,
+								presenter=MenuBase.presenter)
 		self.server = None
 		self.lobby = None
 
@@ -165,7 +183,7 @@ class HostMenu(SubMenuBase):
 			for event in pygame.event.get():
 				self.handle_events(event)
 
-			pygame.display.update()
+			self.present()
 			MenuBase.clock.tick(60)
 
 
@@ -224,7 +242,8 @@ class JoinMenu(SubMenuBase):
 		super().__init__()
 		self.default_port = 5050
 
-		self.game = GameForClient(MenuBase.clock, MenuBase.screen, MenuBase.outline_display, MenuBase.normal_display)
+		self.game = GameForClient(MenuBase.clock, MenuBase.screen, MenuBase.outline_display, MenuBase.normal_display,
+								presenter=MenuBase.presenter)
 		self.lobby = None
 
 		# UI elements.
@@ -296,7 +315,7 @@ class JoinMenu(SubMenuBase):
 			for event in pygame.event.get():
 				self.handle_events(event)
 
-			pygame.display.update()
+			self.present()
 			MenuBase.clock.tick(60)
 
 
@@ -437,7 +456,7 @@ class Lobby(SubMenuBase):
 			for event in pygame.event.get():
 				self.handle_events(event)
 
-			pygame.display.update()
+			self.present()
 			MenuBase.clock.tick(60)
 
 
@@ -0,0 +1,45 @@
+from collections import OrderedDict
+
+
+TEXT_CACHE_SIZE = 256
+
+
+# Rendered text surfaces keyed by (font, text, color, antialias), so labels that don't change aren't rasterized
+# again every frame. The least recently used ones are dropped once there are more than the cache size.
+# Callers may set the alpha of the surfaces they get, but nothing else, as they're shared.
+class TextCache:
+	def __init__(self, size=TEXT_CACHE_SIZE):
+		self.size = size
+		self.surfaces = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+
+	def render(self, font, text, color, antialias):
+		key = (font, text, tuple(color), antialias)
+		surface = self.surfaces.get(key)
+		if surface is not None:
+			self.hits += 1
+			self.surfaces.move_to_end(key)
+			return surface
+
+		self.misses += 1
+		surface = self.surfaces[key] = font.render(text, antialias, color)
+		while len(self.surfaces) > self.size:
+			self.surfaces.popitem(last=False)
+		return surface
+
+
+	def hit_rate(self):
+		lookups = self.hits + self.misses
+		return self.hits / lookups if lookups else 0
+
+
+	def clear(self):
+		self.surfaces.clear()
+		self.hits = 0
+		self.misses = 0
+
+
+# Shared by every piece of UI text.
+text_cache = TextCache()
@@ -2,6 +2,8 @@ import pygame
 import pyperclip
 
 from scripts.utils import fade_out
+from scripts.ui.fonts import fonts
+from scripts.ui.text_cache import text_cache
 
 
 pygame.init()
@@ -39,12 +41,17 @@ class UIBase:
 	def get_rect(self):
 		return self.rect
 
+	# The area the element drew on when it was last rendered.
+	def dirty_rect(self):
+		return self.rect.copy()
+
 	@staticmethod
 	def draw_text(text_obj, pos, surface, alpha=255):
 		text_obj.set_alpha(alpha)
 		text_rect = text_obj.get_rect()  # Get the font's Rect object.
 		text_rect.midtop = pos  # Bind the rect position to top center.
 		surface.blit(text_obj, text_rect)  # Blit it on the screen.
+		return text_rect
 
 	@staticmethod
 	def draw_rect(rect, draw_surface, pos, color=BLACK, line_width=0, alpha=255):
@@ -72,8 +79,8 @@ class Border(UIBase):
 class Text(UIBase):
 	def __init__(self, text, font_name, pos, size=20, color=BLACK, bold=False, antialiased=False):
 		self.antialiased = antialiased
-		self.font = pygame.font.SysFont(font_name, size, bold)
-		self.text_obj = self.font.render(text, self.antialiased, color)
+		self.font = fonts.get(font_name, size, bold)
+		self.text_obj = text_cache.render(self.font, text, color, self.antialiased)
 		super().__init__(pos, self.text_obj.get_size())
 
 		self.text = text
@@ -88,10 +95,12 @@ class Text(UIBase):
 
 	def render(self, surface, override_color=None, alpha=255, offset=(0, 0)):
 		text_color = self.color if override_color is None else override_color
-		self.text_obj = self.font.render(self.text, self.antialiased, text_color)
+		self.text_obj = text_cache.render(self.font, self.text, text_color, self.antialiased)
 		self.width = self.text_obj.get_width()
 
-		UIBase.draw_text(self.text_obj, (int(self.pos[0] - offset[0]), int(self.pos[1] - offset[1])), surface, alpha=alpha)
+		text_rect = UIBase.draw_text(self.text_obj, (int(self.pos[0] - offset[0]), int(self.pos[1] - offset[1])), surface, alpha=alpha)
+		self.rect.topleft = text_rect.topleft
+		self.rect.h = text_rect.h
 
 
 	def set_text(self, text):
@@ -113,6 +122,10 @@ class BorderedText(Text):
 		super().render(surface, override_color)
 
 
+	def dirty_rect(self):
+		return self.rect.union(self.border.rect)
+
+
 class Button(UIBase):
 	def __init__(self, display_text, font_name, pos, size, on_click=None, args=(), text_offset=0, fade_out=True):
 		super().__init__(pos, size)
@@ -172,6 +185,10 @@ class Button(UIBase):
 			self.display_text.render(surface, override_color=self.text_color, alpha=100)
 
 
+	def dirty_rect(self):
+		return self.rect.union(self.display_text.rect)
+
+
 class InputField(UIBase):
 	def __init__(self, font_name, pos, size, placeholder_text="", on_submit=None, text_offset=0):
 		super().__init__(pos, size)
@@ -244,6 +261,10 @@ class InputField(UIBase):
 		self.display_text.render(surface, alpha=alpha)
 
 
+	def dirty_rect(self):
+		return self.rect.union(self.display_text.rect)
+
+
 	def get_submitted_text(self):
 		if self.display_text.text == self.placeholder_text:
 			return ""
@@ -5,7 +5,10 @@ import threading
 BASE_IMAGE_PATH = "assets/images/"
 
 def load_image(path):
-	image = pygame.image.load(BASE_IMAGE_PATH + path).convert()
+	image = pygame.image.load(BASE_IMAGE_PATH + path)
+	# Images can only be converted to the display's pixel format once there is one, not when running headless.
+	if pygame.display.get_surface() is not None:
+		image = image.convert()
 	image.set_colorkey((0, 0, 0))
 	return image
 
@@ -19,6 +22,20 @@ def load_images(path):
 	return images
 
 
+# Stands in for the game's sounds when running without audio.
+class SilentSound:
+	def __init__(self, path):
+		self.path = path
+
+
+	def play(self, loops=0):
+		pass
+
+
+	def set_volume(self, volume):
+		pass
+
+
 # Fading out effect.
 def fade_out(WINDOW_SIZE, draw_surface, color=(255, 255, 255)):
 	fade_out = pygame.Surface(WINDOW_SIZE)  # Input a tuple.
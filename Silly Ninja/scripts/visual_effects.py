@@ -1,12 +1,42 @@
 import math
 import pygame
 
+MAX_PROJECTILE_TIME = 360
+IRIS_STEPS = 30  # Level transitions run from -30 to 30, closed at both ends and open at 0.
+IRIS_RADIUS_STEP = 8
+
+
+# Enemies keep firing these, so they're slotted. Sparks and particles live in the pools of scripts/particles.py.
 class Projectile:
+	__slots__ = ("game", "pos", "direction", "alive_time", "impact_time")
+
 	def __init__(self, game, pos, direction, alive_time=0):
 		self.game = game
 		self.pos = list(pos)
 		self.direction = direction
 		self.alive_time = alive_time
+		self.impact_time = self.predict_impact(game.tilemap)
+
+	# The path is a straight line, so the frame it first ends up inside a solid tile is known at spawn.
+	def predict_impact(self, tilemap):
+		speed = abs(self.direction)
+		first_step = (self.pos[0] + self.direction, self.pos[1])
+		hit = tilemap.raycast(first_step, (self.direction, 0), (MAX_PROJECTILE_TIME - self.alive_time) * speed)
+		if hit is None:
+			return None
+
+		# A position on a tile's left edge belongs to that tile, one on its right edge to the next one.
+		tile_loc, distance = hit
+		if tile_loc[0] == first_step[0] // tilemap.tile_size:
+			steps = 0
+		elif self.direction > 0:
+			steps = math.ceil(distance / speed)
+		else:
+			steps = math.floor(distance / speed) + 1
+		return self.alive_time + 1 + steps
+
+	def hit_wall(self):
+		return self.impact_time is not None and self.alive_time >= self.impact_time
 
 	def update(self):
 		self.pos[0] += self.direction
@@ -18,52 +48,29 @@ class Projectile:
 							self.pos[1] - img.get_height() / 2 - offset[1]))
 
 
-class Spark:
-	def __init__(self, pos, angle, speed):
-		self.pos = list(pos)
-		self.angle = angle
-		self.speed = speed
+# The circle closing in on level transitions and deaths and opening out on level loads.
+# All its frames are drawn once per display size, then only blitted.
+class IrisTransition:
+	def __init__(self):
+		self.frames = {}  # One frame per absolute transition value, keyed by display size.
 
-	def update(self):
-		self.pos[0] += math.cos(self.angle) * self.speed
-		self.pos[1] += math.sin(self.angle) * self.speed
 
-		self.speed = max(self.speed - 0.1, 0)
-		return not self.speed
-
-	def render(self, surface, offset=(0, 0)):
-		render_points = [
-			(self.pos[0] + math.cos(self.angle) * self.speed * 3 - offset[0], self.pos[1] + math.sin(self.angle) * self.speed * 3 - offset[1]),
-			(self.pos[0] + math.cos(self.angle + math.pi * 0.5) * self.speed * 0.5 - offset[0], self.pos[1] + math.sin(self.angle + math.pi * 0.5) * self.speed * 0.5 - offset[1]),
-			(self.pos[0] + math.cos(self.angle + math.pi) * self.speed * 3 - offset[0], self.pos[1] + math.sin(self.angle + math.pi) * self.speed * 3 - offset[1]),
-			(self.pos[0] + math.cos(self.angle - math.pi * 0.5) * self.speed * 0.5 - offset[0], self.pos[1] + math.sin(self.angle - math.pi * 0.5) * self.speed * 0.5 - offset[1])
-		]
-		pygame.draw.polygon(surface, (255, 255, 255), render_points)
+	def prepare(self, size):
+		if size in self.frames:
+			return
 
+		frames = self.frames[size] = []
+		for step in range(IRIS_STEPS + 1):
+			frame = pygame.Surface(size)
+			pygame.draw.circle(frame, (255, 255, 255), (size[0] // 2, size[1] // 2), (IRIS_STEPS - step) * IRIS_RADIUS_STEP)
+			frame.set_colorkey((255, 255, 255))
+			# Frames where the circle covers the whole display wouldn't draw anything.
+			frames.append(frame if pygame.mask.from_surface(frame).count() else None)
 
-class Particle:
-	def __init__(self, game, p_type, pos, velocity=[0, 0], start_frame=0):
-		self.game = game
-		self.type = p_type
-		self.pos = list(pos)
-		self.velocity = list(velocity)
-		self.animation = self.game.assets["particle/" + self.type].copy()
-		self.animation.frame = start_frame
-
-
-	def update(self):
-		kill = self.animation.done
-
-		self.pos[0] += self.velocity[0]
-		self.pos[1] += self.velocity[1]
-
-		self.animation.update()
-		return kill
-
-
-	def render(self, surface, offset=(0, 0)):
-		image = self.animation.current_frame_image()
 
-		# Render at the center of the image.
-		surface.blit(image, (self.pos[0] - offset[0] + image.get_width() // 2,
-							self.pos[1] - offset[1] + image.get_height() // 2))
\ No newline at end of file
+	def render(self, surface, transition):
+		size = surface.get_size()
+		self.prepare(size)
+		frame = self.frames[size][abs(transition)]
+		if frame is not None:
+			surface.blit(frame, (0, 0))
@@ -18,7 +18,8 @@ class MainMenu(MenuBase):
 		pygame.display.set_caption("Silly Ninja")
 
 		# Game and sub menus.
-		self.game_solo = GameSolo(MenuBase.clock, MenuBase.screen, MenuBase.outline_display, MenuBase.normal_display)
+		self.game_solo = GameSolo(MenuBase.clock, MenuBase.screen, MenuBase.outline_display, MenuBase.normal_display,
+									presenter=MenuBase.presenter)
 
 		self.host_menu = HostMenu()
 		self.join_menu = JoinMenu()
@@ -71,7 +72,7 @@ class MainMenu(MenuBase):
 			for event in pygame.event.get():
 				self.handle_events(event)
 
-			pygame.display.update()
+			self.present()
 			MenuBase.clock.tick(60)
 
 